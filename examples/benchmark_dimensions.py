@@ -0,0 +1,131 @@
+"""
+Embedding Dimension Benchmark
+
+Embeds a corpus once at the model's full size, then for each reduced
+(Matryoshka-truncated, re-normalized) dimension indexes it into a scratch
+collection and measures search latency and recall@k against exact
+full-dimension search.
+
+Uses the configured EMBEDDING_PROVIDER / EMBEDDING_MODEL. Without --corpus,
+the paragraphs of the repository's markdown docs are used; queries are the
+opening words of sampled passages unless --queries is given.
+
+Prerequisites:
+1. Start Qdrant locally (or pass --memory to use an in-process Qdrant):
+   docker run -p 6333:6333 qdrant/qdrant
+
+2. Run this script:
+   uv run python examples/benchmark_dimensions.py --dims 1536,1024,512,256 --top-k 10
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+from haystack.dataclasses import Document
+from qdrant_client import QdrantClient
+from src.config.settings import settings
+from src.document_stores.store import QdrantDocumentStore
+from src.embeddings import Embedder
+from src.embeddings.base import reduce_dimension
+
+ROOT = Path(__file__).parent.parent
+
+
+def full_size_embedder() -> Embedder:
+    """The configured backend, without dimension reduction."""
+    if settings.embedding_provider == "openai":
+        from src.embeddings.openai_embedder import OpenAIEmbedder
+        return OpenAIEmbedder(model=settings.embedding_model, api_key=settings.openai_api_key)
+    from src.embeddings.local import LocalEmbedder
+    return LocalEmbedder(settings.embedding_model, device=settings.local_embedding_device)
+
+
+def load_lines(path: Path) -> list:
+    return [line.strip() for line in path.read_text().splitlines() if line.strip()]
+
+
+def default_corpus() -> list:
+    paragraphs = []
+    for path in sorted([ROOT / "README.md", *(ROOT / "docs").glob("*.md")]):
+        for paragraph in path.read_text().split("\n\n"):
+            paragraph = " ".join(paragraph.split())
+            if len(paragraph.split()) >= 12:
+                paragraphs.append(paragraph)
+    return paragraphs
+
+
+def make_store(dimension: int, memory: bool) -> QdrantDocumentStore:
+    name = f"benchmark_dim_{dimension}"
+    if not memory:
+        return QdrantDocumentStore(collection_name=name, embedding_dimension=dimension)
+    with patch("src.document_stores.store.QdrantClient", lambda **kwargs: QdrantClient(":memory:")):
+        return QdrantDocumentStore(collection_name=name, embedding_dimension=dimension)
+
+
+def percentiles(samples: list) -> str:
+    samples = sorted(samples)
+    p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+    return f"p50={statistics.median(samples):7.2f}ms  p95={p95:7.2f}ms"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", type=Path, help="Text file, one passage per line")
+    parser.add_argument("--queries", type=Path, help="Text file, one query per line")
+    parser.add_argument("--num-queries", type=int, default=100)
+    parser.add_argument("--dims", default="1536,1024,512,256", help="Comma-separated dimensions to compare")
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--memory", action="store_true", help="Use an in-process Qdrant")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    corpus = load_lines(args.corpus) if args.corpus else default_corpus()
+    if args.queries:
+        queries = load_lines(args.queries)
+    else:
+        queries = [" ".join(text.split()[:10]) for text in rng.sample(corpus, min(args.num_queries, len(corpus)))]
+
+    embedder = full_size_embedder()
+    print(f"Embedding {len(corpus)} passages and {len(queries)} queries with {embedder.model_name}...")
+    doc_vectors = embedder.embed(corpus)
+    query_vectors = embedder.embed(queries)
+    embedder.close()
+    full_dim = len(doc_vectors[0])
+
+    # Ground truth: exact top-k with the full-size embeddings
+    docs = reduce_dimension(doc_vectors, full_dim)
+    truth = np.argsort(-np.asarray(query_vectors) @ np.asarray(docs).T, axis=1)[:, :args.top_k]
+    truth = [{str(i) for i in row} for row in truth]
+
+    dims = [dim for dim in (int(d) for d in args.dims.split(",")) if dim <= full_dim]
+    print(f"{'dim':>6}  {'recall@' + str(args.top_k):>9}  {'vectors':>9}  latency")
+    for dim in dims:
+        store = make_store(dim, args.memory)
+        try:
+            store.write_documents([
+                Document(id=str(i), content=text, embedding=vector)
+                for i, (text, vector) in enumerate(zip(corpus, reduce_dimension(doc_vectors, dim)))
+            ], batch_size=500)
+            latencies, recalls = [], []
+            for vector, expected in zip(reduce_dimension(query_vectors, dim), truth):
+                start = time.perf_counter()
+                results = store.search(vector, top_k=args.top_k)
+                latencies.append((time.perf_counter() - start) * 1000)
+                recalls.append(len({doc.id for doc in results} & expected) / len(expected))
+            megabytes = len(corpus) * dim * 4 / 2**20
+            print(f"{dim:>6}  {statistics.mean(recalls):>9.3f}  {megabytes:>7.1f}MB  {percentiles(latencies)}")
+        finally:
+            store.delete_collection()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Hybrid vs Dense Search Latency
+
+Indexes a synthetic corpus into a scratch collection and compares the search
+latency of dense-only and hybrid (dense + BM25, fused with RRF) queries.
+
+Prerequisites:
+1. Start Qdrant locally (or pass --memory to use an in-process Qdrant):
+   docker run -p 6333:6333 qdrant/qdrant
+
+2. Run this script:
+   uv run python examples/benchmark_hybrid.py --docs 20000 --queries 200
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from haystack.dataclasses import Document
+from qdrant_client import QdrantClient
+from src.document_stores.store import QdrantDocumentStore
+
+DIM = 384
+WORDS = [f"term{i}" for i in range(5000)]
+
+
+def random_vector(rng: random.Random) -> list:
+    return [rng.gauss(0, 1) for _ in range(DIM)]
+
+
+def make_store(memory: bool) -> QdrantDocumentStore:
+    if not memory:
+        return QdrantDocumentStore(collection_name="benchmark_hybrid", embedding_dimension=DIM)
+    with patch("src.document_stores.store.QdrantClient", lambda **kwargs: QdrantClient(":memory:")):
+        return QdrantDocumentStore(collection_name="benchmark_hybrid", embedding_dimension=DIM)
+
+
+def percentiles(samples: list) -> str:
+    samples = sorted(samples)
+    p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+    return f"p50={statistics.median(samples):7.2f}ms  p95={p95:7.2f}ms"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=5000)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--memory", action="store_true", help="Use an in-process Qdrant")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    store = make_store(args.memory)
+    try:
+        print(f"Indexing {args.docs} synthetic chunks (dim={DIM})...")
+        docs = [
+            Document(
+                id=f"doc{i}",
+                content=" ".join(rng.choices(WORDS, k=200)) + f" section {i}-{i % 97}",
+                embedding=random_vector(rng),
+            )
+            for i in range(args.docs)
+        ]
+        store.write_documents(docs, batch_size=500)
+
+        queries = [
+            (random_vector(rng), f"what does section {i}-{i % 97} say about {rng.choice(WORDS)}")
+            for i in rng.sample(range(args.docs), min(args.queries, args.docs))
+        ]
+        for mode in ("dense", "hybrid"):
+            latencies = []
+            for embedding, text in queries:
+                start = time.perf_counter()
+                store.search(embedding, top_k=args.top_k, query_text=text if mode == "hybrid" else None)
+                latencies.append((time.perf_counter() - start) * 1000)
+            print(f"{mode:>6}: {percentiles(latencies)}")
+    finally:
+        store.delete_collection()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Ingest Throughput Benchmark
+
+Writes a synthetic corpus of random unit vectors twice, once with the
+previous per-point path (a PointStruct per document, sequential upserts of
+100 points that each wait for indexing) and once with the columnar
+`write_documents` path (Batch upserts sent in parallel, only the last one
+waiting), and reports documents per second for both.
+
+No embedding model is involved, so the numbers isolate the store write path.
+
+Prerequisites:
+1. Start Qdrant locally (or pass --memory to use an in-process Qdrant;
+   in-process writes are sequential, so the gap is mostly conversion cost):
+   docker run -p 6333:6333 qdrant/qdrant
+
+2. Run this script:
+   uv run python examples/benchmark_ingest.py --docs 20000 --dim 1536 --batch-size 256 --parallelism 4
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+from haystack.dataclasses import Document
+from qdrant_client import QdrantClient
+from qdrant_client.models import PointStruct, SparseVector
+from src.config.settings import settings
+from src.document_stores.sparse import encode_document
+from src.document_stores.store import QdrantDocumentStore, SPARSE_VECTOR_NAME, _point_id
+
+
+def make_store(name: str, dimension: int, memory: bool) -> QdrantDocumentStore:
+    if not memory:
+        return QdrantDocumentStore(collection_name=name, embedding_dimension=dimension)
+    with patch("src.document_stores.store.QdrantClient", lambda **kwargs: QdrantClient(":memory:")):
+        return QdrantDocumentStore(collection_name=name, embedding_dimension=dimension)
+
+
+def make_documents(count: int, dimension: int) -> list:
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((count, dimension), dtype=np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return [
+        Document(id=f"doc-{i}", content=f"synthetic passage {i} about clause {i % 97}", embedding=vector.tolist())
+        for i, vector in enumerate(vectors)
+    ]
+
+
+def legacy_write(store: QdrantDocumentStore, documents: list, batch_size: int = 100):
+    """The per-point write path this benchmark compares against."""
+    points = []
+    for doc in documents:
+        vector = {"": doc.embedding}
+        if store.sparse_enabled:
+            indices, values = encode_document(doc.content or "", settings.chunk_size)
+            vector[SPARSE_VECTOR_NAME] = SparseVector(indices=indices, values=values)
+        points.append(PointStruct(
+            id=_point_id(doc.id),
+            vector=vector,
+            payload={"content": doc.content, "doc_id": str(doc.id), **doc.meta},
+        ))
+    for i in range(0, len(points), batch_size):
+        store.client.upsert(collection_name=store.collection_name, points=points[i:i + batch_size], wait=True)
+
+
+def timed(label: str, store: QdrantDocumentStore, write, documents: list) -> float:
+    try:
+        start = time.perf_counter()
+        write(documents)
+        elapsed = time.perf_counter() - start
+        assert store.count_documents() == len(documents)
+    finally:
+        store.delete_collection()
+    rate = len(documents) / elapsed
+    print(f"{label:<12} {elapsed:8.2f}s  {rate:10.0f} docs/s")
+    return rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=20000)
+    parser.add_argument("--dim", type=int, default=1536)
+    parser.add_argument("--batch-size", type=int, default=settings.qdrant_write_batch_size)
+    parser.add_argument("--parallelism", type=int, default=settings.qdrant_write_parallelism)
+    parser.add_argument("--memory", action="store_true", help="Use an in-process Qdrant")
+    args = parser.parse_args()
+
+    documents = make_documents(args.docs, args.dim)
+    print(f"Writing {args.docs} documents of dimension {args.dim}...")
+
+    store = make_store("benchmark_ingest_legacy", args.dim, args.memory)
+    legacy = timed("per-point", store, lambda docs: legacy_write(store, docs), documents)
+
+    store = make_store("benchmark_ingest_columnar", args.dim, args.memory)
+    with patch.object(settings, "qdrant_write_parallelism", args.parallelism):
+        columnar = timed(
+            "columnar", store, lambda docs: store.write_documents(docs, batch_size=args.batch_size), documents
+        )
+
+    print(f"speedup      {columnar / legacy:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -23,9 +23,28 @@ export async function uploadDocument(file) {
     const err = await res.json().catch(() => ({ detail: res.statusText }))
     throw new Error(err.detail || `Upload failed: ${res.status}`)
   }
+  const accepted = await res.json()
+  return waitForJob(accepted.job_id)
+}
+
+export async function getJob(jobId) {
+  const res = await fetch(`${BASE}/documents/jobs/${encodeURIComponent(jobId)}`)
+  if (!res.ok) throw new Error(`Failed to get job: ${res.status}`)
   return res.json()
 }
 
+/**
+ * Poll an ingestion job until it completes; rejects if it fails.
+ */
+export async function waitForJob(jobId, intervalMs = 1000) {
+  while (true) {
+    const job = await getJob(jobId)
+    if (job.stage === 'completed') return job
+    if (job.stage === 'failed') throw new Error(job.error || 'Indexing failed')
+    await new Promise((resolve) => setTimeout(resolve, intervalMs))
+  }
+}
+
 export async function deleteDocument(id) {
   const res = await fetch(`${BASE}/documents/${encodeURIComponent(id)}`, {
     method: 'DELETE',
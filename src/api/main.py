@@ -1,12 +1,17 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import os
 
 from src.api.routes import query
+from src.api.routes import retrieve
 from src.api.routes import health
 from src.api.routes import documents
 from src.api.routes import config
+from src.config.settings import settings
+from src.document_stores.store import get_document_store
 from src.middleware.logging import LoggingMiddleware, configure_logging
+from src.pipelines.jobs import start_generation_refresh, start_ingestion_workers, stop_ingestion_workers
 
 # Configure logging on startup
 configure_logging(
@@ -14,10 +19,25 @@ configure_logging(
     json_logs=os.getenv("JSON_LOGS", "false").lower() == "true"
 )
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Connect to Qdrant up front so an embedding dimension mismatch stops the app at boot
+    get_document_store()
+    # Resume ingestion jobs spooled before a restart (unless standalone workers drain the queue)
+    if settings.ingestion_workers_in_api:
+        start_ingestion_workers()
+    # Let the semantic cache see documents indexed by standalone workers
+    start_generation_refresh()
+    yield
+    stop_ingestion_workers(timeout=5.0)
+
+
 app = FastAPI(
     title="Quilora AI - RAG API",
     description="Retrieval-Augmented Generation API for document Q&A with streaming support",
     version="0.3.0",  # Phase 2: Production Readiness
+    lifespan=lifespan,
 )
 
 # Add logging middleware (first, so it captures all requests)
@@ -35,6 +55,7 @@ app.add_middleware(
 # Register routers
 app.include_router(health.router)
 app.include_router(query.router)
+app.include_router(retrieve.router)
 app.include_router(documents.router)
 app.include_router(config.router)
 
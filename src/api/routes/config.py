@@ -17,6 +17,6 @@ async def get_config():
         "primary_llm_provider": settings.primary_llm_provider,
         "fallback_llm_provider": settings.fallback_llm_provider,
         "premium_llm_provider": settings.premium_llm_provider,
-        "embedding_model": settings.embedding_model,
+        "embedding_model": settings.active_embedding_model,
         "max_file_size_mb": settings.max_file_size_mb,
     }
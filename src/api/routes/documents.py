@@ -5,40 +5,60 @@ CRUD operations for documents in the RAG system.
 """
 
 from fastapi import APIRouter, HTTPException, status, UploadFile, File, Query
+from fastapi.concurrency import run_in_threadpool
+from datetime import datetime, timezone
 from typing import Optional
 import logging
 import uuid
 
-from haystack.dataclasses import Document
-
 from src.api.schemas.documents import (
     DocumentCreateRequest,
     DocumentResponse,
     DocumentListResponse,
     DocumentDeleteResponse,
-    DocumentUploadResponse,
+    IngestionJobResponse,
+    JobProgress,
+    JobStatusResponse,
 )
 from src.document_stores.store import get_document_store
-from src.pipelines.indexing import index_documents
-from src.document_processing.extractor import extract_text, SUPPORTED_EXTENSIONS
+from src.pipelines.jobs import JobStage, QueueFullError, get_job_queue, submit_job
+from src.document_processing.extractor import SUPPORTED_EXTENSIONS
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/documents", tags=["Documents"])
 
 
+def _accepted(job_id: str, document_id: str, message: str) -> IngestionJobResponse:
+    return IngestionJobResponse(
+        job_id=job_id,
+        document_id=document_id,
+        stage=JobStage.QUEUED.value,
+        status_url=f"{router.prefix}/jobs/{job_id}",
+        message=message,
+    )
+
+
+def _queue_full(error: QueueFullError) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=f"Ingestion queue is full ({error}); retry later",
+        headers={"Retry-After": "30"},
+    )
+
+
 @router.post(
     "",
-    response_model=DocumentUploadResponse,
-    status_code=status.HTTP_201_CREATED,
+    response_model=IngestionJobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
     summary="Create Document",
-    description="Create and index a document from JSON content.",
+    description="Queue a document from JSON content for indexing; poll the returned status URL for progress.",
 )
-async def create_document(request: DocumentCreateRequest) -> DocumentUploadResponse:
+async def create_document(request: DocumentCreateRequest) -> IngestionJobResponse:
     """
-    Create a document from text content and index it.
+    Create a document from text content and queue it for indexing.
     
-    The document will be chunked and embedded for retrieval.
+    The document will be chunked and embedded for retrieval in the background.
     """
     if not request.content or not request.content.strip():
         raise HTTPException(
@@ -50,27 +70,19 @@ async def create_document(request: DocumentCreateRequest) -> DocumentUploadRespo
         # Generate document ID
         doc_id = str(uuid.uuid4())
         
-        # Create Haystack Document
-        doc = Document(
-            id=doc_id,
-            content=request.content,
-            meta=request.metadata or {},
-        )
-        
-        # Index the document - returns dict with pipeline results
-        result = index_documents([doc])
-        
-        # Extract chunk count from writer result
-        chunk_count = result.get("writer", {}).get("documents_written", 0)
-        
-        return DocumentUploadResponse(
+        # The queue is SQLite and may wait on a lock; keep it off the event loop
+        job_id = await run_in_threadpool(
+            submit_job,
             document_id=doc_id,
-            chunk_count=chunk_count,
-            message=f"Document indexed successfully with {chunk_count} chunks",
+            payload=request.content.encode("utf-8"),
+            metadata=request.metadata or {},
         )
+        return _accepted(job_id, doc_id, "Document queued for indexing")
         
+    except QueueFullError as e:
+        raise _queue_full(e)
     except Exception as e:
-        logger.exception("Failed to create document")
+        logger.exception("Failed to queue document")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal server error",
@@ -79,17 +91,17 @@ async def create_document(request: DocumentCreateRequest) -> DocumentUploadRespo
 
 @router.post(
     "/upload",
-    response_model=DocumentUploadResponse,
-    status_code=status.HTTP_201_CREATED,
+    response_model=IngestionJobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
     summary="Upload Document File",
     description=(
-        "Upload and index a document file. "
+        "Upload a document file and queue it for indexing; poll the returned status URL for progress. "
         "Supported: TXT, MD, RST, PDF, DOCX, XLSX, PPTX, CSV, JSON, YAML, HTML."
     ),
 )
 async def upload_document(
     file: UploadFile = File(..., description="Document file to upload"),
-) -> DocumentUploadResponse:
+) -> IngestionJobResponse:
     filename = file.filename or "unknown"
     extension = ("." + filename.rsplit(".", 1)[-1].lower()) if "." in filename else ""
 
@@ -102,42 +114,74 @@ async def upload_document(
 
     try:
         raw = await file.read()
-        text_content = extract_text(raw, extension)
 
-        if not text_content.strip():
+        # Text is extracted by the worker; only an empty upload is rejected here
+        if not raw.strip():
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail="File contains no extractable text",
+                detail="File is empty",
             )
 
         doc_id = str(uuid.uuid4())
-        doc = Document(
-            id=doc_id,
-            content=text_content,
-            meta={"filename": filename, "source": "file_upload"},
-        )
-
-        result = index_documents([doc])
-        chunk_count = result.get("writer", {}).get("documents_written", 0)
-
-        return DocumentUploadResponse(
+        job_id = await run_in_threadpool(
+            submit_job,
             document_id=doc_id,
-            chunk_count=chunk_count,
-            message=f"File '{filename}' indexed successfully with {chunk_count} chunks",
+            payload=raw,
+            extension=extension,
+            filename=filename,
+            metadata={"filename": filename, "source": "file_upload"},
         )
+        return _accepted(job_id, doc_id, f"File '{filename}' queued for indexing")
 
     except HTTPException:
         raise
-    except ValueError as e:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except QueueFullError as e:
+        raise _queue_full(e)
     except Exception:
-        logger.exception("Failed to upload document")
+        logger.exception("Failed to queue upload")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal server error",
         )
 
 
+@router.get(
+    "/jobs/{job_id}",
+    response_model=JobStatusResponse,
+    summary="Ingestion Job Status",
+    description="Report the stage, chunk progress and per-stage timings of an ingestion job.",
+)
+async def get_job(job_id: str) -> JobStatusResponse:
+    job = await run_in_threadpool(get_job_queue().get, job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found",
+        )
+    return JobStatusResponse(
+        job_id=job["id"],
+        document_id=job["document_id"],
+        filename=job["filename"],
+        stage=job["stage"],
+        progress=JobProgress(
+            chunks_total=job["chunks_total"],
+            chunks_embedded=job["chunks_embedded"],
+            chunks_written=job["chunks_written"],
+        ),
+        timings=job["timings"],
+        attempts=job["attempts"],
+        worker=job["lease_owner"],
+        created_at=_timestamp(job["created_at"]),
+        started_at=_timestamp(job["started_at"]),
+        finished_at=_timestamp(job["finished_at"]),
+        error=job["error"],
+    )
+
+
+def _timestamp(epoch: Optional[float]) -> Optional[datetime]:
+    return datetime.fromtimestamp(epoch, tz=timezone.utc) if epoch is not None else None
+
+
 @router.get(
     "",
     response_model=DocumentListResponse,
@@ -1,19 +1,49 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 from fastapi.responses import StreamingResponse
 import logging
-import json
-from typing import Optional
-from src.api.schemas.query import QueryRequest, QueryResponse
-from src.pipelines.retrieval import retrieve_documents, retrieve_documents_streaming
+from typing import Any, Awaitable, Callable, Dict, Optional
+from src.api.schemas.query import BatchQueryRequest, BatchQueryResponse, QueryRequest, QueryResponse
+from src.api.sse import coalesce_tokens, encode_event
+from src.config.settings import settings
+from src.pipelines.deadline import DeadlineExceeded
+from src.pipelines.retrieval import aretrieve_documents, aretrieve_documents_streaming, retrieve_documents_batch
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
-async def generate_sse_stream(query: str, top_k: int, provider_override: Optional[str] = None):
-    """Generate Server-Sent Events stream for query results."""
+async def generate_sse_stream(
+    query: str,
+    top_k: int,
+    provider_override: Optional[str] = None,
+    timeout_seconds: Optional[float] = None,
+    is_disconnected: Optional[Callable[[], Awaitable[bool]]] = None,
+    hybrid: Optional[bool] = None,
+    filters: Optional[Dict[str, Any]] = None,
+    hnsw_ef: Optional[int] = None,
+    exact: Optional[bool] = None
+):
+    """Generate Server-Sent Events stream for query results as pre-encoded frames."""
+    events = aretrieve_documents_streaming(
+        query=query,
+        top_k=top_k,
+        provider_override=provider_override,
+        timeout_seconds=timeout_seconds,
+        is_disconnected=is_disconnected,
+        hybrid=hybrid,
+        filters=filters,
+        hnsw_ef=hnsw_ef,
+        exact=exact
+    )
+    if settings.sse_token_batching_enabled:
+        events = coalesce_tokens(
+            events,
+            flush_interval_ms=settings.sse_flush_interval_ms,
+            max_chars=settings.sse_flush_max_chars
+        )
+    
     try:
-        for chunk in retrieve_documents_streaming(query=query, top_k=top_k, provider_override=provider_override):
+        async for chunk in events:
             if chunk["type"] == "documents":
                 docs = chunk["data"]
                 data = {
@@ -29,19 +59,19 @@ async def generate_sse_stream(query: str, top_k: int, provider_override: Optiona
                     ],
                     "metadata": chunk["metadata"]
                 }
-                yield f"data: {json.dumps(data)}\n\n"
+                yield encode_event(data)
                 
             elif chunk["type"] == "token":
-                # Send each token as it arrives
+                # Send tokens as they arrive (merged into batches when enabled)
                 data = {
                     "type": "token",
                     "content": chunk["data"]
                 }
-                yield f"data: {json.dumps(data)}\n\n"
+                yield encode_event(data)
                 
             elif chunk["type"] == "done":
                 # Signal completion with metadata
-                yield f"data: {json.dumps({'type': 'done', 'metadata': chunk.get('metadata', {})})}\n\n"
+                yield encode_event({"type": "done", "metadata": chunk.get("metadata", {})})
                 
             elif chunk["type"] == "error":
                 # Send error and stop
@@ -49,7 +79,12 @@ async def generate_sse_stream(query: str, top_k: int, provider_override: Optiona
                     "type": "error",
                     "error": chunk["error"]
                 }
-                yield f"data: {json.dumps(data)}\n\n"
+                # Deadline errors say which stage ran out of time and whether
+                # the tokens already sent form a partial answer
+                for key in ("timeout", "stage", "partial"):
+                    if key in chunk:
+                        data[key] = chunk[key]
+                yield encode_event(data)
                 break
                 
     except Exception as e:
@@ -58,11 +93,14 @@ async def generate_sse_stream(query: str, top_k: int, provider_override: Optiona
             "type": "error",
             "error": "Internal server error"
         }
-        yield f"data: {json.dumps(error_data)}\n\n"
+        yield encode_event(error_data)
+    finally:
+        # Release the upstream stream even when we stop early
+        await events.aclose()
 
 
 @router.post("/query", response_model=QueryResponse)
-async def query_documents(query_request: QueryRequest):
+async def query_documents(query_request: QueryRequest, request: Request):
     """
     Query documents and get AI-generated answers.
     
@@ -85,7 +123,13 @@ async def query_documents(query_request: QueryRequest):
             generate_sse_stream(
                 query=query_request.query,
                 top_k=query_request.top_k,
-                provider_override=query_request.provider
+                provider_override=query_request.provider,
+                timeout_seconds=query_request.timeout_seconds,
+                is_disconnected=request.is_disconnected,
+                hybrid=query_request.hybrid,
+                filters=query_request.filters,
+                hnsw_ef=query_request.hnsw_ef,
+                exact=query_request.exact
             ),
             media_type="text/event-stream",
             headers={
@@ -97,10 +141,15 @@ async def query_documents(query_request: QueryRequest):
     
     # Non-streaming response (existing behavior)
     try:
-        results = retrieve_documents(
+        results = await aretrieve_documents(
             query=query_request.query,
             top_k=query_request.top_k,
-            provider_override=query_request.provider
+            provider_override=query_request.provider,
+            timeout_seconds=query_request.timeout_seconds,
+            hybrid=query_request.hybrid,
+            filters=query_request.filters,
+            hnsw_ef=query_request.hnsw_ef,
+            exact=query_request.exact
         )
         
         return QueryResponse(
@@ -111,8 +160,63 @@ async def query_documents(query_request: QueryRequest):
     except HTTPException:
         # Re-raise HTTP exceptions (like 400 errors)
         raise
+    except DeadlineExceeded as e:
+        logger.warning(f"Query timed out: {e}")
+        raise HTTPException(status_code=504, detail=str(e))
     except Exception as e:
         # Log the full exception with stack trace for debugging
         logger.exception("Error processing query request")
         # Return generic error to client (don't leak internals)
-        raise HTTPException(status_code=500, detail="Internal server error")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.post("/query/batch", response_model=BatchQueryResponse)
+async def query_documents_batch(batch_request: BatchQueryRequest):
+    """
+    Answer many queries in one request.
+    
+    All queries are embedded in one request and searched with one Qdrant
+    batch call; answers are then generated concurrently under a per-provider
+    concurrency cap. Results keep the request order, and a failed item
+    carries an "error" instead of failing the whole batch.
+    """
+    if len(batch_request.queries) > settings.batch_max_queries:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Batch too large: {len(batch_request.queries)} queries (max {settings.batch_max_queries})"
+        )
+    
+    try:
+        results = await retrieve_documents_batch(
+            queries=batch_request.queries,
+            top_k=batch_request.top_k,
+            provider_override=batch_request.provider,
+            timeout_seconds=batch_request.timeout_seconds,
+            hybrid=batch_request.hybrid,
+            filters=batch_request.filters,
+            hnsw_ef=batch_request.hnsw_ef,
+            exact=batch_request.exact
+        )
+        
+        return BatchQueryResponse(
+            results=[
+                {
+                    "query": item["query"],
+                    "answer": item.get("answer"),
+                    "documents": [
+                        {"content": doc.content, "score": doc.score}
+                        for doc in item.get("documents", [])
+                    ],
+                    "metadata": item.get("metadata", {}),
+                    "error": item.get("error"),
+                }
+                for item in results["results"]
+            ],
+            metadata=results["metadata"]
+        )
+    except DeadlineExceeded as e:
+        logger.warning(f"Batch query timed out: {e}")
+        raise HTTPException(status_code=504, detail=str(e))
+    except Exception as e:
+        logger.exception("Error processing batch query request")
+        raise HTTPException(status_code=500, detail="Internal server error")
@@ -0,0 +1,61 @@
+"""
+Retrieval Endpoint
+
+Returns ranked chunks for a query without generating an answer, for
+consumers that only need the sources (flashcards, citation checks).
+"""
+
+from fastapi import APIRouter, HTTPException
+import logging
+
+from src.api.schemas.query import RetrieveRequest, RetrieveResponse
+from src.pipelines.deadline import DeadlineExceeded
+from src.pipelines.retrieval import aretrieve_chunks
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+
+@router.post("/retrieve", response_model=RetrieveResponse)
+async def retrieve(retrieve_request: RetrieveRequest):
+    """
+    Retrieve scored chunks for a query.
+    
+    Embeds the query and searches Qdrant; no LLM provider is involved, so
+    latency is embedding plus search.
+    """
+    if not retrieve_request.query.strip():
+        raise HTTPException(status_code=400, detail="Query cannot be empty")
+    
+    try:
+        results = await aretrieve_chunks(
+            query=retrieve_request.query,
+            top_k=retrieve_request.top_k,
+            with_vectors=retrieve_request.with_vectors,
+            timeout_seconds=retrieve_request.timeout_seconds,
+            hybrid=retrieve_request.hybrid,
+            filters=retrieve_request.filters,
+            hnsw_ef=retrieve_request.hnsw_ef,
+            exact=retrieve_request.exact
+        )
+        
+        return RetrieveResponse(
+            query=results["query"],
+            documents=[
+                {
+                    "id": doc.id,
+                    "content": doc.content or "",
+                    "score": doc.score,
+                    "metadata": doc.meta,
+                    "vector": doc.embedding if retrieve_request.with_vectors else None,
+                }
+                for doc in results["documents"]
+            ],
+            metadata=results["metadata"]
+        )
+    except DeadlineExceeded as e:
+        logger.warning(f"Retrieve timed out: {e}")
+        raise HTTPException(status_code=504, detail=str(e))
+    except Exception as e:
+        logger.exception("Error processing retrieve request")
+        raise HTTPException(status_code=500, detail="Internal server error")
@@ -52,11 +52,39 @@ class DocumentDeleteResponse(BaseModel):
     deleted_count: Optional[int] = Field(default=None, description="Number of documents deleted (for bulk)")
 
 
-class DocumentUploadResponse(BaseModel):
-    """Response model for document upload."""
-    document_id: str = Field(..., description="Generated document identifier")
-    chunk_count: int = Field(..., description="Number of chunks created during indexing")
-    message: str = Field(..., description="Success message")
+class IngestionJobResponse(BaseModel):
+    """Response model for an accepted upload (indexed in the background)."""
+    job_id: str = Field(..., description="Ingestion job identifier")
+    document_id: str = Field(..., description="Identifier the document will be indexed under")
+    stage: str = Field(..., description="Current job stage (initially 'queued')")
+    status_url: str = Field(..., description="Endpoint reporting the job's progress")
+    message: str = Field(..., description="Confirmation message")
+
+
+class JobProgress(BaseModel):
+    """Chunk counts of an ingestion job."""
+    chunks_total: int = Field(..., description="Chunks the document was split into (0 until chunked)")
+    chunks_embedded: int = Field(..., description="Chunks embedded so far")
+    chunks_written: int = Field(..., description="Chunks written to the vector store so far")
+
+
+class JobStatusResponse(BaseModel):
+    """Response model for an ingestion job's status."""
+    job_id: str = Field(..., description="Ingestion job identifier")
+    document_id: str = Field(..., description="Identifier the document is indexed under")
+    filename: Optional[str] = Field(default=None, description="Uploaded filename (file uploads only)")
+    stage: str = Field(
+        ...,
+        description="queued, extracting, chunking, embedding, writing, completed or failed"
+    )
+    progress: JobProgress = Field(..., description="Chunk progress")
+    timings: Dict[str, float] = Field(default_factory=dict, description="Seconds spent per stage")
+    attempts: int = Field(..., description="Times a worker started the job (more than 1 after a retry)")
+    worker: Optional[str] = Field(default=None, description="Worker that last leased the job")
+    created_at: datetime = Field(..., description="When the upload was accepted")
+    started_at: Optional[datetime] = Field(default=None, description="When a worker last started the job")
+    finished_at: Optional[datetime] = Field(default=None, description="When the job completed or failed")
+    error: Optional[str] = Field(default=None, description="Failure reason (failed jobs, or queued jobs awaiting a retry)")
 
 
 class HealthResponse(BaseModel):
@@ -1,12 +1,17 @@
 from pydantic import BaseModel, Field, field_validator
 from typing import List, Optional, Dict, Any
+from src.document_stores.filters import build_filter
 
 class QueryRequest(BaseModel):
     query: str = Field(..., description="The user's question or query")
     top_k: Optional[int] = Field(default=None, description="Number of documents to retrieve (uses settings default if not provided)")
-    filters: Optional[Dict[str, Any]] = Field(default=None, description="Metadata filters for document retrieval")
+    filters: Optional[Dict[str, Any]] = Field(default=None, description="Metadata filters: field (dots for nested) -> value, list (any of), or operators $eq/$ne/$in/$nin/$gt/$gte/$lt/$lte")
     stream: bool = Field(default=False, description="Enable streaming response via Server-Sent Events")
     provider: Optional[str] = Field(default=None, description="Override LLM provider selection (openai|anthropic|groq)")
+    timeout_seconds: Optional[float] = Field(default=None, gt=0, le=600, description="End-to-end deadline in seconds (uses settings default if not provided)")
+    hybrid: Optional[bool] = Field(default=None, description="Fuse dense and BM25 keyword search with reciprocal-rank fusion (uses settings default if not provided)")
+    hnsw_ef: Optional[int] = Field(default=None, ge=1, le=4096, description="HNSW search beam size; higher trades latency for recall (uses settings default if not provided)")
+    exact: Optional[bool] = Field(default=None, description="Exact (brute-force) search instead of HNSW; decided by collection size and filters if not provided")
     
     @field_validator('provider', mode='after')
     @classmethod
@@ -14,6 +19,13 @@ class QueryRequest(BaseModel):
         if v is not None and v not in ["openai", "anthropic", "groq"]:
             raise ValueError("provider must be one of: openai, anthropic, groq")
         return v
+    
+    @field_validator('filters')
+    @classmethod
+    def validate_filters(cls, v: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Validate filters translate to a Qdrant filter."""
+        build_filter(v)
+        return v
     provider: Optional[str] = Field(default=None, description="Manual LLM provider selection (openai|anthropic|groq)")
     
     @field_validator('provider')
@@ -31,4 +43,69 @@ class DocumentResult(BaseModel):
 class QueryResponse(BaseModel):
     answer: str = Field(..., description="AI-generated answer based on retrieved documents")
     documents: List[DocumentResult] = Field(..., description="Retrieved document chunks with scores")
-    metadata: Dict[str, Any] = Field(default_factory=dict, description="Additional metadata including provider_used and timing")
\ No newline at end of file
+    metadata: Dict[str, Any] = Field(default_factory=dict, description="Additional metadata including provider_used and timing")
+
+class BatchQueryRequest(BaseModel):
+    queries: List[str] = Field(..., min_length=1, description="Questions to answer; results are returned in the same order")
+    top_k: Optional[int] = Field(default=None, description="Number of documents to retrieve per query (uses settings default if not provided)")
+    provider: Optional[str] = Field(default=None, description="Override LLM provider selection (openai|anthropic|groq)")
+    timeout_seconds: Optional[float] = Field(default=None, gt=0, le=3600, description="Deadline for the whole batch in seconds (uses settings default if not provided)")
+    filters: Optional[Dict[str, Any]] = Field(default=None, description="Metadata filters applied to every query (see QueryRequest.filters)")
+    hybrid: Optional[bool] = Field(default=None, description="Fuse dense and BM25 keyword search with reciprocal-rank fusion (uses settings default if not provided)")
+    hnsw_ef: Optional[int] = Field(default=None, ge=1, le=4096, description="HNSW search beam size; higher trades latency for recall (uses settings default if not provided)")
+    exact: Optional[bool] = Field(default=None, description="Exact (brute-force) search instead of HNSW; decided by collection size and filters if not provided")
+    
+    @field_validator('provider')
+    @classmethod
+    def validate_provider(cls, v: Optional[str]) -> Optional[str]:
+        """Validate provider is one of the supported options."""
+        if v is not None and v not in ["openai", "anthropic", "groq"]:
+            raise ValueError("Provider must be one of: openai, anthropic, groq")
+        return v
+    
+    @field_validator('filters')
+    @classmethod
+    def validate_filters(cls, v: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Validate filters translate to a Qdrant filter."""
+        build_filter(v)
+        return v
+
+class BatchQueryResult(BaseModel):
+    query: str = Field(..., description="The question as submitted")
+    answer: Optional[str] = Field(default=None, description="AI-generated answer (absent if this item failed)")
+    documents: List[DocumentResult] = Field(default_factory=list, description="Retrieved document chunks with scores")
+    metadata: Dict[str, Any] = Field(default_factory=dict, description="Per-query metadata including provider_used")
+    error: Optional[str] = Field(default=None, description="Error message if this item failed")
+
+class BatchQueryResponse(BaseModel):
+    results: List[BatchQueryResult] = Field(..., description="One result per query, in request order")
+    metadata: Dict[str, Any] = Field(default_factory=dict, description="Batch metadata including failure count and timing")
+
+class RetrieveRequest(BaseModel):
+    query: str = Field(..., description="The user's question or query")
+    top_k: Optional[int] = Field(default=None, description="Number of chunks to retrieve (uses settings default if not provided)")
+    with_vectors: bool = Field(default=False, description="Include stored chunk vectors in the response")
+    filters: Optional[Dict[str, Any]] = Field(default=None, description="Metadata filters (see QueryRequest.filters)")
+    timeout_seconds: Optional[float] = Field(default=None, gt=0, le=600, description="End-to-end deadline in seconds (uses settings default if not provided)")
+    hybrid: Optional[bool] = Field(default=None, description="Fuse dense and BM25 keyword search with reciprocal-rank fusion (uses settings default if not provided)")
+    hnsw_ef: Optional[int] = Field(default=None, ge=1, le=4096, description="HNSW search beam size; higher trades latency for recall (uses settings default if not provided)")
+    exact: Optional[bool] = Field(default=None, description="Exact (brute-force) search instead of HNSW; decided by collection size and filters if not provided")
+    
+    @field_validator('filters')
+    @classmethod
+    def validate_filters(cls, v: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Validate filters translate to a Qdrant filter."""
+        build_filter(v)
+        return v
+
+class RetrievedChunk(BaseModel):
+    id: Optional[str] = Field(default=None, description="Chunk identifier")
+    content: str = Field(..., description="Chunk content")
+    score: Optional[float] = Field(default=None, description="Similarity score")
+    metadata: Dict[str, Any] = Field(default_factory=dict, description="Chunk metadata (source document, filename, ...)")
+    vector: Optional[List[float]] = Field(default=None, description="Stored chunk vector (only when with_vectors is set)")
+
+class RetrieveResponse(BaseModel):
+    query: str = Field(..., description="The query as submitted")
+    documents: List[RetrievedChunk] = Field(..., description="Retrieved chunks, highest score first")
+    metadata: Dict[str, Any] = Field(default_factory=dict, description="Retrieval metadata including timing")
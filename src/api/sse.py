@@ -0,0 +1,101 @@
+"""
+Server-Sent Events Helpers
+
+Frame encoding and token coalescing for the streaming query endpoint.
+
+Frames are serialized with orjson and returned as pre-encoded bytes. Token coalescing merges
+LLM deltas into fewer frames: the first token is sent immediately, later
+tokens are flushed every `flush_interval_ms` or once `max_chars` have
+accumulated, whichever comes first.
+"""
+
+from typing import Any, AsyncIterator, Dict, List
+import asyncio
+import orjson
+
+
+def encode_event(data: Dict[str, Any]) -> bytes:
+    """Encode one SSE `data:` frame as bytes."""
+    payload = orjson.dumps(data, default=str, option=orjson.OPT_NON_STR_KEYS)
+    return b"data: " + payload + b"\n\n"
+
+
+async def coalesce_tokens(
+    events: AsyncIterator[Dict[str, Any]],
+    flush_interval_ms: int,
+    max_chars: int,
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Merge consecutive token events from a retrieval stream.
+
+    Any non-token event flushes the buffered tokens first, so event order is
+    preserved. Buffered tokens are also flushed when the interval elapses
+    while the upstream is idle.
+
+    Args:
+        events: Event stream from `aretrieve_documents_streaming`
+        flush_interval_ms: Maximum time a token waits in the buffer
+        max_chars: Buffered characters that trigger an immediate flush
+
+    Yields:
+        The same events, with runs of token events merged
+    """
+    loop = asyncio.get_running_loop()
+    flush_interval = flush_interval_ms / 1000
+    buffer: List[str] = []
+    buffered_chars = 0
+    flush_at = 0.0
+    first_token_sent = False
+    pending = None
+
+    def flush() -> Dict[str, Any]:
+        nonlocal buffered_chars
+        event = {"type": "token", "data": "".join(buffer)}
+        buffer.clear()
+        buffered_chars = 0
+        return event
+
+    try:
+        while True:
+            if pending is None:
+                # Await the next event as a task so a flush timeout doesn't cancel it
+                pending = asyncio.ensure_future(anext(events))
+            if buffer:
+                done, _ = await asyncio.wait({pending}, timeout=max(0.0, flush_at - loop.time()))
+                if not done:
+                    yield flush()
+                    continue
+            else:
+                await asyncio.wait({pending})
+
+            task, pending = pending, None
+            try:
+                event = task.result()
+            except StopAsyncIteration:
+                break
+
+            if event["type"] != "token":
+                if buffer:
+                    yield flush()
+                yield event
+                continue
+
+            if not first_token_sent:
+                first_token_sent = True
+                yield event
+                continue
+
+            if not buffer:
+                flush_at = loop.time() + flush_interval
+            buffer.append(event["data"])
+            buffered_chars += len(event["data"])
+            if buffered_chars >= max_chars:
+                yield flush()
+
+        if buffer:
+            yield flush()
+    finally:
+        if pending is not None:
+            pending.cancel()
+            await asyncio.gather(pending, return_exceptions=True)
+        await events.aclose()
@@ -6,11 +6,28 @@ All settings can be overridden via environment variables.
 """
 
 from typing import Optional, List, Union
-from pydantic import Field, field_validator
+from pydantic import Field, field_validator, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pathlib import Path
 
 
+LOCAL_EMBEDDING_PROVIDERS = {"sentence-transformers", "local"}
+
+# Native output size of common embedding models, used when EMBEDDING_DIMENSION is unset
+# (sentence-transformers models may be given with or without their "sentence-transformers/" prefix)
+NATIVE_EMBEDDING_DIMENSIONS = {
+    "text-embedding-3-small": 1536,
+    "text-embedding-3-large": 3072,
+    "text-embedding-ada-002": 1536,
+    "all-MiniLM-L6-v2": 384,
+    "all-MiniLM-L12-v2": 384,
+    "all-mpnet-base-v2": 768,
+    "BAAI/bge-small-en-v1.5": 384,
+    "BAAI/bge-base-en-v1.5": 768,
+    "BAAI/bge-large-en-v1.5": 1024,
+}
+
+
 class Settings(BaseSettings):
     """Application settings with environment variable support."""
     
@@ -49,7 +66,21 @@ class Settings(BaseSettings):
     llm_temperature: float = Field(default=0.0, ge=0.0, le=2.0, description="LLM temperature (0=deterministic)")
     llm_max_tokens: int = Field(default=1024, ge=1, le=4096, description="Max tokens per response")
     llm_streaming: bool = Field(default=True, description="Enable streaming responses")
-    llm_timeout_seconds: int = Field(default=60, ge=10, le=300, description="LLM request timeout in seconds")
+    llm_timeout_seconds: int = Field(
+        default=60,
+        ge=10,
+        le=300,
+        description="Per-call LLM timeout in seconds; each call is also capped by the query's remaining deadline"
+    )
+    request_timeout_seconds: float = Field(
+        default=90.0,
+        ge=1.0,
+        le=600.0,
+        description=(
+            "End-to-end deadline for a query (embedding, search, retries and generation); "
+            "set it above llm_timeout_seconds or the deadline, not the LLM timeout, ends slow generations"
+        )
+    )
     
     # -------------------------------------------------------------------------
     # Multi-Provider Configuration (Phase 3)
@@ -74,6 +105,28 @@ class Settings(BaseSettings):
         default=True,
         description="Allow manual provider selection via API"
     )
+    llm_hedging_enabled: bool = Field(
+        default=False,
+        description="Start the next fallback provider in parallel when the primary is slow to stream its first token"
+    )
+    llm_hedge_percentile: float = Field(
+        default=95.0,
+        ge=50.0,
+        le=99.9,
+        description="Time-to-first-token percentile of the primary provider after which a hedge fires"
+    )
+    llm_hedge_default_delay_ms: int = Field(
+        default=1500,
+        ge=50,
+        le=30000,
+        description="Hedge delay used until enough time-to-first-token samples are collected"
+    )
+    llm_hedge_min_samples: int = Field(
+        default=20,
+        ge=1,
+        le=200,
+        description="Time-to-first-token samples required before the learned hedge delay is used"
+    )
     
     # -------------------------------------------------------------------------
     # Retry Configuration
@@ -91,6 +144,61 @@ class Settings(BaseSettings):
     qdrant_collection_name: str = Field(default="documents", description="Qdrant collection name")
     qdrant_api_key: Optional[str] = Field(default=None, description="Qdrant Cloud API key")
     qdrant_url: Optional[str] = Field(default=None, description="Qdrant Cloud URL (overrides host/port)")
+    # Note: Union[str, List[str]] prevents Pydantic Settings from JSON-parsing env vars.
+    qdrant_payload_indexes: Union[str, List[str]] = Field(
+        default=["parent_id:keyword", "filename:keyword", "source:keyword"],
+        description="Filterable payload fields to index, as field:type (keyword, integer, float, bool, datetime, ...)"
+    )
+    qdrant_compression: str = Field(
+        default="none",
+        description="Vector compression profile for new collections: none, float16, int8 or binary"
+    )
+    qdrant_quantization_oversampling: Optional[float] = Field(
+        default=None,
+        ge=1.0,
+        le=16.0,
+        description="Candidates fetched per result before rescoring (int8 default 2.0, binary 3.0)"
+    )
+    qdrant_quantization_rescore: bool = Field(default=True, description="Rescore quantized candidates with original vectors")
+    qdrant_originals_on_disk: bool = Field(
+        default=False,
+        description="Keep original vectors on disk; only quantized vectors stay in RAM"
+    )
+    qdrant_write_batch_size: int = Field(default=256, ge=1, le=10000, description="Points per upsert request when writing documents")
+    qdrant_write_parallelism: int = Field(default=4, ge=1, le=64, description="Upsert requests in flight at once when writing documents")
+    qdrant_bulk_load_min_documents: int = Field(
+        default=5000,
+        ge=0,
+        description="Writes of at least this many documents suspend HNSW indexing until they finish (0 disables)"
+    )
+    qdrant_indexing_threshold_kb: int = Field(
+        default=20000,
+        ge=0,
+        description="Segment size (KB) above which Qdrant builds an HNSW index; set on new collections and restored after bulk loads"
+    )
+    qdrant_bulk_load_timeout: float = Field(
+        default=600.0,
+        gt=0,
+        description="Seconds to wait for a collection to turn green after a bulk load"
+    )
+    qdrant_hnsw_m: int = Field(default=16, ge=4, le=128, description="HNSW graph degree for new collections")
+    qdrant_hnsw_ef_construct: int = Field(default=100, ge=4, le=1000, description="HNSW build beam size for new collections")
+    qdrant_full_scan_threshold_kb: int = Field(
+        default=10000,
+        ge=0,
+        description="Segments/filter results below this many KB of vectors are searched by full scan (new collections)"
+    )
+    qdrant_hnsw_ef: Optional[int] = Field(
+        default=None,
+        ge=1,
+        le=4096,
+        description="Default HNSW search beam size (Qdrant uses ef_construct if not set)"
+    )
+    exact_search_max_points: int = Field(
+        default=5000,
+        ge=0,
+        description="Use exact search when the collection, or the filtered subset, has at most this many points (0 disables)"
+    )
     
     # -------------------------------------------------------------------------
     # Embedding Configuration
@@ -101,9 +209,30 @@ class Settings(BaseSettings):
     )
     embedding_model: str = Field(
         default="text-embedding-3-small",
-        description="Embedding model name"
+        description="OpenAI embedding model name"
+    )
+    local_embedding_model: str = Field(
+        default="sentence-transformers/all-MiniLM-L6-v2",
+        description="sentence-transformers model name or path for the local provider"
+    )
+    embedding_dimension: Optional[int] = Field(
+        default=None,
+        ge=128,
+        le=4096,
+        description=(
+            "Stored vector size; Matryoshka models (text-embedding-3-*, ...) are shortened to it. "
+            "Defaults to the native size of the active provider's model"
+        )
+    )
+    embedding_batch_size: int = Field(default=64, ge=1, le=2048, description="Max texts per embedding request / forward pass")
+    local_embedding_device: str = Field(default="cpu", description="Torch device for the sentence-transformers backend")
+    local_embedding_threads: int = Field(default=1, ge=1, le=64, description="Worker threads encoding with the local model")
+    local_embedding_max_wait_ms: float = Field(
+        default=2.0,
+        ge=0.0,
+        le=1000.0,
+        description="How long the local backend waits for concurrent requests to fill a batch"
     )
-    embedding_dimension: int = Field(default=1536, ge=128, le=4096)
     
     # -------------------------------------------------------------------------
     # Document Processing
@@ -111,6 +240,53 @@ class Settings(BaseSettings):
     chunk_size: int = Field(default=512, ge=128, le=2048, description="Document chunk size in tokens")
     chunk_overlap: int = Field(default=50, ge=0, le=500, description="Overlap between chunks in tokens")
     chunk_separator: str = Field(default="\n\n", description="Separator for splitting documents")
+    indexing_pipeline_pool_size: int = Field(
+        default=2,
+        ge=1,
+        le=32,
+        description="Indexing pipelines kept warm for concurrent uploads"
+    )
+    ingestion_queue_path: str = Field(
+        default="var/ingestion.db",
+        description="SQLite file spooling ingestion jobs; pending jobs survive restarts"
+    )
+    ingestion_concurrency: int = Field(default=2, ge=1, le=32, description="Ingestion jobs processed at once")
+    ingestion_max_pending: int = Field(
+        default=100,
+        ge=0,
+        description="Queued jobs above which new uploads are rejected with 503 (0 = unbounded)"
+    )
+    ingestion_step_size: int = Field(
+        default=256,
+        ge=1,
+        le=10000,
+        description="Chunks embedded and written per step of an ingestion job (progress granularity)"
+    )
+    ingestion_workers_in_api: bool = Field(
+        default=True,
+        description="Process ingestion jobs in the API process (disable when standalone workers drain the queue)"
+    )
+    ingestion_queue_shared_filesystem: bool = Field(
+        default=False,
+        description="The queue file is on a network filesystem shared by several hosts (uses a rollback journal instead of WAL)"
+    )
+    ingestion_visibility_timeout: float = Field(
+        default=300.0,
+        gt=0,
+        description="Seconds a claimed job stays leased without a heartbeat before another worker may take it"
+    )
+    ingestion_max_attempts: int = Field(default=3, ge=1, le=20, description="Attempts per ingestion job before it fails")
+    ingestion_retry_backoff: float = Field(
+        default=30.0,
+        ge=0,
+        description="Seconds before retrying a failed job (doubles with each attempt)"
+    )
+    ingestion_extract_processes: int = Field(
+        default=2,
+        ge=1,
+        le=64,
+        description="Text extraction processes per standalone worker"
+    )
     
     # Note: Union[str, List[str]] prevents Pydantic Settings from JSON-parsing env vars.
     # The validator ensures this is always List[str] after initialization.
@@ -130,6 +306,87 @@ class Settings(BaseSettings):
         le=1.0,
         description="Minimum similarity threshold"
     )
+    context_max_input_tokens: int = Field(
+        default=4096,
+        ge=256,
+        le=200_000,
+        description="Token budget for the RAG prompt (template, question and packed chunks)"
+    )
+    context_min_chunk_tokens: int = Field(
+        default=64,
+        ge=1,
+        le=2048,
+        description="Smallest truncated chunk worth packing into the prompt"
+    )
+    context_merge_adjacent_chunks: bool = Field(
+        default=True,
+        description="Stitch retrieved chunks that are adjacent in their document into one passage, dropping the overlap"
+    )
+    context_expand_neighbours: bool = Field(
+        default=False,
+        description="Add each retrieved chunk's previous and next chunk (fetched by ID) before merging"
+    )
+    hybrid_search_enabled: bool = Field(
+        default=False,
+        description="Default to hybrid dense + BM25 search (fused with RRF) when a request does not choose"
+    )
+    hybrid_prefetch_limit: int = Field(
+        default=50,
+        ge=1,
+        le=1000,
+        description="Candidates fetched from each of the dense and BM25 legs before fusion"
+    )
+    mmr_enabled: bool = Field(
+        default=False,
+        description="Re-rank over-fetched chunks with maximal marginal relevance to drop near-duplicates"
+    )
+    mmr_lambda: float = Field(
+        default=0.7,
+        ge=0.0,
+        le=1.0,
+        description="MMR relevance/diversity trade-off (1.0 = relevance only)"
+    )
+    mmr_fetch_factor: int = Field(
+        default=4,
+        ge=1,
+        le=20,
+        description="MMR candidates fetched per requested chunk (top_k * factor)"
+    )
+    
+    # -------------------------------------------------------------------------
+    # Query Caching
+    # -------------------------------------------------------------------------
+    embedding_cache_enabled: bool = Field(default=True, description="Cache query embeddings in-process")
+    embedding_cache_max_size: int = Field(default=2048, ge=1, le=1_000_000, description="Max cached query embeddings")
+    embedding_cache_ttl_seconds: int = Field(default=3600, ge=1, description="Query embedding cache TTL in seconds")
+    semantic_cache_enabled: bool = Field(
+        default=False,
+        description="Serve cached answers for semantically near-identical queries"
+    )
+    semantic_cache_max_distance: float = Field(
+        default=0.05,
+        ge=0.0,
+        le=1.0,
+        description="Max cosine distance between query embeddings for a semantic cache hit"
+    )
+    semantic_cache_max_size: int = Field(default=1024, ge=1, le=100_000, description="Max cached answers")
+    semantic_cache_ttl_seconds: int = Field(default=900, ge=1, description="Semantic answer cache TTL in seconds")
+    query_coalescing_enabled: bool = Field(
+        default=True,
+        description="Share one pipeline execution between concurrent identical queries"
+    )
+    
+    # -------------------------------------------------------------------------
+    # Batch Queries
+    # -------------------------------------------------------------------------
+    batch_max_queries: int = Field(default=256, ge=1, le=2048, description="Maximum queries per /query/batch request")
+    batch_max_concurrency_per_provider: int = Field(
+        default=8,
+        ge=1,
+        le=128,
+        description="Maximum concurrent LLM calls per provider while answering a batch"
+    )
+    batch_timeout_seconds: float = Field(default=300.0, ge=10.0, le=3600.0, description="Deadline for a whole batch")
     
     # -------------------------------------------------------------------------
     # FastAPI Application
@@ -149,6 +406,15 @@ class Settings(BaseSettings):
         description="Allowed CORS origins"
     )
     
+    # Streaming responses: merge LLM deltas into fewer SSE frames
+    sse_token_batching_enabled: bool = Field(
+        default=True,
+        description="Coalesce streamed tokens into time/size-bounded SSE frames (first token is always sent immediately)"
+    )
+    sse_flush_interval_ms: int = Field(default=50, ge=1, le=2000, description="Max time a token waits before its frame is sent")
+    sse_flush_max_chars: int = Field(default=256, ge=1, le=16384, description="Buffered characters that trigger an immediate frame")
+    sse_disconnect_poll_ms: int = Field(default=250, ge=10, le=5000, description="How often a streaming request checks for client disconnect")
+    
     # -------------------------------------------------------------------------
     # Logging
     # -------------------------------------------------------------------------
@@ -169,7 +435,7 @@ class Settings(BaseSettings):
         path.mkdir(parents=True, exist_ok=True)
         return path
     
-    @field_validator("cors_origins", "supported_file_types", mode="before")
+    @field_validator("cors_origins", "supported_file_types", "qdrant_payload_indexes", mode="before")
     @classmethod
     def parse_comma_separated_list(cls, v, info):
         """Parse comma-separated strings into lists.
@@ -190,9 +456,34 @@ class Settings(BaseSettings):
             return [item.strip() for item in v.split(",") if item.strip()]
         return v
     
+    @model_validator(mode="after")
+    def resolve_embedding_dimension(self):
+        """Default the embedding dimension to the active model's native size and reject larger ones."""
+        model = self.active_embedding_model
+        native = NATIVE_EMBEDDING_DIMENSIONS.get(model.removeprefix("sentence-transformers/"))
+        if self.embedding_dimension is None:
+            if native is None:
+                raise ValueError(
+                    f"embedding_dimension is required for embedding model '{model}' "
+                    f"(set EMBEDDING_DIMENSION to its output size)"
+                )
+            self.embedding_dimension = native
+        elif native is not None and self.embedding_dimension > native:
+            raise ValueError(
+                f"embedding_dimension {self.embedding_dimension} exceeds the {native} dims of '{model}'"
+            )
+        return self
+    
     # -------------------------------------------------------------------------
     # Computed Properties
     # -------------------------------------------------------------------------
+    @property
+    def active_embedding_model(self) -> str:
+        """Model name of the configured embedding provider."""
+        if self.embedding_provider.lower() in LOCAL_EMBEDDING_PROVIDERS:
+            return self.local_embedding_model
+        return self.embedding_model
+    
     @property
     def qdrant_connection(self) -> dict:
         """Get Qdrant connection parameters."""
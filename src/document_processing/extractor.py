@@ -11,6 +11,11 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+
+class ExtractionError(ValueError):
+    """Raised when an upload cannot be turned into text (unsupported, corrupt or empty)."""
+    pass
+
 SUPPORTED_EXTENSIONS = {
     ".txt", ".md", ".rst",
     ".pdf",
@@ -29,30 +34,19 @@ def extract_text(content: bytes, extension: str) -> str:
     Extract plain text from file bytes based on extension.
 
     Raises:
-        ValueError: If the format is unsupported or content cannot be parsed.
+        ExtractionError: If the format is unsupported or content cannot be parsed.
     """
     ext = extension.lower()
-
-    if ext in (".txt", ".md", ".rst"):
-        return _extract_plaintext(content)
-    if ext == ".pdf":
-        return _extract_pdf(content)
-    if ext == ".docx":
-        return _extract_docx(content)
-    if ext in (".xlsx", ".xls"):
-        return _extract_xlsx(content)
-    if ext == ".pptx":
-        return _extract_pptx(content)
-    if ext == ".csv":
-        return _extract_csv(content)
-    if ext == ".json":
-        return _extract_json(content)
-    if ext in (".yaml", ".yml"):
-        return _extract_yaml(content)
-    if ext in (".html", ".htm"):
-        return _extract_html(content)
-
-    raise ValueError(f"Unsupported file format: {ext}")
+    handler = _HANDLERS.get(ext)
+    if handler is None:
+        raise ExtractionError(f"Unsupported file format: {ext}")
+    try:
+        return handler(content)
+    except ExtractionError:
+        raise
+    except Exception as e:
+        # Parsers fail the same way on the same bytes
+        raise ExtractionError(f"Could not parse {ext} file: {e}") from e
 
 
 # ---------------------------------------------------------------------------
@@ -75,7 +69,7 @@ def _extract_pdf(content: bytes) -> str:
         if text.strip():
             pages.append(f"[Page {i + 1}]\n{text.strip()}")
     if not pages:
-        raise ValueError("PDF contains no extractable text (may be scanned/image-only)")
+        raise ExtractionError("PDF contains no extractable text (may be scanned/image-only)")
     return "\n\n".join(pages)
 
 
@@ -93,7 +87,7 @@ def _extract_docx(content: bytes) -> str:
             if row_text:
                 parts.append(row_text)
     if not parts:
-        raise ValueError("DOCX contains no extractable text")
+        raise ExtractionError("DOCX contains no extractable text")
     return "\n\n".join(parts)
 
 
@@ -111,7 +105,7 @@ def _extract_xlsx(content: bytes) -> str:
         if rows:
             sheets.append(f"[Sheet: {sheet_name}]\n" + "\n".join(rows))
     if not sheets:
-        raise ValueError("Spreadsheet contains no data")
+        raise ExtractionError("Spreadsheet contains no data")
     return "\n\n".join(sheets)
 
 
@@ -130,7 +124,7 @@ def _extract_pptx(content: bytes) -> str:
         if texts:
             slides.append(f"[Slide {i}]\n" + "\n".join(texts))
     if not slides:
-        raise ValueError("Presentation contains no extractable text")
+        raise ExtractionError("Presentation contains no extractable text")
     return "\n\n".join(slides)
 
 
@@ -142,7 +136,7 @@ def _extract_csv(content: bytes) -> str:
     reader = csv.reader(io.StringIO(text))
     rows = [" | ".join(cell.strip() for cell in row) for row in reader if any(c.strip() for c in row)]
     if not rows:
-        raise ValueError("CSV contains no data")
+        raise ExtractionError("CSV contains no data")
     return "\n".join(rows)
 
 
@@ -150,7 +144,7 @@ def _extract_json(content: bytes) -> str:
     try:
         data = json.loads(content.decode("utf-8"))
     except (json.JSONDecodeError, UnicodeDecodeError) as e:
-        raise ValueError(f"Invalid JSON: {e}")
+        raise ExtractionError(f"Invalid JSON: {e}")
     return json.dumps(data, indent=2, ensure_ascii=False)
 
 
@@ -159,7 +153,7 @@ def _extract_yaml(content: bytes) -> str:
     try:
         data = yaml.safe_load(content.decode("utf-8"))
     except Exception as e:
-        raise ValueError(f"Invalid YAML: {e}")
+        raise ExtractionError(f"Invalid YAML: {e}")
     return yaml.dump(data, allow_unicode=True, default_flow_style=False)
 
 
@@ -172,5 +166,23 @@ def _extract_html(content: bytes) -> str:
     text = soup.get_text(separator="\n")
     lines = [line.strip() for line in text.splitlines() if line.strip()]
     if not lines:
-        raise ValueError("HTML contains no extractable text")
+        raise ExtractionError("HTML contains no extractable text")
     return "\n".join(lines)
+
+
+_HANDLERS = {
+    ".txt": _extract_plaintext,
+    ".md": _extract_plaintext,
+    ".rst": _extract_plaintext,
+    ".pdf": _extract_pdf,
+    ".docx": _extract_docx,
+    ".xlsx": _extract_xlsx,
+    ".xls": _extract_xlsx,
+    ".pptx": _extract_pptx,
+    ".csv": _extract_csv,
+    ".json": _extract_json,
+    ".yaml": _extract_yaml,
+    ".yml": _extract_yaml,
+    ".html": _extract_html,
+    ".htm": _extract_html,
+}
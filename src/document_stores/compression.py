@@ -0,0 +1,167 @@
+"""
+Vector Compression Profiles
+
+Named storage profiles for the dense vectors of a collection:
+
+    none      float32 vectors, no quantization
+    float16   half-precision vectors (2x smaller, no search-time changes)
+    int8      float32 originals + int8 scalar-quantized copy in RAM (4x smaller)
+    binary    float32 originals + 1-bit binary-quantized copy in RAM (32x smaller)
+
+Quantized profiles search the compressed copy with oversampling, then rescore
+the best candidates with the original vectors, which keeps recall close to
+uncompressed search. With `originals_on_disk`, only the quantized copy stays
+in RAM and originals are read from disk for rescoring.
+"""
+
+from enum import Enum
+from typing import Any, Dict, Optional
+import math
+from qdrant_client.models import (
+    BinaryQuantization,
+    BinaryQuantizationConfig,
+    Datatype,
+    Distance,
+    QuantizationConfig,
+    QuantizationSearchParams,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
+    VectorParams,
+)
+
+
+class CompressionProfile(str, Enum):
+    """Vector compression profiles."""
+    NONE = "none"
+    FLOAT16 = "float16"
+    INT8 = "int8"
+    BINARY = "binary"
+
+
+# How many extra candidates quantized search fetches before rescoring
+DEFAULT_OVERSAMPLING = {
+    CompressionProfile.INT8: 2.0,
+    CompressionProfile.BINARY: 3.0,
+}
+
+
+def get_profile(name: str) -> CompressionProfile:
+    """
+    Look up a compression profile by name.
+
+    Raises:
+        ValueError: If the name is not a known profile
+    """
+    try:
+        return CompressionProfile(name.lower())
+    except ValueError:
+        raise ValueError(
+            f"Unknown compression profile '{name}'; use one of {[p.value for p in CompressionProfile]}"
+        ) from None
+
+
+def is_quantized(profile: CompressionProfile) -> bool:
+    """Whether a profile searches a quantized copy of the vectors."""
+    return profile in DEFAULT_OVERSAMPLING
+
+
+def vectors_config(
+    profile: CompressionProfile,
+    size: int,
+    distance: Distance,
+    originals_on_disk: bool = False,
+) -> VectorParams:
+    """Dense vector parameters for a new collection."""
+    return VectorParams(
+        size=size,
+        distance=distance,
+        datatype=Datatype.FLOAT16 if profile == CompressionProfile.FLOAT16 else None,
+        on_disk=originals_on_disk or None,
+    )
+
+
+def quantization_config(profile: CompressionProfile) -> Optional[QuantizationConfig]:
+    """Collection quantization config for a profile (None if unquantized)."""
+    if profile == CompressionProfile.INT8:
+        return ScalarQuantization(
+            scalar=ScalarQuantizationConfig(type=ScalarType.INT8, quantile=0.99, always_ram=True)
+        )
+    if profile == CompressionProfile.BINARY:
+        return BinaryQuantization(binary=BinaryQuantizationConfig(always_ram=True))
+    return None
+
+
+def quantization_search_params(
+    profile: CompressionProfile,
+    oversampling: Optional[float] = None,
+    rescore: bool = True,
+) -> Optional[QuantizationSearchParams]:
+    """
+    Search-time quantization parameters matching a profile.
+
+    Args:
+        profile: Collection compression profile
+        oversampling: Candidate multiplier before rescoring (profile default if None)
+        rescore: Re-rank candidates with the original vectors
+
+    Returns:
+        QuantizationSearchParams, or None for unquantized profiles
+    """
+    if not is_quantized(profile):
+        return None
+    return QuantizationSearchParams(
+        rescore=rescore,
+        oversampling=oversampling or DEFAULT_OVERSAMPLING[profile],
+    )
+
+
+def detect_profile(vectors: Any, quantization: Any) -> CompressionProfile:
+    """
+    Infer the compression profile of an existing collection.
+
+    Args:
+        vectors: The collection's dense VectorParams
+        quantization: The collection-level quantization config
+    """
+    quantization = getattr(vectors, "quantization_config", None) or quantization
+    if isinstance(quantization, BinaryQuantization):
+        return CompressionProfile.BINARY
+    if isinstance(quantization, ScalarQuantization):
+        return CompressionProfile.INT8
+    if getattr(vectors, "datatype", None) == Datatype.FLOAT16:
+        return CompressionProfile.FLOAT16
+    return CompressionProfile.NONE
+
+
+def memory_footprint(
+    profile: CompressionProfile,
+    points: int,
+    dimension: int,
+    originals_on_disk: bool = False,
+) -> Dict[str, int]:
+    """
+    Estimate the storage of a collection's dense vectors (HNSW graph excluded).
+
+    Args:
+        profile: Compression profile
+        points: Number of stored vectors
+        dimension: Vector dimension
+        originals_on_disk: Whether full-precision vectors live on disk
+
+    Returns:
+        Byte counts: original_vector_bytes, quantized_vector_bytes, ram_bytes, disk_bytes
+    """
+    original = points * dimension * (2 if profile == CompressionProfile.FLOAT16 else 4)
+    if profile == CompressionProfile.INT8:
+        quantized = points * dimension
+    elif profile == CompressionProfile.BINARY:
+        quantized = points * math.ceil(dimension / 8)
+    else:
+        quantized = 0
+    return {
+        "original_vector_bytes": original,
+        "quantized_vector_bytes": quantized,
+        "ram_bytes": quantized + (0 if originals_on_disk else original),
+        "disk_bytes": original if originals_on_disk else 0,
+    }
@@ -0,0 +1,121 @@
+"""
+Metadata Filters
+
+Translates request metadata filters into Qdrant filters. Keys are payload
+fields; nested fields use dots ("course.code"). A value is either matched
+exactly, or is a dict of operators:
+
+    {"course": "LAW101"}                         exact match
+    {"course": ["LAW101", "LAW102"]}             any of (shorthand for $in)
+    {"year": {"$gte": 2020, "$lt": 2024}}        range
+    {"published": {"$gte": "2024-01-01"}}        datetime range (ISO strings)
+    {"status": {"$ne": "draft"}}                 not equal
+    {"tags": {"$nin": ["archived"]}}             none of
+
+All conditions must hold.
+"""
+
+from typing import Any, Dict, List, Optional
+from qdrant_client.models import (
+    DatetimeRange,
+    FieldCondition,
+    Filter,
+    MatchAny,
+    MatchExcept,
+    MatchValue,
+    Range,
+)
+
+RANGE_OPERATORS = {"$gt": "gt", "$gte": "gte", "$lt": "lt", "$lte": "lte"}
+MATCH_OPERATORS = {"$eq", "$ne", "$in", "$nin"}
+
+
+class FilterError(ValueError):
+    """Raised for malformed metadata filters."""
+    pass
+
+
+def _check_scalar(key: str, value: Any) -> None:
+    if not isinstance(value, (str, int)):
+        raise FilterError(f"Filter on '{key}' must match strings, integers or booleans, got {value!r}")
+
+
+def _check_list(key: str, operator: str, values: Any) -> List[Any]:
+    if not isinstance(values, list) or not values:
+        raise FilterError(f"'{operator}' on '{key}' expects a non-empty list")
+    if any(isinstance(value, bool) or not isinstance(value, (str, int)) for value in values):
+        raise FilterError(f"'{operator}' on '{key}' expects strings or integers")
+    return values
+
+
+def _range_condition(key: str, bounds: Dict[str, Any]) -> FieldCondition:
+    """Build a numeric or datetime range condition."""
+    values = list(bounds.values())
+    if all(isinstance(v, str) for v in values):
+        range_type = DatetimeRange
+    elif all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in values):
+        range_type = Range
+    else:
+        raise FilterError(f"Range on '{key}' needs all numeric or all ISO datetime bounds")
+    try:
+        return FieldCondition(
+            key=key,
+            range=range_type(**{RANGE_OPERATORS[op]: v for op, v in bounds.items()}),
+        )
+    except ValueError as e:
+        raise FilterError(f"Invalid range on '{key}': bounds must be numbers or ISO datetimes") from e
+
+
+def build_filter(filters: Optional[Dict[str, Any]]) -> Optional[Filter]:
+    """
+    Build a Qdrant filter from request metadata filters.
+
+    Args:
+        filters: Field -> value or operator dict (see module docstring)
+
+    Returns:
+        Qdrant Filter, or None when there is nothing to filter on
+
+    Raises:
+        FilterError: If a filter is malformed
+    """
+    if not filters:
+        return None
+
+    must: List[FieldCondition] = []
+    must_not: List[FieldCondition] = []
+    for key, value in filters.items():
+        if not isinstance(key, str) or not key or key.startswith("$"):
+            raise FilterError(f"Invalid filter field {key!r}")
+
+        if isinstance(value, list):
+            value = {"$in": value}
+        if not isinstance(value, dict):
+            _check_scalar(key, value)
+            must.append(FieldCondition(key=key, match=MatchValue(value=value)))
+            continue
+
+        unknown = set(value) - MATCH_OPERATORS - set(RANGE_OPERATORS)
+        if unknown or not value:
+            raise FilterError(
+                f"Unsupported filter operator(s) on '{key}': {sorted(unknown) or 'none given'}; "
+                f"use {sorted(MATCH_OPERATORS | set(RANGE_OPERATORS))}"
+            )
+
+        bounds = {op: v for op, v in value.items() if op in RANGE_OPERATORS}
+        if bounds:
+            must.append(_range_condition(key, bounds))
+        if "$eq" in value:
+            _check_scalar(key, value["$eq"])
+            must.append(FieldCondition(key=key, match=MatchValue(value=value["$eq"])))
+        if "$ne" in value:
+            _check_scalar(key, value["$ne"])
+            must_not.append(FieldCondition(key=key, match=MatchValue(value=value["$ne"])))
+        if "$in" in value:
+            must.append(FieldCondition(key=key, match=MatchAny(any=_check_list(key, "$in", value["$in"]))))
+        if "$nin" in value:
+            must.append(FieldCondition(
+                key=key, match=MatchExcept(**{"except": _check_list(key, "$nin", value["$nin"])})
+            ))
+
+    return Filter(must=must or None, must_not=must_not or None)
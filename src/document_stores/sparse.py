@@ -0,0 +1,91 @@
+"""
+BM25 Sparse Vectors
+
+Computes BM25-style sparse term vectors locally, without an external model,
+for the lexical leg of hybrid search. Documents carry the BM25 term-frequency
+component; the IDF component is applied by Qdrant at query time
+(`Modifier.IDF` on the sparse vector), so it always reflects the current
+collection and needs no corpus statistics here.
+"""
+
+from typing import Dict, List, Tuple
+from collections import Counter
+import re
+import zlib
+
+# BM25 term-frequency saturation and length normalization
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Identifiers such as "12-305", "u.s.c" or "art.5" stay one token so exact
+# statute and section numbers can match; their parts are indexed as well.
+_TOKEN_PATTERN = re.compile(r"\w+(?:[.\-/:]\w+)*")
+_PART_PATTERN = re.compile(r"[.\-/:]")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercase terms for BM25 scoring.
+
+    Compound identifiers are emitted whole followed by their parts, so
+    "Section 12-305" yields ["section", "12-305", "12", "305"].
+
+    Args:
+        text: Text to tokenize
+
+    Returns:
+        Terms in text order (with repeats)
+    """
+    terms = []
+    for match in _TOKEN_PATTERN.finditer(text.lower()):
+        term = match.group()
+        terms.append(term)
+        if _PART_PATTERN.search(term):
+            terms.extend(part for part in _PART_PATTERN.split(term) if part)
+    return terms
+
+
+def term_index(term: str) -> int:
+    """Map a term to a stable sparse dimension (CRC32, so no vocabulary is stored)."""
+    return zlib.crc32(term.encode("utf-8"))
+
+
+def _to_sparse(weights: Dict[int, float]) -> Tuple[List[int], List[float]]:
+    indices = sorted(weights)
+    return indices, [weights[index] for index in indices]
+
+
+def encode_document(text: str, avg_doc_length: float) -> Tuple[List[int], List[float]]:
+    """
+    Encode a chunk as BM25 term-frequency weights.
+
+    Args:
+        text: Chunk content
+        avg_doc_length: Expected chunk length in terms (for length normalization)
+
+    Returns:
+        (indices, values) of the sparse vector; empty for text without terms
+    """
+    terms = tokenize(text)
+    if not terms:
+        return [], []
+    counts = Counter(term_index(term) for term in terms)
+    norm = BM25_K1 * (1 - BM25_B + BM25_B * len(terms) / avg_doc_length)
+    weights = {
+        index: count * (BM25_K1 + 1) / (count + norm)
+        for index, count in counts.items()
+    }
+    return _to_sparse(weights)
+
+
+def encode_query(text: str) -> Tuple[List[int], List[float]]:
+    """
+    Encode a query as a binary term vector (IDF is applied by Qdrant).
+
+    Args:
+        text: Query text
+
+    Returns:
+        (indices, values) of the sparse vector; empty for text without terms
+    """
+    return _to_sparse({term_index(term): 1.0 for term in tokenize(text)})
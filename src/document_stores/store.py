@@ -6,23 +6,174 @@ Integrates with Haystack 2.x for RAG pipelines.
 """
 
 from typing import List, Optional, Dict, Any
+from collections import OrderedDict, defaultdict
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import logging
 import hashlib
 import threading
-from qdrant_client import QdrantClient
+import time
+import numpy as np
+from qdrant_client import AsyncQdrantClient, QdrantClient
+from qdrant_client.local.qdrant_local import QdrantLocal
 from qdrant_client.models import (
     Distance,
-    VectorParams,
-    PointStruct,
+    Batch,
+    CollectionStatus,
     Filter,
-    FieldCondition,
-    MatchValue,
+    PayloadSchemaType,
+    QueryRequest,
+    SparseVectorParams,
+    SparseVector,
+    Modifier,
+    Prefetch,
+    FusionQuery,
+    Fusion,
+    HnswConfigDiff,
+    OptimizersConfigDiff,
+    QuantizationSearchParams,
+    SearchParams,
 )
 from haystack.dataclasses import Document
 from src.config.settings import settings
+from src.document_stores.compression import (
+    detect_profile,
+    get_profile,
+    is_quantized,
+    memory_footprint,
+    quantization_config,
+    quantization_search_params,
+    vectors_config,
+)
+from src.document_stores.filters import build_filter
+from src.document_stores.sparse import encode_document, encode_query
 
 logger = logging.getLogger(__name__)
 
+# Name of the BM25 sparse vector stored next to the (unnamed) dense vector
+SPARSE_VECTOR_NAME = "bm25"
+
+# How long a collection's or filter's point count is reused by the exact-search
+# policy (local writes invalidate it immediately through the collection generation)
+POINT_COUNT_TTL_SECONDS = 30.0
+
+# Distinct filters whose point counts are cached by the exact-search policy
+FILTER_COUNT_CACHE_SIZE = 256
+
+# How often a bulk load polls the collection status while waiting for green
+BULK_LOAD_POLL_SECONDS = 1.0
+
+# Active bulk loads per collection in this process (nesting depth)
+_bulk_loads: Dict[str, int] = {}
+_bulk_load_lock = threading.Lock()
+
+# Per-collection mutation counters. Every write or delete bumps the counter so
+# query-side caches can tell whether a collection changed since an entry was stored.
+# Local counters only see this process's writes; writes by other processes (e.g.
+# standalone ingestion workers) arrive through `set_shared_generation`.
+_collection_generations: Dict[str, int] = {}
+_shared_generations: Dict[str, int] = {}
+_generation_lock = threading.Lock()
+
+
+def get_collection_generation(collection_name: str) -> int:
+    """
+    Get the current mutation generation of a collection.
+    
+    The sum of the local and shared counters: both only grow, so the sum
+    changes whenever either does.
+    """
+    return _collection_generations.get(collection_name, 0) + _shared_generations.get(collection_name, 0)
+
+
+def set_shared_generation(collection_name: str, generation: int) -> None:
+    """Record a collection's generation as counted by other processes (see `src.pipelines.jobs`)."""
+    _shared_generations[collection_name] = generation
+
+
+def bump_collection_generation(collection_name: str) -> int:
+    """Mark a collection as changed, returning the new generation."""
+    with _generation_lock:
+        generation = _collection_generations.get(collection_name, 0) + 1
+        _collection_generations[collection_name] = generation
+        return generation
+
+
+class DimensionMismatchError(ValueError):
+    """Raised when an existing collection's vector size differs from the configured dimension."""
+    pass
+
+
+def _point_id(doc_id: Any) -> str:
+    """
+    Map a document ID to its Qdrant point ID.
+    
+    ID Scheme Version: v1 - UUID format from MD5 hash. MD5 produces a 128-bit
+    hash which maps to UUID format; the original ID is stored in the payload.
+    """
+    md5_hash = hashlib.md5(str(doc_id).encode()).hexdigest()
+    return f"{md5_hash[:8]}-{md5_hash[8:12]}-{md5_hash[12:16]}-{md5_hash[16:20]}-{md5_hash[20:]}"
+
+
+def parse_payload_indexes(declared: List[str]) -> Dict[str, PayloadSchemaType]:
+    """
+    Parse "field:type" payload index declarations (e.g. "course.code:keyword").
+    
+    Raises:
+        ValueError: If an entry has no type or an unknown type
+    """
+    indexes = {}
+    for entry in declared:
+        field_name, _, type_name = entry.rpartition(":")
+        try:
+            indexes[field_name.strip()] = PayloadSchemaType(type_name.strip().lower())
+        except ValueError:
+            types = ", ".join(t.value for t in PayloadSchemaType)
+            raise ValueError(f"Invalid payload index '{entry}': expected field:type with type one of {types}")
+        if not field_name.strip():
+            raise ValueError(f"Invalid payload index '{entry}': missing field name")
+    return indexes
+
+
+def chunk_positions(documents: List[Document]) -> Dict[str, Dict[str, Any]]:
+    """
+    Derive chunk position payload from `DocumentSplitter` metadata.
+    
+    Records the parent document, split index and character offsets in the
+    parent text, so overlapping neighbours can be stitched without
+    duplicated text. Consecutive chunks of a parent in `documents` are
+    linked by ID, so a hit's neighbours can be fetched directly. Pass every
+    chunk of a split at once: chunks written in several batches should get
+    their positions up front (see `index_documents_in_stages`), and chunks
+    whose meta already carries a `parent_id` are left as they are.
+    
+    Returns:
+        Position payload by document ID (chunks without splitter metadata are absent)
+    """
+    by_parent = defaultdict(list)
+    for doc in documents:
+        if "parent_id" in doc.meta:
+            continue
+        if doc.meta.get("source_id") is not None and doc.meta.get("split_id") is not None:
+            by_parent[doc.meta["source_id"]].append(doc)
+    
+    positions = {}
+    for parent_id, chunks in by_parent.items():
+        chunks.sort(key=lambda doc: doc.meta["split_id"])
+        for i, doc in enumerate(chunks):
+            split_index = doc.meta["split_id"]
+            position = {"parent_id": str(parent_id), "split_index": split_index}
+            char_start = doc.meta.get("split_idx_start")
+            if char_start is not None:
+                position["char_start"] = char_start
+                position["char_end"] = char_start + len(doc.content or "")
+            if i > 0 and chunks[i - 1].meta["split_id"] == split_index - 1:
+                position["prev_chunk_id"] = str(chunks[i - 1].id)
+            if i + 1 < len(chunks) and chunks[i + 1].meta["split_id"] == split_index + 1:
+                position["next_chunk_id"] = str(chunks[i + 1].id)
+            positions[doc.id] = position
+    return positions
+
 
 class QdrantDocumentStore:
     """
@@ -30,7 +181,13 @@ class QdrantDocumentStore:
     
     Features:
     - Vector storage with metadata
-    - Similarity search with filtering
+    - Similarity search with metadata filters (see `src.document_stores.filters`)
+    - Payload indexes for declared filterable fields
+    - Hybrid dense + BM25 search fused with reciprocal-rank fusion
+    - Vector compression profiles (float16, int8/binary quantization with rescoring)
+    - HNSW tuning per collection and per request, with automatic exact search
+      for small or heavily filtered collections
+    - Bulk loads that suspend HNSW indexing during large ingests
     - Document CRUD operations
     - Collection management
     """
@@ -40,6 +197,7 @@ class QdrantDocumentStore:
         collection_name: Optional[str] = None,
         embedding_dimension: Optional[int] = None,
         distance_metric: Distance = Distance.COSINE,
+        compression: Optional[str] = None,
     ):
         """
         Initialize Qdrant document store.
@@ -48,11 +206,31 @@ class QdrantDocumentStore:
             collection_name: Name of the Qdrant collection
             embedding_dimension: Dimension of embedding vectors
             distance_metric: Distance metric for similarity (COSINE, EUCLID, DOT)
+            compression: Compression profile for a new collection
+                (none, float16, int8, binary; defaults to `qdrant_compression`)
+        
+        Raises:
+            ValueError: If the compression profile is unknown
         """
         self.collection_name = collection_name or settings.qdrant_collection_name
         self.embedding_dimension = embedding_dimension or settings.embedding_dimension
         self.distance_metric = distance_metric
         
+        # Compression profile in effect (the existing collection's, if it differs)
+        self.compression = get_profile(compression or settings.qdrant_compression)
+        self.originals_on_disk = settings.qdrant_originals_on_disk
+        
+        # Whether the collection stores BM25 sparse vectors (set by _ensure_collection)
+        self.sparse_enabled = False
+        
+        # (generation, monotonic time, count) of recent point counts, keyed by the
+        # serialized filter; None holds the whole collection's (see _resolve_exact)
+        self._point_counts: "OrderedDict[Optional[str], tuple]" = OrderedDict()
+        self._point_counts_lock = threading.Lock()
+        
+        # Async client for the asyncio query path (created on first use)
+        self._async_client: Optional[AsyncQdrantClient] = None
+        
         # Initialize Qdrant client
         connection_params = settings.qdrant_connection
         if "url" in connection_params:
@@ -75,6 +253,23 @@ class QdrantDocumentStore:
         # Ensure collection exists
         self._ensure_collection()
     
+    @property
+    def async_client(self) -> AsyncQdrantClient:
+        """Get or create the async Qdrant client sharing this store's connection settings."""
+        if self._async_client is None:
+            connection_params = settings.qdrant_connection
+            if "url" in connection_params:
+                self._async_client = AsyncQdrantClient(
+                    url=connection_params["url"],
+                    api_key=connection_params.get("api_key"),
+                )
+            else:
+                self._async_client = AsyncQdrantClient(
+                    host=connection_params["host"],
+                    port=connection_params["port"],
+                )
+        return self._async_client
+    
     def _ensure_collection(self) -> None:
         """Create collection if it doesn't exist."""
         try:
@@ -84,94 +279,392 @@ class QdrantDocumentStore:
             if self.collection_name not in collection_names:
                 self.client.create_collection(
                     collection_name=self.collection_name,
-                    vectors_config=VectorParams(
-                        size=self.embedding_dimension,
-                        distance=self.distance_metric,
+                    vectors_config=vectors_config(
+                        self.compression,
+                        self.embedding_dimension,
+                        self.distance_metric,
+                        self.originals_on_disk,
+                    ),
+                    sparse_vectors_config={
+                        SPARSE_VECTOR_NAME: SparseVectorParams(modifier=Modifier.IDF),
+                    },
+                    quantization_config=quantization_config(self.compression),
+                    hnsw_config=HnswConfigDiff(
+                        m=settings.qdrant_hnsw_m,
+                        ef_construct=settings.qdrant_hnsw_ef_construct,
+                        full_scan_threshold=settings.qdrant_full_scan_threshold_kb,
+                    ),
+                    optimizers_config=OptimizersConfigDiff(
+                        indexing_threshold=settings.qdrant_indexing_threshold_kb,
                     ),
                 )
+                self.sparse_enabled = True
                 logger.info(
                     f"Created collection '{self.collection_name}' "
-                    f"(dim={self.embedding_dimension}, metric={self.distance_metric})"
+                    f"(dim={self.embedding_dimension}, metric={self.distance_metric}, "
+                    f"compression={self.compression.value})"
                 )
+                self._ensure_payload_indexes({})
             else:
+                info = self.client.get_collection(self.collection_name)
+                params = info.config.params
+                self._check_dimension(params.vectors)
+                self._use_existing_compression(params.vectors, info.config.quantization_config)
+                self.sparse_enabled = SPARSE_VECTOR_NAME in (params.sparse_vectors or {})
+                self._ensure_payload_indexes(info.payload_schema or {})
+                if not self.sparse_enabled:
+                    logger.warning(
+                        f"Collection '{self.collection_name}' has no BM25 sparse vectors; "
+                        f"hybrid search falls back to dense until it is re-created and re-indexed"
+                    )
                 logger.info(f"Using existing collection '{self.collection_name}'")
         except Exception as e:
             logger.error(f"Failed to ensure collection exists: {e}")
             raise
     
+    def _check_dimension(self, vectors_config: Any) -> None:
+        """
+        Fail fast if the existing collection stores vectors of another size.
+        
+        Changing `embedding_dimension` (e.g. shortening Matryoshka embeddings)
+        needs a new collection; writing or searching the old one would fail
+        on every request instead.
+        
+        Raises:
+            DimensionMismatchError: If the dense vector size differs
+        """
+        if isinstance(vectors_config, dict):
+            vectors_config = vectors_config.get("")
+        size = getattr(vectors_config, "size", None)
+        if size is not None and size != self.embedding_dimension:
+            raise DimensionMismatchError(
+                f"Collection '{self.collection_name}' stores {size}-dim vectors but "
+                f"embedding_dimension is {self.embedding_dimension}; set EMBEDDING_DIMENSION={size} "
+                f"or use a new collection and re-index"
+            )
+    
+    def _use_existing_compression(self, vectors_config: Any, quantization: Any) -> None:
+        """Adopt the existing collection's compression profile, reporting a differing one."""
+        if isinstance(vectors_config, dict):
+            vectors_config = vectors_config.get("")
+        existing = detect_profile(vectors_config, quantization)
+        if existing != self.compression:
+            logger.warning(
+                f"Collection '{self.collection_name}' uses compression '{existing.value}', "
+                f"configured '{self.compression.value}'; re-create the collection to change it"
+            )
+            self.compression = existing
+        self.originals_on_disk = bool(getattr(vectors_config, "on_disk", False))
+    
+    def _ensure_payload_indexes(self, existing: Dict[str, Any]) -> None:
+        """
+        Create payload indexes for the fields declared in `qdrant_payload_indexes`.
+        
+        Filtered search over an indexed field lets Qdrant's HNSW search apply
+        the filter during traversal instead of scanning payloads. Existing
+        indexes are left alone; one declared with a different type is reported,
+        not rebuilt.
+        
+        Args:
+            existing: The collection's current payload schema (field -> index info)
+        """
+        for field_name, schema in parse_payload_indexes(settings.qdrant_payload_indexes).items():
+            current = existing.get(field_name)
+            if current is not None:
+                if current.data_type != schema:
+                    logger.warning(
+                        f"Payload index on '{field_name}' is {current.data_type.value}, "
+                        f"declared {schema.value}; drop it to rebuild"
+                    )
+                continue
+            self.client.create_payload_index(
+                collection_name=self.collection_name,
+                field_name=field_name,
+                field_schema=schema,
+                wait=True,
+            )
+            logger.info(f"Created {schema.value} payload index on '{field_name}'")
+    
     def write_documents(
         self,
         documents: List[Document],
-        batch_size: int = 100,
+        batch_size: Optional[int] = None,
         policy: Optional[Any] = None,
     ) -> int:
         """
         Write documents with embeddings to Qdrant.
         
+        Documents are converted column-wise (IDs, one float32 vector matrix,
+        payloads) and sent as `Batch` upserts. Up to `qdrant_write_parallelism`
+        batches are in flight at once without waiting for indexing; the last
+        batch is sent with `wait=True` after all others are acknowledged, so
+        the call returns once the whole write is applied.
+        
+        Writes of at least `qdrant_bulk_load_min_documents` documents run
+        inside `bulk_load`, so HNSW indexing is suspended until they finish.
+        
         Args:
             documents: List of Haystack Document objects with embeddings
-            batch_size: Number of documents to write per batch
+            batch_size: Number of documents per upsert (uses `qdrant_write_batch_size` if not provided)
             policy: Duplicate handling policy (currently ignored, uses overwrite behavior)
             
         Returns:
             Number of documents written
+            
+        Raises:
+            ValueError: If an embedding's size differs from the collection's
         """
         if not documents:
             logger.warning("No documents to write")
             return 0
         
-        points = []
-        for doc in documents:
-            if doc.embedding is None:
-                logger.warning(f"Document {doc.id} has no embedding, skipping")
-                continue
-            
-            # ID Scheme Version: v1 - UUID format from MD5 hash
-            # Convert document ID to UUID string for Qdrant point ID
-            # MD5 produces 128-bit hash which maps to UUID format
-            # Store original ID in payload for lookups
-            md5_hash = hashlib.md5(str(doc.id).encode()).hexdigest()
-            point_id = f"{md5_hash[:8]}-{md5_hash[8:12]}-{md5_hash[12:16]}-{md5_hash[16:20]}-{md5_hash[20:]}"
-            
-            # Prepare metadata (exclude embedding from payload)
-            # Filter out reserved keys from meta to prevent overwriting
-            reserved_keys = {"content", "doc_id", "embedding"}
-            filtered_meta = {k: v for k, v in doc.meta.items() if k not in reserved_keys}
-            payload = {
-                "content": doc.content,
-                "doc_id": str(doc.id),  # Original ID
-                **filtered_meta,
-            }
-            
-            # Create Qdrant point
-            point = PointStruct(
-                id=point_id,
-                vector=doc.embedding,
-                payload=payload,
-            )
-            points.append(point)
-        
-        if not points:
+        embedded = [doc for doc in documents if doc.embedding is not None]
+        if len(embedded) < len(documents):
+            skipped = [str(doc.id) for doc in documents if doc.embedding is None]
+            logger.warning(f"Skipping {len(skipped)} documents without embeddings: {skipped[:10]}")
+        if not embedded:
             logger.warning("No valid points to write (all documents missing embeddings)")
             return 0
         
-        # Write in batches
+        threshold = settings.qdrant_bulk_load_min_documents
+        if threshold and len(embedded) >= threshold:
+            with self.bulk_load():
+                return self._write_batches(embedded, batch_size)
+        return self._write_batches(embedded, batch_size)
+    
+    def _write_batches(self, documents: List[Document], batch_size: Optional[int]) -> int:
+        """Upsert embedded documents in parallel batches, the last one waiting (see `write_documents`)."""
+        columns = self._to_columns(documents)
+        batch_size = batch_size or settings.qdrant_write_batch_size
+        bounds = [(i, min(i + batch_size, len(documents))) for i in range(0, len(documents), batch_size)]
+        
         total_written = 0
-        for i in range(0, len(points), batch_size):
-            batch = points[i : i + batch_size]
-            try:
-                self.client.upsert(
+        try:
+            # Non-blocking batches in parallel; in-process Qdrant is not thread-safe
+            parallelism = 1 if self._is_local else settings.qdrant_write_parallelism
+            with ThreadPoolExecutor(max_workers=parallelism, thread_name_prefix="qdrant-upsert") as executor:
+                futures = [
+                    executor.submit(self._upsert_columns, columns, start, stop, False)
+                    for start, stop in bounds[:-1]
+                ]
+                try:
+                    for future in as_completed(futures):
+                        total_written += future.result()
+                except Exception:
+                    for future in futures:
+                        future.cancel()
+                    raise
+            
+            # Consistency barrier: updates are applied in order, so once the
+            # last batch is applied every earlier one is too
+            total_written += self._upsert_columns(columns, *bounds[-1], True)
+        except Exception as e:
+            logger.error(f"Failed to write batch: {e}")
+            raise
+        finally:
+            if total_written:
+                bump_collection_generation(self.collection_name)
+        
+        logger.info(f"Successfully wrote {total_written} documents to Qdrant in {len(bounds)} batches")
+        return total_written
+    
+    @contextmanager
+    def bulk_load(self, timeout: Optional[float] = None):
+        """
+        Suspend HNSW indexing while a large ingest runs.
+        
+        Sets the collection's optimizer `indexing_threshold` to 0, so new
+        segments are stored without building an HNSW graph (searches over them
+        fall back to full scan), restores `qdrant_indexing_threshold_kb` on exit
+        and then waits for the collection to report green, i.e. for the index to
+        be rebuilt once. The configured threshold is restored rather than the
+        live one, which may be 0 while another process is bulk loading.
+        
+        Bulk loads are tracked per process: nested or concurrent bulk loads of a
+        collection within this process share one suspension and the last one to
+        exit restores it, but a process cannot see bulk loads in other processes
+        (e.g. other ingestion workers). The first process to finish re-enables
+        indexing, and the others' remaining writes are indexed as they land -
+        slower, but still correct. In-process Qdrant has no HNSW optimizer, so
+        this is a no-op there.
+        
+        Args:
+            timeout: Seconds to wait for green (uses `qdrant_bulk_load_timeout` if not provided)
+        
+        Example:
+            with store.bulk_load():
+                for batch in batches:
+                    store.write_documents(batch)
+        """
+        if self._is_local:
+            yield
+            return
+        self._suspend_indexing()
+        try:
+            yield
+        finally:
+            restored = self._resume_indexing()
+        if restored:
+            self._wait_for_green(timeout or settings.qdrant_bulk_load_timeout)
+    
+    def _suspend_indexing(self) -> None:
+        """Disable indexing for the collection, or join a bulk load already in progress."""
+        with _bulk_load_lock:
+            depth = _bulk_loads.get(self.collection_name, 0)
+            if depth == 0:
+                self.client.update_collection(
                     collection_name=self.collection_name,
-                    points=batch,
+                    optimizers_config=OptimizersConfigDiff(indexing_threshold=0),
                 )
-                total_written += len(batch)
-                logger.info(f"Wrote batch of {len(batch)} documents to Qdrant")
-            except Exception as e:
-                logger.error(f"Failed to write batch: {e}")
-                raise
+                logger.info(f"Bulk load of '{self.collection_name}' started; HNSW indexing suspended")
+            _bulk_loads[self.collection_name] = depth + 1
+    
+    def _resume_indexing(self) -> bool:
+        """
+        Leave a bulk load, restoring the configured indexing threshold if it was the last one.
         
-        logger.info(f"Successfully wrote {total_written} documents to Qdrant")
-        return total_written
+        Returns:
+            bool: Whether indexing was re-enabled
+        """
+        with _bulk_load_lock:
+            depth = _bulk_loads.pop(self.collection_name)
+            if depth > 1:
+                _bulk_loads[self.collection_name] = depth - 1
+                return False
+            threshold = settings.qdrant_indexing_threshold_kb
+            self.client.update_collection(
+                collection_name=self.collection_name,
+                optimizers_config=OptimizersConfigDiff(indexing_threshold=threshold),
+            )
+            logger.info(f"Bulk load of '{self.collection_name}' writes done; indexing threshold restored to {threshold}KB")
+            return True
+    
+    def _wait_for_green(self, timeout: float) -> bool:
+        """
+        Poll the collection status until it is green (all segments optimized and indexed).
+        
+        Returns:
+            bool: False if the collection was still being indexed after `timeout` seconds
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            status = self.client.get_collection(self.collection_name).status
+            if status == CollectionStatus.GREEN:
+                logger.info(f"Bulk load of '{self.collection_name}' finished; collection is green")
+                return True
+            if time.monotonic() >= deadline:
+                logger.warning(
+                    f"Collection '{self.collection_name}' still {status.value} {timeout:.0f}s after bulk load; "
+                    f"indexing continues in the background"
+                )
+                return False
+            time.sleep(BULK_LOAD_POLL_SECONDS)
+    
+    @property
+    def _is_local(self) -> bool:
+        """Whether the client is an in-process Qdrant (":memory:" or a local path)."""
+        return isinstance(getattr(self.client, "_client", None), QdrantLocal)
+    
+    def _to_columns(self, documents: List[Document]) -> Dict[str, Any]:
+        """
+        Convert documents to point columns: IDs, a float32 vector matrix,
+        payloads and (for hybrid-capable collections) BM25 sparse vectors.
+        """
+        try:
+            vectors = np.asarray([doc.embedding for doc in documents], dtype=np.float32)
+        except ValueError:  # ragged embeddings
+            vectors = None
+        if vectors is None or vectors.ndim != 2 or vectors.shape[1] != self.embedding_dimension:
+            raise ValueError(
+                f"Embeddings must all have {self.embedding_dimension} dimensions "
+                f"(collection '{self.collection_name}')"
+            )
+        
+        positions = chunk_positions(documents)
+        # Filter out reserved keys from meta to prevent overwriting
+        reserved_keys = {"content", "doc_id", "embedding"}
+        payloads = [
+            {
+                "content": doc.content,
+                "doc_id": str(doc.id),  # Original ID
+                **{k: v for k, v in doc.meta.items() if k not in reserved_keys},
+                **positions.get(doc.id, {}),
+            }
+            for doc in documents
+        ]
+        
+        sparse = None
+        if self.sparse_enabled:
+            sparse = [
+                SparseVector(indices=indices, values=values)
+                for indices, values in (encode_document(doc.content or "", settings.chunk_size) for doc in documents)
+            ]
+        
+        return {
+            "ids": [_point_id(doc.id) for doc in documents],
+            "vectors": vectors,
+            "payloads": payloads,
+            "sparse": sparse,
+        }
+    
+    def _upsert_columns(self, columns: Dict[str, Any], start: int, stop: int, wait: bool) -> int:
+        """Upsert rows [start, stop) of the point columns as one `Batch`."""
+        dense = columns["vectors"][start:stop].tolist()
+        vectors = dense if columns["sparse"] is None else {
+            "": dense,
+            SPARSE_VECTOR_NAME: columns["sparse"][start:stop],
+        }
+        self.client.upsert(
+            collection_name=self.collection_name,
+            points=Batch(ids=columns["ids"][start:stop], vectors=vectors, payloads=columns["payloads"][start:stop]),
+            wait=wait,
+        )
+        logger.debug(f"Wrote batch of {stop - start} documents to Qdrant")
+        return stop - start
+    
+    def get_documents_by_id(self, document_ids: List[str]) -> List[Document]:
+        """
+        Fetch documents by ID in a single request.
+        
+        Args:
+            document_ids: Original document IDs (as passed to `write_documents`)
+            
+        Returns:
+            Found documents without scores; missing IDs are skipped
+        """
+        if not document_ids:
+            return []
+        try:
+            records = self.client.retrieve(
+                collection_name=self.collection_name,
+                ids=[_point_id(doc_id) for doc_id in document_ids],
+            )
+        except Exception as e:
+            logger.error(f"Failed to fetch documents by ID: {e}")
+            raise
+        return self._to_documents(records)
+    
+    async def get_documents_by_id_async(self, document_ids: List[str]) -> List[Document]:
+        """
+        Async variant of `get_documents_by_id`.
+        
+        Args:
+            document_ids: Original document IDs (as passed to `write_documents`)
+            
+        Returns:
+            Found documents without scores; missing IDs are skipped
+        """
+        if not document_ids:
+            return []
+        try:
+            records = await self.async_client.retrieve(
+                collection_name=self.collection_name,
+                ids=[_point_id(doc_id) for doc_id in document_ids],
+            )
+        except Exception as e:
+            logger.error(f"Failed to fetch documents by ID: {e}")
+            raise
+        return self._to_documents(records)
     
     def search(
         self,
@@ -179,6 +672,10 @@ class QdrantDocumentStore:
         top_k: int = 5,
         filters: Optional[Dict[str, Any]] = None,
         score_threshold: Optional[float] = None,
+        with_vectors: bool = False,
+        query_text: Optional[str] = None,
+        hnsw_ef: Optional[int] = None,
+        exact: Optional[bool] = None,
     ) -> List[Document]:
         """
         Search for similar documents using vector similarity.
@@ -187,39 +684,312 @@ class QdrantDocumentStore:
             query_embedding: Query vector
             top_k: Number of results to return
             filters: Metadata filters (e.g., {"document_id": "doc123"})
-            score_threshold: Minimum similarity score
+            score_threshold: Minimum similarity score (dense leg only in hybrid mode)
+            with_vectors: Also return stored vectors (as Document.embedding)
+            query_text: Query text; when given, run hybrid dense + BM25 search
+                fused with RRF (scores are then fusion scores, not similarities)
+            hnsw_ef: HNSW search beam size; higher trades latency for recall
+                (uses `qdrant_hnsw_ef` if not provided)
+            exact: Brute-force search instead of HNSW (None = decide automatically,
+                see `_resolve_exact`)
             
         Returns:
             List of matching Haystack Document objects with scores
         """
-        # Build Qdrant filter
-        qdrant_filter = None
-        if filters:
-            conditions = []
-            for key, value in filters.items():
-                conditions.append(
-                    FieldCondition(
-                        key=key,
-                        match=MatchValue(value=value),
-                    )
-                )
-            if conditions:
-                qdrant_filter = Filter(must=conditions)
+        qdrant_filter = self._build_filter(filters)
+        search_params = self._search_params(hnsw_ef, self._resolve_exact(exact, qdrant_filter))
+        query_args = self._query_args(query_embedding, top_k, qdrant_filter, score_threshold, query_text, search_params)
         
         # Search
         try:
             results = self.client.query_points(
                 collection_name=self.collection_name,
-                query=query_embedding,
                 limit=top_k,
                 query_filter=qdrant_filter,
-                score_threshold=score_threshold,
+                with_vectors=with_vectors,
+                search_params=search_params,
+                **query_args,
             ).points
         except Exception as e:
             logger.error(f"Search failed: {e}")
             raise
         
-        # Convert to Haystack Documents
+        documents = self._to_documents(results)
+        logger.info(f"Found {len(documents)} documents with {self._search_kind(query_args)} search")
+        return documents
+    
+    async def search_async(
+        self,
+        query_embedding: List[float],
+        top_k: int = 5,
+        filters: Optional[Dict[str, Any]] = None,
+        score_threshold: Optional[float] = None,
+        with_vectors: bool = False,
+        query_text: Optional[str] = None,
+        hnsw_ef: Optional[int] = None,
+        exact: Optional[bool] = None,
+    ) -> List[Document]:
+        """
+        Async variant of `search` using the non-blocking Qdrant client.
+        
+        Args:
+            query_embedding: Query vector
+            top_k: Number of results to return
+            filters: Metadata filters (e.g., {"document_id": "doc123"})
+            score_threshold: Minimum similarity score (dense leg only in hybrid mode)
+            with_vectors: Also return stored vectors (as Document.embedding)
+            query_text: Query text; when given, run hybrid dense + BM25 search
+                fused with RRF (scores are then fusion scores, not similarities)
+            hnsw_ef: HNSW search beam size (see `search`)
+            exact: Brute-force search instead of HNSW (see `search`)
+            
+        Returns:
+            List of matching Haystack Document objects with scores
+        """
+        qdrant_filter = self._build_filter(filters)
+        search_params = self._search_params(hnsw_ef, await self._aresolve_exact(exact, qdrant_filter))
+        query_args = self._query_args(query_embedding, top_k, qdrant_filter, score_threshold, query_text, search_params)
+        
+        try:
+            response = await self.async_client.query_points(
+                collection_name=self.collection_name,
+                limit=top_k,
+                query_filter=qdrant_filter,
+                with_vectors=with_vectors,
+                search_params=search_params,
+                **query_args,
+            )
+        except Exception as e:
+            logger.error(f"Async search failed: {e}")
+            raise
+        
+        documents = self._to_documents(response.points)
+        logger.info(f"Found {len(documents)} documents with {self._search_kind(query_args)} search")
+        return documents
+    
+    async def search_batch_async(
+        self,
+        query_embeddings: List[List[float]],
+        top_k: int = 5,
+        filters: Optional[Dict[str, Any]] = None,
+        score_threshold: Optional[float] = None,
+        query_texts: Optional[List[str]] = None,
+        with_vectors: bool = False,
+        hnsw_ef: Optional[int] = None,
+        exact: Optional[bool] = None,
+    ) -> List[List[Document]]:
+        """
+        Search for many query vectors in a single Qdrant batch request.
+        
+        Args:
+            query_embeddings: Query vectors
+            top_k: Number of results to return per query
+            filters: Metadata filters applied to every query
+            score_threshold: Minimum similarity score (dense leg only in hybrid mode)
+            query_texts: Query texts aligned with `query_embeddings`; when given,
+                each query runs hybrid dense + BM25 search (see `search`)
+            with_vectors: Also return stored vectors (as Document.embedding)
+            hnsw_ef: HNSW search beam size (see `search`)
+            exact: Brute-force search instead of HNSW (see `search`)
+            
+        Returns:
+            One list of matching Documents per query vector, in input order
+        """
+        if not query_embeddings:
+            return []
+        qdrant_filter = self._build_filter(filters)
+        search_params = self._search_params(hnsw_ef, await self._aresolve_exact(exact, qdrant_filter))
+        query_texts = query_texts or [None] * len(query_embeddings)
+        requests = [
+            QueryRequest(
+                limit=top_k,
+                filter=qdrant_filter,
+                with_payload=True,
+                with_vector=with_vectors,
+                params=search_params,
+                **self._query_args(query_embedding, top_k, qdrant_filter, score_threshold, query_text, search_params),
+            )
+            for query_embedding, query_text in zip(query_embeddings, query_texts)
+        ]
+        
+        try:
+            responses = await self.async_client.query_batch_points(
+                collection_name=self.collection_name,
+                requests=requests,
+            )
+        except Exception as e:
+            logger.error(f"Async batch search failed: {e}")
+            raise
+        
+        results = [self._to_documents(response.points) for response in responses]
+        logger.info(f"Batch search for {len(requests)} queries found {sum(map(len, results))} documents")
+        return results
+    
+    def _query_args(
+        self,
+        query_embedding: List[float],
+        top_k: int,
+        qdrant_filter: Optional[Filter],
+        score_threshold: Optional[float],
+        query_text: Optional[str],
+        search_params: Optional[SearchParams] = None,
+    ) -> Dict[str, Any]:
+        """
+        Build the query arguments for a dense or hybrid search.
+        
+        Hybrid search prefetches candidates from the dense and the BM25 sparse
+        vectors and fuses both rankings with RRF in the same Qdrant request;
+        `search_params` apply to the dense prefetch.
+        """
+        if query_text is None:
+            return {"query": query_embedding, "score_threshold": score_threshold}
+        if not self.sparse_enabled:
+            logger.warning(f"Hybrid search requested but '{self.collection_name}' has no sparse vectors; using dense")
+            return {"query": query_embedding, "score_threshold": score_threshold}
+        indices, values = encode_query(query_text)
+        if not indices:
+            return {"query": query_embedding, "score_threshold": score_threshold}
+        
+        limit = max(top_k, settings.hybrid_prefetch_limit)
+        return {
+            "prefetch": [
+                Prefetch(
+                    query=query_embedding,
+                    filter=qdrant_filter,
+                    score_threshold=score_threshold,
+                    params=search_params,
+                    limit=limit,
+                ),
+                Prefetch(
+                    query=SparseVector(indices=indices, values=values),
+                    using=SPARSE_VECTOR_NAME,
+                    filter=qdrant_filter,
+                    limit=limit,
+                ),
+            ],
+            "query": FusionQuery(fusion=Fusion.RRF),
+        }
+    
+    def _search_params(self, hnsw_ef: Optional[int] = None, exact: bool = False) -> Optional[SearchParams]:
+        """
+        Dense search parameters for a request.
+        
+        Quantized collections search the compressed vectors with oversampling
+        and rescore the candidates with the originals; exact search compares
+        the originals directly.
+        
+        Args:
+            hnsw_ef: HNSW search beam size (falls back to `qdrant_hnsw_ef`)
+            exact: Brute-force search instead of HNSW
+        """
+        if exact:
+            quantization = QuantizationSearchParams(ignore=True) if is_quantized(self.compression) else None
+            return SearchParams(exact=True, quantization=quantization)
+        quantization = quantization_search_params(
+            self.compression,
+            oversampling=settings.qdrant_quantization_oversampling,
+            rescore=settings.qdrant_quantization_rescore,
+        )
+        hnsw_ef = hnsw_ef or settings.qdrant_hnsw_ef
+        if quantization is None and hnsw_ef is None:
+            return None
+        return SearchParams(hnsw_ef=hnsw_ef, quantization=quantization)
+    
+    def _exact_by_count(self, count: int) -> bool:
+        return count <= settings.exact_search_max_points
+    
+    def _cached_point_count(self, key: Optional[str]) -> Optional[int]:
+        with self._point_counts_lock:
+            entry = self._point_counts.get(key)
+            if entry is None:
+                return None
+            generation, fetched_at, count = entry
+            if generation != self.generation or time.monotonic() - fetched_at > POINT_COUNT_TTL_SECONDS:
+                return None
+            self._point_counts.move_to_end(key)
+            return count
+    
+    def _cache_point_count(self, key: Optional[str], count: int) -> None:
+        with self._point_counts_lock:
+            self._point_counts[key] = (self.generation, time.monotonic(), count)
+            self._point_counts.move_to_end(key)
+            while len(self._point_counts) > FILTER_COUNT_CACHE_SIZE:
+                self._point_counts.popitem(last=False)
+    
+    def _resolve_exact(self, exact: Optional[bool], qdrant_filter: Optional[Filter]) -> bool:
+        """
+        Decide between exact and HNSW search.
+        
+        An explicit `exact` wins. Otherwise brute force is used when it is
+        cheaper than graph traversal: when the collection has at most
+        `exact_search_max_points` points, or when a filter narrows it down to
+        at most that many (estimated from payload index cardinality). The
+        collection count and per-filter counts are cached per collection
+        generation, so a filter costs one approximate count request the first
+        time it is seen, and only on collections above the threshold. If
+        counting fails, HNSW search is used.
+        """
+        if exact is not None:
+            return exact
+        if settings.exact_search_max_points <= 0:
+            return False
+        try:
+            count = self._cached_point_count(None)
+            if count is None:
+                count = self.client.get_collection(self.collection_name).points_count or 0
+                self._cache_point_count(None, count)
+            if self._exact_by_count(count):
+                return True
+            if qdrant_filter is None:
+                return False
+            key = qdrant_filter.model_dump_json()
+            count = self._cached_point_count(key)
+            if count is None:
+                count = self.client.count(self.collection_name, count_filter=qdrant_filter, exact=False).count
+                self._cache_point_count(key, count)
+            return self._exact_by_count(count)
+        except Exception as e:
+            logger.warning(f"Exact-search policy skipped, counting points failed: {e}")
+            return False
+    
+    async def _aresolve_exact(self, exact: Optional[bool], qdrant_filter: Optional[Filter]) -> bool:
+        """Async variant of `_resolve_exact`."""
+        if exact is not None:
+            return exact
+        if settings.exact_search_max_points <= 0:
+            return False
+        try:
+            count = self._cached_point_count(None)
+            if count is None:
+                count = (await self.async_client.get_collection(self.collection_name)).points_count or 0
+                self._cache_point_count(None, count)
+            if self._exact_by_count(count):
+                return True
+            if qdrant_filter is None:
+                return False
+            key = qdrant_filter.model_dump_json()
+            count = self._cached_point_count(key)
+            if count is None:
+                response = await self.async_client.count(self.collection_name, count_filter=qdrant_filter, exact=False)
+                count = response.count
+                self._cache_point_count(key, count)
+            return self._exact_by_count(count)
+        except Exception as e:
+            logger.warning(f"Exact-search policy skipped, counting points failed: {e}")
+            return False
+    
+    @staticmethod
+    def _search_kind(query_args: Dict[str, Any]) -> str:
+        return "hybrid" if "prefetch" in query_args else "similarity"
+    
+    @staticmethod
+    def _build_filter(filters: Optional[Dict[str, Any]]) -> Optional[Filter]:
+        """Build a Qdrant filter from metadata filters (see `build_filter`)."""
+        return build_filter(filters)
+    
+    @staticmethod
+    def _to_documents(results) -> List[Document]:
+        """Convert Qdrant scored points (or unscored records) to Haystack Documents."""
         documents = []
         for result in results:
             doc = Document(
@@ -230,13 +1000,19 @@ class QdrantDocumentStore:
                     for k, v in result.payload.items()
                     if k not in ["content", "doc_id"]
                 },
-                score=result.score,
+                score=getattr(result, "score", None),
+                embedding=QdrantDocumentStore._dense_vector(result.vector),
             )
             documents.append(doc)
-        
-        logger.info(f"Found {len(documents)} documents with similarity search")
         return documents
     
+    @staticmethod
+    def _dense_vector(vector) -> Optional[List[float]]:
+        """Extract the dense vector from a point's unnamed or named vectors."""
+        if isinstance(vector, dict):
+            vector = vector.get("")
+        return vector if isinstance(vector, list) else None
+    
     def delete_documents(
         self,
         document_ids: Optional[List[str]] = None,
@@ -256,18 +1032,14 @@ class QdrantDocumentStore:
             parameters provided (no-op).
         """
         if document_ids:
-            # ID Scheme Version: v1 - UUID format from MD5 hash
             # Convert document IDs to UUID strings matching write_documents format
-            point_ids = []
-            for doc_id in document_ids:
-                md5_hash = hashlib.md5(str(doc_id).encode()).hexdigest()
-                point_id = f"{md5_hash[:8]}-{md5_hash[8:12]}-{md5_hash[12:16]}-{md5_hash[16:20]}-{md5_hash[20:]}"
-                point_ids.append(point_id)
+            point_ids = [_point_id(doc_id) for doc_id in document_ids]
             try:
                 self.client.delete(
                     collection_name=self.collection_name,
                     points_selector=point_ids,
                 )
+                bump_collection_generation(self.collection_name)
                 logger.info(f"Requested deletion of {len(document_ids)} documents by ID; Qdrant delete is idempotent and may not reflect actual deletions")
                 return -1  # Qdrant doesn't return count for ID-based deletion
             except Exception as e:
@@ -275,22 +1047,14 @@ class QdrantDocumentStore:
                 raise
         
         if filters:
-            # Build filter
-            conditions = []
-            for key, value in filters.items():
-                conditions.append(
-                    FieldCondition(
-                        key=key,
-                        match=MatchValue(value=value),
-                    )
-                )
-            qdrant_filter = Filter(must=conditions)
+            qdrant_filter = self._build_filter(filters)
             
             try:
                 result = self.client.delete(
                     collection_name=self.collection_name,
                     points_selector=qdrant_filter,
                 )
+                bump_collection_generation(self.collection_name)
                 logger.info(f"Deleted documents matching filters (count unknown)")
                 return -1  # Qdrant doesn't return count for filter-based deletion
             except Exception as e:
@@ -300,6 +1064,11 @@ class QdrantDocumentStore:
         logger.warning("No document_ids or filters provided for deletion")
         return 0
     
+    @property
+    def generation(self) -> int:
+        """Mutation generation of this store's collection (see `bump_collection_generation`)."""
+        return get_collection_generation(self.collection_name)
+    
     def count_documents(self) -> int:
         """Get total number of documents in the collection."""
         try:
@@ -309,10 +1078,31 @@ class QdrantDocumentStore:
             logger.error(f"Failed to count documents: {e}")
             raise
     
+    def memory_stats(self) -> Dict[str, Any]:
+        """
+        Report the dense vector storage of the collection.
+        
+        Byte counts are estimates from the point count, dimension and
+        compression profile (see `memory_footprint`); the HNSW graph and
+        payloads are not included.
+        
+        Returns:
+            dict: compression, points, dimension, originals_on_disk and byte counts
+        """
+        points = self.count_documents() or 0
+        return {
+            "compression": self.compression.value,
+            "points": points,
+            "dimension": self.embedding_dimension,
+            "originals_on_disk": self.originals_on_disk,
+            **memory_footprint(self.compression, points, self.embedding_dimension, self.originals_on_disk),
+        }
+    
     def delete_collection(self) -> None:
         """Delete the entire collection. Use with caution!"""
         try:
             self.client.delete_collection(self.collection_name)
+            bump_collection_generation(self.collection_name)
             logger.warning(f"Deleted collection '{self.collection_name}'")
         except Exception as e:
             logger.error(f"Failed to delete collection: {e}")
@@ -331,4 +1121,11 @@ def get_document_store() -> QdrantDocumentStore:
             # Double-check pattern to avoid race condition
             if _document_store is None:
                 _document_store = QdrantDocumentStore()
-    return _document_store
\ No newline at end of file
+    return _document_store
+
+
+def reset_document_store() -> None:
+    """Drop the global document store (for testing or configuration changes)."""
+    global _document_store
+    with _store_lock:
+        _document_store = None
@@ -0,0 +1,16 @@
+"""
+Embedding Backends
+
+Pluggable text embedders selected by `EMBEDDING_PROVIDER`: the OpenAI
+embeddings API, or a sentence-transformers model running in-process on CPU.
+"""
+
+from src.embeddings.base import Embedder
+from src.embeddings.factory import create_embedder, get_embedder, reset_embedder
+
+__all__ = [
+    "Embedder",
+    "create_embedder",
+    "get_embedder",
+    "reset_embedder",
+]
@@ -0,0 +1,92 @@
+"""
+Embedder Interface
+
+Common interface for text embedding backends. Every backend embeds a list of
+texts in as few model calls as it can and returns one vector per text, in
+input order.
+"""
+
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional
+import numpy as np
+
+
+def reduce_dimension(vectors: List[List[float]], dimension: Optional[int]) -> List[List[float]]:
+    """
+    Shorten Matryoshka embeddings to their first `dimension` components.
+
+    Models trained with Matryoshka representation learning (OpenAI
+    text-embedding-3-*, nomic-embed, mxbai, ...) front-load information, so a
+    prefix of the vector is itself a usable embedding once re-normalized.
+
+    Args:
+        vectors: Full-size embeddings
+        dimension: Target size (None keeps vectors unchanged)
+
+    Returns:
+        Unit-length vectors of size `dimension`
+
+    Raises:
+        ValueError: If the vectors are shorter than `dimension`
+    """
+    if dimension is None or not vectors or len(vectors[0]) == dimension:
+        return vectors
+    if len(vectors[0]) < dimension:
+        raise ValueError(f"Model returned {len(vectors[0])}-dim embeddings, shorter than the configured {dimension}")
+    matrix = np.asarray(vectors, dtype=np.float32)[:, :dimension]
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return (matrix / np.where(norms == 0, 1.0, norms)).tolist()
+
+
+class Embedder(ABC):
+    """
+    Base class for embedding backends.
+
+    Subclasses implement `embed` and `aembed`, returning vectors of size
+    `dimension` when it is set. `run`/`run_async` mirror the Haystack text
+    embedder API so an `Embedder` can be used wherever a single query is
+    embedded.
+    """
+
+    model_name: str
+    dimension: Optional[int] = None
+
+    @abstractmethod
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed texts.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            One vector per text, in input order
+        """
+
+    @abstractmethod
+    async def aembed(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed texts without blocking the event loop.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            One vector per text, in input order
+        """
+
+    def run(self, text: str) -> Dict[str, Any]:
+        """Embed a single text, returning {"embedding": vector}."""
+        return {"embedding": self.embed([text])[0]}
+
+    async def run_async(self, text: str) -> Dict[str, Any]:
+        """Embed a single text asynchronously, returning {"embedding": vector}."""
+        return {"embedding": (await self.aembed([text]))[0]}
+
+    def close(self) -> None:  # noqa: B027 - optional hook, not abstract
+        """
+        Release resources held by the backend.
+
+        Optional hook: backends without threads or connections to release
+        keep this no-op.
+        """
@@ -0,0 +1,42 @@
+"""
+Haystack Components
+
+Wraps an `Embedder` as a Haystack document embedder so indexing pipelines use
+the same backend as query embedding.
+"""
+
+from typing import Any, Dict, List, Optional
+import dataclasses
+from haystack import component
+from haystack.dataclasses import Document
+from src.embeddings.base import Embedder
+from src.embeddings.factory import get_embedder
+
+
+@component
+class DocumentEmbedder:
+    """
+    Embeds document contents with an `Embedder`.
+
+    All documents go to the embedder in one call; the backend decides how to
+    batch them.
+    """
+
+    def __init__(self, embedder: Optional[Embedder] = None):
+        """
+        Initialize the component.
+
+        Args:
+            embedder: Backend to use (defaults to the configured global embedder)
+        """
+        self.embedder = embedder
+
+    @component.output_types(documents=List[Document])
+    def run(self, documents: List[Document]) -> Dict[str, Any]:
+        embedder = self.embedder or get_embedder()
+        vectors = embedder.embed([doc.content or "" for doc in documents])
+        return {
+            "documents": [
+                dataclasses.replace(doc, embedding=vector) for doc, vector in zip(documents, vectors)
+            ]
+        }
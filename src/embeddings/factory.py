@@ -0,0 +1,83 @@
+"""
+Embedder Factory
+
+Builds the embedding backend selected by `settings.embedding_provider` and
+keeps it as a process-wide singleton so local models are loaded only once.
+"""
+
+from typing import Optional
+import logging
+import threading
+from src.config.settings import LOCAL_EMBEDDING_PROVIDERS, settings
+from src.embeddings.base import Embedder
+
+logger = logging.getLogger(__name__)
+
+OPENAI_PROVIDERS = {"openai"}
+LOCAL_PROVIDERS = LOCAL_EMBEDDING_PROVIDERS
+
+_embedder: Optional[Embedder] = None
+_lock = threading.Lock()
+
+
+def create_embedder(provider: Optional[str] = None) -> Embedder:
+    """
+    Create an embedder for a provider.
+
+    Args:
+        provider: 'openai' or 'sentence-transformers' (alias 'local');
+            defaults to `settings.embedding_provider`
+
+    Returns:
+        Embedder: New embedder instance
+
+    Raises:
+        ValueError: If the provider is unknown
+    """
+    provider = (provider or settings.embedding_provider).lower()
+    if provider in OPENAI_PROVIDERS:
+        from src.embeddings.openai_embedder import OpenAIEmbedder
+        return OpenAIEmbedder(
+            model=settings.embedding_model,
+            api_key=settings.openai_api_key,
+            dimensions=settings.embedding_dimension,
+            batch_size=settings.embedding_batch_size,
+        )
+    if provider in LOCAL_PROVIDERS:
+        from src.embeddings.local import LocalEmbedder
+        return LocalEmbedder(
+            model=settings.local_embedding_model,
+            device=settings.local_embedding_device,
+            batch_size=settings.embedding_batch_size,
+            num_threads=settings.local_embedding_threads,
+            max_wait_ms=settings.local_embedding_max_wait_ms,
+            dimension=settings.embedding_dimension,
+        )
+    raise ValueError(
+        f"Unknown embedding provider '{provider}'; use one of {sorted(OPENAI_PROVIDERS | LOCAL_PROVIDERS)}"
+    )
+
+
+def get_embedder() -> Embedder:
+    """
+    Get or create the global embedder singleton.
+
+    Returns:
+        Embedder: Embedder for the configured provider
+    """
+    global _embedder
+    if _embedder is None:
+        with _lock:
+            if _embedder is None:
+                _embedder = create_embedder()
+                logger.info(f"Embedding backend: {settings.embedding_provider} ({_embedder.model_name})")
+    return _embedder
+
+
+def reset_embedder():
+    """Close and drop the global embedder (for testing or config changes)."""
+    global _embedder
+    with _lock:
+        if _embedder is not None:
+            _embedder.close()
+        _embedder = None
@@ -0,0 +1,173 @@
+"""
+Local CPU Embedding Backend
+
+Runs a sentence-transformers model in-process. The model is loaded once and
+stays resident; encoding happens on dedicated worker threads so neither the
+event loop nor request threads ever run the model.
+
+Requests are micro-batched: a worker takes the first queued request, waits up
+to `max_wait_ms` for more to arrive (until `batch_size` texts are queued), and
+encodes them all in one forward pass. Under concurrent load this turns many
+single-query calls into a few batched ones.
+
+With `dimension` set, embeddings of Matryoshka-trained models are truncated
+to that size and re-normalized.
+"""
+
+from concurrent.futures import Future
+from typing import Any, List, Optional, Tuple, Union
+import asyncio
+import logging
+import queue
+import threading
+import time
+from src.embeddings.base import Embedder, reduce_dimension
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class LocalEmbedder(Embedder):
+    """
+    Embedder backed by an in-process sentence-transformers model.
+    """
+
+    def __init__(
+        self,
+        model: Union[str, Any],
+        device: str = "cpu",
+        batch_size: int = 64,
+        num_threads: int = 1,
+        max_wait_ms: float = 2.0,
+        normalize: bool = True,
+        model_name: Optional[str] = None,
+        dimension: Optional[int] = None,
+    ):
+        """
+        Initialize the embedder and load the model.
+
+        Args:
+            model: Model name/path, or an already constructed SentenceTransformer
+            device: Torch device to run on
+            batch_size: Max texts encoded in one forward pass
+            num_threads: Number of encoding worker threads
+            max_wait_ms: How long a worker waits for more requests to fill a batch
+            normalize: L2-normalize embeddings (cosine similarity as a dot product)
+            model_name: Name reported for a pre-built model (cache keys, logs)
+            dimension: Output dimensions (Matryoshka shortening); None keeps the native size
+
+        Raises:
+            ImportError: If sentence-transformers is not installed
+            ValueError: If `dimension` exceeds the model's output size
+        """
+        if isinstance(model, str):
+            try:
+                from sentence_transformers import SentenceTransformer
+            except ImportError as e:
+                raise ImportError(
+                    "EMBEDDING_PROVIDER=sentence-transformers requires the sentence-transformers package"
+                ) from e
+            logger.info(f"Loading local embedding model {model} on {device}")
+            self.model_name = model
+            self.model = SentenceTransformer(model, device=device)
+        else:
+            self.model_name = model_name or type(model).__name__
+            self.model = model
+        self.model.eval()
+
+        if dimension is not None and dimension > self.model_dimension:
+            raise ValueError(
+                f"Embedding dimension {dimension} exceeds the {self.model_dimension} dims of {self.model_name}"
+            )
+        self.dimension = dimension or self.model_dimension
+
+        self.batch_size = batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.normalize = normalize
+        self._queue: "queue.Queue" = queue.Queue()
+        self._workers = [
+            threading.Thread(target=self._work, name=f"local-embedder-{i}", daemon=True)
+            for i in range(max(1, num_threads))
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    @property
+    def model_dimension(self) -> int:
+        """Native output dimension of the model."""
+        get_dimension = getattr(self.model, "get_embedding_dimension", None) or self.model.get_sentence_embedding_dimension
+        return get_dimension()
+
+    def _encode(self, texts: List[str]) -> List[List[float]]:
+        vectors = self.model.encode(
+            texts,
+            batch_size=self.batch_size,
+            normalize_embeddings=self.normalize,
+            convert_to_numpy=True,
+            show_progress_bar=False,
+        )
+        return reduce_dimension(vectors.tolist(), self.dimension)
+
+    def _next_batch(self) -> Tuple[List[Tuple[List[str], Future]], bool]:
+        """Block for one request, then gather more until the batch is full or the wait expires."""
+        first = self._queue.get()
+        if first is _STOP:
+            return [], True
+        batch = [first]
+        size = len(first[0])
+        deadline = time.monotonic() + self.max_wait
+        while size < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+            size += len(item[0])
+        return batch, False
+
+    def _work(self) -> None:
+        stop = False
+        while not stop:
+            batch, stop = self._next_batch()
+            batch = [(texts, future) for texts, future in batch if future.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            try:
+                vectors = self._encode([text for texts, _ in batch for text in texts])
+            except Exception as e:
+                logger.error(f"Local embedding failed for {len(batch)} request(s): {e}")
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            offset = 0
+            for texts, future in batch:
+                future.set_result(vectors[offset:offset + len(texts)])
+                offset += len(texts)
+
+    def _submit(self, texts: List[str]) -> Future:
+        future: Future = Future()
+        self._queue.put((list(texts), future))
+        return future
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+        return self._submit(texts).result()
+
+    async def aembed(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+        return await asyncio.wrap_future(self._submit(texts))
+
+    def close(self) -> None:
+        """Stop the worker threads once queued requests are done."""
+        for _ in self._workers:
+            self._queue.put(_STOP)
+        for worker in self._workers:
+            worker.join(timeout=5)
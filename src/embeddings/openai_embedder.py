@@ -0,0 +1,71 @@
+"""
+OpenAI Embedding Backend
+
+Embeds texts with the OpenAI embeddings API, sending each batch of texts as
+a single request (concurrently on the async path). For text-embedding-3 models a reduced `dimensions` is
+requested from the API; other models are truncated client-side.
+"""
+
+from typing import Any, Dict, List, Optional
+import asyncio
+import openai
+from src.embeddings.base import Embedder, reduce_dimension
+
+
+class OpenAIEmbedder(Embedder):
+    """
+    Embedder backed by the OpenAI embeddings API.
+
+    Texts are sent `batch_size` at a time, one request per batch; `aembed`
+    issues the requests concurrently, so a large query batch costs one round
+    trip. Results are re-ordered by the index the API returns.
+    """
+
+    def __init__(
+        self,
+        model: str,
+        api_key: str,
+        dimensions: Optional[int] = None,
+        batch_size: int = 64,
+    ):
+        """
+        Initialize the embedder.
+
+        Args:
+            model: OpenAI embedding model name
+            api_key: OpenAI API key
+            dimensions: Output dimensions (Matryoshka shortening); None keeps the native size
+            batch_size: Max texts per embeddings request
+        """
+        self.model_name = model
+        self.dimension = dimensions
+        # Only text-embedding-3 models accept the `dimensions` request parameter
+        self.request_dimensions = dimensions if model.startswith("text-embedding-3") else None
+        self.batch_size = batch_size
+        self.client = openai.OpenAI(api_key=api_key)
+        self.async_client = openai.AsyncOpenAI(api_key=api_key)
+
+    def _request_kwargs(self, texts: List[str]) -> Dict[str, Any]:
+        kwargs: Dict[str, Any] = {"model": self.model_name, "input": texts}
+        if self.request_dimensions is not None:
+            kwargs["dimensions"] = self.request_dimensions
+        return kwargs
+
+    def _batches(self, texts: List[str]) -> List[List[str]]:
+        return [texts[i:i + self.batch_size] for i in range(0, len(texts), self.batch_size)]
+
+    def _vectors(self, response) -> List[List[float]]:
+        vectors = [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+        return reduce_dimension(vectors, self.dimension)
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        vectors: List[List[float]] = []
+        for batch in self._batches(texts):
+            vectors.extend(self._vectors(self.client.embeddings.create(**self._request_kwargs(batch))))
+        return vectors
+
+    async def aembed(self, texts: List[str]) -> List[List[float]]:
+        responses = await asyncio.gather(
+            *(self.async_client.embeddings.create(**self._request_kwargs(batch)) for batch in self._batches(texts))
+        )
+        return [vector for response in responses for vector in self._vectors(response)]
@@ -0,0 +1,157 @@
+"""
+Async LLM Client
+
+Native asyncio access to the configured LLM providers for the async query path.
+aisuite only exposes a blocking client, so this talks to the provider SDKs directly:
+OpenAI and Groq through ``openai.AsyncOpenAI`` (Groq is OpenAI-compatible) and
+Anthropic through ``anthropic.AsyncAnthropic``.
+"""
+
+from typing import Any, AsyncIterator, Dict, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+GROQ_BASE_URL = "https://api.groq.com/openai/v1"
+
+
+class AsyncLLMClient:
+    """
+    Async chat client for OpenAI, Groq and Anthropic.
+
+    SDK clients are created lazily per provider and reused, so their
+    HTTP connection pools are shared across requests.
+    """
+
+    def __init__(self, provider_configs: Dict[str, Dict[str, Any]]):
+        """
+        Initialize the client.
+
+        Args:
+            provider_configs: Mapping of provider name to config (e.g. {"openai": {"api_key": ...}})
+        """
+        self.provider_configs = provider_configs
+        self._clients: Dict[str, Any] = {}
+
+    def _get_client(self, provider: str):
+        """Get or create the SDK client for a provider."""
+        if provider in self._clients:
+            return self._clients[provider]
+
+        config = self.provider_configs.get(provider)
+        if config is None:
+            raise ValueError(f"Provider '{provider}' is not configured")
+
+        if provider == "openai":
+            import openai
+            client = openai.AsyncOpenAI(api_key=config["api_key"])
+        elif provider == "groq":
+            import openai
+            client = openai.AsyncOpenAI(api_key=config["api_key"], base_url=GROQ_BASE_URL)
+        elif provider == "anthropic":
+            import anthropic
+            client = anthropic.AsyncAnthropic(api_key=config["api_key"])
+        else:
+            raise ValueError(f"Unsupported provider: {provider}")
+
+        self._clients[provider] = client
+        return client
+
+    @staticmethod
+    def _timeout_kwargs(timeout: Optional[float]) -> Dict[str, float]:
+        """Only pass a timeout when one is given, so the SDK default applies otherwise."""
+        return {"timeout": timeout} if timeout is not None else {}
+
+    async def complete(
+        self,
+        provider: str,
+        model: str,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: int,
+        timeout: Optional[float] = None,
+    ) -> str:
+        """
+        Generate a complete (non-streaming) chat response.
+
+        Args:
+            timeout: Per-request HTTP timeout in seconds (SDK default if not provided)
+
+        Returns:
+            The generated text
+        """
+        client = self._get_client(provider)
+
+        if provider == "anthropic":
+            response = await client.messages.create(
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                **self._timeout_kwargs(timeout),
+            )
+            return "".join(block.text for block in response.content if hasattr(block, "text"))
+
+        response = await client.chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            **self._timeout_kwargs(timeout),
+        )
+        return response.choices[0].message.content
+
+    async def stream(
+        self,
+        provider: str,
+        model: str,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: int,
+        timeout: Optional[float] = None,
+    ) -> AsyncIterator[str]:
+        """
+        Stream a chat response as text deltas.
+
+        Args:
+            timeout: Per-request HTTP timeout in seconds (SDK default if not provided)
+
+        The upstream HTTP stream is closed when the generator is closed, so
+        abandoning iteration releases the provider connection.
+
+        Yields:
+            Text deltas as they arrive
+        """
+        client = self._get_client(provider)
+
+        if provider == "anthropic":
+            async with client.messages.stream(
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                **self._timeout_kwargs(timeout),
+            ) as stream:
+                async for text in stream.text_stream:
+                    if text:
+                        yield text
+            return
+
+        stream = await client.chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            stream=True,
+            **self._timeout_kwargs(timeout),
+        )
+        try:
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                content = getattr(chunk.choices[0].delta, "content", None)
+                if content is not None:
+                    yield content
+        finally:
+            await stream.close()
+
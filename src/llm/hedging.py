@@ -0,0 +1,133 @@
+"""
+Hedged Streaming
+
+Opens provider streams and, when hedging is enabled, races a slow primary
+against the next provider in its fallback chain. The hedge only fires if the
+primary has not produced a first token within its learned time-to-first-token
+threshold; the first stream to produce a token wins and the other is cancelled.
+"""
+
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Tuple
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+async def open_stream(
+    client,
+    registry,
+    provider: str,
+    model: str,
+    messages: List[Dict[str, str]],
+    **kwargs,
+) -> Tuple[str, AsyncIterator[str]]:
+    """
+    Start a provider stream and wait for its first token.
+
+    The time to first token is recorded in the registry. If waiting fails or
+    is cancelled, the stream is closed.
+
+    Returns:
+        Tuple of (first token, stream positioned after it); the first token is
+        empty if the provider returned an empty response
+    """
+    start = time.perf_counter()
+    stream = client.stream(provider, model, messages, **kwargs)
+    try:
+        first_token = await anext(stream)
+    except StopAsyncIteration:
+        first_token = ""
+    except BaseException:
+        await stream.aclose()
+        raise
+    registry.record_first_token(provider, time.perf_counter() - start)
+    return first_token, stream
+
+
+async def open_hedged_stream(
+    client,
+    registry,
+    primary: Tuple[str, str],
+    candidates: Iterator[Tuple[str, str]],
+    messages: List[Dict[str, str]],
+    **kwargs,
+) -> Tuple[str, str, str, AsyncIterator[str], bool]:
+    """
+    Open the primary stream, hedging with the next candidate if it is slow.
+
+    The hedge is taken from `candidates` only when it fires, so a caller
+    iterating the same fallback chain skips it afterwards. Failures of the
+    streams that did not win are recorded here; if no stream produces a token,
+    the primary's error is raised for the caller to record. A stream still
+    waiting for its first token when it is cancelled records its elapsed time
+    as a lower-bound sample, so slow primaries that keep losing the race stay
+    in the time-to-first-token window instead of dropping out of it.
+
+    Args:
+        client: Async LLM client
+        registry: Provider registry (hedge delay and health tracking)
+        primary: (provider, model) to try first
+        candidates: Remaining fallback chain
+        messages: Chat messages
+        **kwargs: Passed to `client.stream`
+
+    Returns:
+        Tuple of (provider, model, first token, stream, hedge_fired)
+    """
+    delay = registry.get_hedge_delay(primary[0])
+    tasks: Dict[asyncio.Task, Tuple[str, str]] = {
+        asyncio.ensure_future(open_stream(client, registry, *primary, messages, **kwargs)): primary
+    }
+    started = {task: time.perf_counter() for task in tasks}
+    hedge_fired = False
+    winner: Optional[asyncio.Task] = None
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=delay)
+        if not done:
+            hedge = next(candidates, None)
+            if hedge is not None:
+                hedge_fired = True
+                logger.info(
+                    f"No first token from {primary[0]} after {delay * 1000:.0f}ms, "
+                    f"hedging with {hedge[0]}:{hedge[1]}"
+                )
+                task = asyncio.ensure_future(open_stream(client, registry, *hedge, messages, **kwargs))
+                tasks[task] = hedge
+                started[task] = time.perf_counter()
+
+        pending = set(tasks)
+        while pending and winner is None:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            # Prefer the primary if both produced a token in the same tick
+            for task in sorted(done, key=lambda t: tasks[t] != primary):
+                if task.exception() is None:
+                    winner = task
+                    break
+
+        for task, (provider, _) in tasks.items():
+            if task.done() and not task.cancelled() and task.exception() is not None:
+                if winner is not None or tasks[task] != primary:
+                    registry.record_request_failure(provider, str(task.exception()))
+
+        if winner is None:
+            primary_task = next(task for task, candidate in tasks.items() if candidate == primary)
+            raise primary_task.exception()
+
+        provider, model = tasks[winner]
+        if hedge_fired:
+            logger.info(f"Hedge race won by {provider}")
+        first_token, stream = winner.result()
+        return provider, model, first_token, stream, hedge_fired
+    finally:
+        losers = [task for task in tasks if task is not winner]
+        for task in losers:
+            if winner is not None and not task.done():
+                registry.record_first_token(tasks[task][0], time.perf_counter() - started[task])
+            task.cancel()
+        await asyncio.gather(*losers, return_exceptions=True)
+        for task in losers:
+            if not task.cancelled() and task.exception() is None:
+                # Lost a same-tick race: release its connection
+                await task.result()[1].aclose()
@@ -5,24 +5,31 @@ Manages initialization and health tracking for multiple LLM providers via aisuit
 """
 
 from typing import Dict, List, Optional, Any
+from collections import deque
 from datetime import datetime
 import logging
 import aisuite
 from src.config.settings import settings
+from src.llm.async_client import AsyncLLMClient
 
 logger = logging.getLogger(__name__)
 
 
 class ProviderHealth:
-    """Track health status for a single provider."""
+    """Track health status and time-to-first-token for a single provider."""
+
+    # Recent time-to-first-token samples kept for percentile estimates
+    TTFT_WINDOW = 200
 
     def __init__(self):
         self.status: str = "unknown"
         self.error_rate: float = 0.0
         self.total_requests: int = 0
         self.failed_requests: int = 0
+        self.aborted_requests: int = 0
         self.last_success: Optional[datetime] = None
         self.last_error: Optional[str] = None
+        self.ttft_samples: deque = deque(maxlen=self.TTFT_WINDOW)
 
     def record_success(self):
         self.total_requests += 1
@@ -37,6 +44,22 @@ class ProviderHealth:
         self.status = "unhealthy"
         self.error_rate = self.failed_requests / self.total_requests
 
+    def record_aborted(self):
+        # The provider was working when the client went away: count it as a success
+        self.record_success()
+        self.aborted_requests += 1
+
+    def record_first_token(self, seconds: float):
+        self.ttft_samples.append(seconds)
+
+    def ttft_percentile(self, percentile: float) -> Optional[float]:
+        """Time-to-first-token percentile in seconds over the recent window, or None without samples."""
+        if not self.ttft_samples:
+            return None
+        ordered = sorted(self.ttft_samples)
+        index = min(len(ordered) - 1, round(percentile / 100 * (len(ordered) - 1)))
+        return ordered[index]
+
 
 class LLMProviderRegistry:
     """
@@ -54,7 +77,9 @@ class LLMProviderRegistry:
         if settings.groq_api_key:
             provider_config["groq"] = {"api_key": settings.groq_api_key}
 
+        self.provider_config = provider_config
         self.client = aisuite.Client(provider_config)
+        self._async_client: Optional[AsyncLLMClient] = None
 
         self.provider_health: Dict[str, ProviderHealth] = {
             "openai": ProviderHealth(),
@@ -64,6 +89,13 @@ class LLMProviderRegistry:
 
         logger.info(f"LLM provider registry initialized with {len(provider_config)} configured providers")
 
+    @property
+    def async_client(self) -> AsyncLLMClient:
+        """Native asyncio client for the configured providers (lazy-initialized)."""
+        if self._async_client is None:
+            self._async_client = AsyncLLMClient(self.provider_config)
+        return self._async_client
+
     def get_available_providers(self) -> List[str]:
         return [name for name, h in self.provider_health.items() if h.status in ("healthy", "unknown")]
 
@@ -79,17 +111,48 @@ class LLMProviderRegistry:
         if health := self.provider_health.get(provider_name):
             health.record_failure(error)
 
+    def record_request_aborted(self, provider_name: str):
+        """Record a stream that was healthy but cancelled because the client disconnected."""
+        if health := self.provider_health.get(provider_name):
+            health.record_aborted()
+            total_aborted = sum(h.aborted_requests for h in self.provider_health.values())
+            logger.info(
+                f"Aborted {provider_name} stream after client disconnect "
+                f"({health.aborted_requests} for {provider_name}, {total_aborted} total)"
+            )
+
+    def record_first_token(self, provider_name: str, seconds: float):
+        if health := self.provider_health.get(provider_name):
+            health.record_first_token(seconds)
+
+    def get_hedge_delay(self, provider_name: str) -> float:
+        """
+        How long to wait for a provider's first token before hedging, in seconds.
+
+        Learned as the configured time-to-first-token percentile once enough
+        samples exist; the configured default delay is used until then.
+        """
+        health = self.provider_health.get(provider_name)
+        if not health or len(health.ttft_samples) < settings.llm_hedge_min_samples:
+            return settings.llm_hedge_default_delay_ms / 1000
+        return health.ttft_percentile(settings.llm_hedge_percentile)
+
     def get_provider_health(self, provider_name: str) -> Optional[Dict[str, Any]]:
         health = self.provider_health.get(provider_name)
         if not health:
             return None
+        p50 = health.ttft_percentile(50)
+        p95 = health.ttft_percentile(95)
         return {
             "status": health.status,
             "error_rate": round(health.error_rate, 3),
             "total_requests": health.total_requests,
             "failed_requests": health.failed_requests,
+            "aborted_requests": health.aborted_requests,
             "last_success": health.last_success.isoformat() if health.last_success else None,
             "last_error": health.last_error,
+            "ttft_p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+            "ttft_p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
         }
 
     def get_all_health(self) -> Dict[str, Dict[str, Any]]:
@@ -0,0 +1,269 @@
+"""
+Retrieval Caches
+
+In-process caches for the query path:
+- EmbeddingCache: LRU/TTL cache of query embeddings, keyed on (model, normalized query)
+- SemanticCache: answer cache keyed on query-embedding similarity and collection generation
+"""
+
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+import logging
+import threading
+import time
+
+import numpy as np
+
+from src.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_query(query: str) -> str:
+    """Normalize query text for cache keys (collapse whitespace, casefold)."""
+    return " ".join(query.split()).casefold()
+
+
+class EmbeddingCache:
+    """
+    Bounded, thread-safe LRU cache of query embeddings with TTL expiry.
+
+    Vectors are stored as contiguous float32 arrays, which take a quarter of the
+    memory of the equivalent Python float lists.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl_seconds: float = 3600):
+        """
+        Initialize the cache.
+
+        Args:
+            max_size: Maximum number of cached embeddings (least recently used are evicted)
+            ttl_seconds: Time-to-live for each entry in seconds
+        """
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, np.ndarray]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, model: str, query: str) -> Optional[np.ndarray]:
+        """
+        Look up a cached embedding.
+
+        Returns:
+            float32 vector, or None on miss or expiry
+        """
+        key = (model, normalize_query(query))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, vector = entry
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return vector
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, model: str, query: str, embedding: Sequence[float]) -> np.ndarray:
+        """
+        Store an embedding, evicting the least recently used entry if full.
+
+        Returns:
+            The stored float32 vector
+        """
+        vector = np.asarray(embedding, dtype=np.float32)
+        vector.setflags(write=False)
+        key = (model, normalize_query(query))
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, vector)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return vector
+
+    def clear(self) -> None:
+        """Remove all entries and reset counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Get hit/miss counters and current size."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SemanticCache:
+    """
+    Answer cache that matches queries by embedding similarity.
+    
+    Cached query vectors are kept unit-normalized in one preallocated float32
+    matrix, so a lookup is a single matrix-vector product followed by masking on
+    the entry key (collection, collection generation, request params) and expiry.
+    An entry is only served while its collection generation is current, so any
+    write or delete to the collection invalidates it. Slots are reused FIFO.
+    """
+    
+    def __init__(self, max_size: int = 1024, max_distance: float = 0.05, ttl_seconds: float = 900):
+        """
+        Initialize the cache.
+        
+        Args:
+            max_size: Maximum number of cached answers
+            max_distance: Maximum cosine distance (1 - cosine similarity) for a hit
+            ttl_seconds: Time-to-live for each entry in seconds
+        """
+        self.max_size = max_size
+        self.max_distance = max_distance
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._vectors: Optional[np.ndarray] = None  # allocated on first put
+        self._key_hashes = np.zeros(max_size, dtype=np.int64)
+        self._expires_at = np.zeros(max_size, dtype=np.float64)  # 0 marks an empty slot
+        self._keys: List[Optional[Tuple]] = [None] * max_size
+        self._values: List[Optional[Dict[str, Any]]] = [None] * max_size
+        self._next_slot = 0
+        self.hits = 0
+        self.misses = 0
+    
+    @staticmethod
+    def _unit(embedding: Sequence[float]) -> Optional[np.ndarray]:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else None
+    
+    def lookup(
+        self,
+        embedding: Sequence[float],
+        collection: str,
+        generation: int,
+        params: Hashable = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Find the closest cached answer for a query embedding.
+        
+        Args:
+            embedding: Query embedding
+            collection: Collection the answer was generated from
+            generation: Current generation of that collection
+            params: Request parameters that must match exactly (e.g. top_k, provider)
+            
+        Returns:
+            Cached value with an added "distance" key, or None on miss
+        """
+        query = self._unit(embedding)
+        key = (collection, generation, params)
+        with self._lock:
+            if query is None or self._vectors is None or self._vectors.shape[1] != query.shape[0]:
+                self.misses += 1
+                return None
+            
+            valid = (self._key_hashes == hash(key)) & (self._expires_at > time.monotonic())
+            if not valid.any():
+                self.misses += 1
+                return None
+            
+            similarities = np.where(valid, self._vectors @ query, -np.inf)
+            slot = int(np.argmax(similarities))
+            distance = 1.0 - float(similarities[slot])
+            if distance > self.max_distance or self._keys[slot] != key:
+                self.misses += 1
+                return None
+            
+            self.hits += 1
+            return {**self._values[slot], "distance": round(distance, 6)}
+    
+    def put(
+        self,
+        embedding: Sequence[float],
+        collection: str,
+        generation: int,
+        params: Hashable,
+        value: Dict[str, Any],
+    ) -> None:
+        """Store an answer for a query embedding, overwriting the oldest slot when full."""
+        vector = self._unit(embedding)
+        if vector is None:
+            return
+        key = (collection, generation, params)
+        with self._lock:
+            if self._vectors is None or self._vectors.shape[1] != vector.shape[0]:
+                # First entry, or the embedding dimension changed: start over
+                self._vectors = np.zeros((self.max_size, vector.shape[0]), dtype=np.float32)
+                self._expires_at[:] = 0
+                self._keys = [None] * self.max_size
+                self._values = [None] * self.max_size
+                self._next_slot = 0
+            
+            slot = self._next_slot
+            self._next_slot = (slot + 1) % self.max_size
+            self._vectors[slot] = vector
+            self._key_hashes[slot] = hash(key)
+            self._expires_at[slot] = time.monotonic() + self.ttl_seconds
+            self._keys[slot] = key
+            self._values[slot] = value
+    
+    def clear(self) -> None:
+        """Remove all entries and reset counters."""
+        with self._lock:
+            self._vectors = None
+            self._expires_at[:] = 0
+            self._keys = [None] * self.max_size
+            self._values = [None] * self.max_size
+            self._next_slot = 0
+            self.hits = 0
+            self.misses = 0
+    
+    def stats(self) -> Dict[str, int]:
+        """Get hit/miss counters and current number of live entries."""
+        with self._lock:
+            size = int((self._expires_at > time.monotonic()).sum())
+            return {"hits": self.hits, "misses": self.misses, "size": size}
+
+
+# Global cache instances
+_embedding_cache: Optional[EmbeddingCache] = None
+_semantic_cache: Optional[SemanticCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    """Get or create the global query-embedding cache."""
+    global _embedding_cache
+    if _embedding_cache is None:
+        with _cache_lock:
+            if _embedding_cache is None:
+                _embedding_cache = EmbeddingCache(
+                    max_size=settings.embedding_cache_max_size,
+                    ttl_seconds=settings.embedding_cache_ttl_seconds,
+                )
+    return _embedding_cache
+
+
+def get_semantic_cache() -> SemanticCache:
+    """Get or create the global semantic answer cache."""
+    global _semantic_cache
+    if _semantic_cache is None:
+        with _cache_lock:
+            if _semantic_cache is None:
+                _semantic_cache = SemanticCache(
+                    max_size=settings.semantic_cache_max_size,
+                    max_distance=settings.semantic_cache_max_distance,
+                    ttl_seconds=settings.semantic_cache_ttl_seconds,
+                )
+    return _semantic_cache
+
+
+def reset_caches() -> None:
+    """Drop the global caches (for testing or configuration changes)."""
+    global _embedding_cache, _semantic_cache
+    with _cache_lock:
+        _embedding_cache = None
+        _semantic_cache = None
@@ -0,0 +1,168 @@
+"""
+Request Coalescing
+
+Single-flight execution for identical in-flight queries:
+- SingleFlight: concurrent callers with the same key await one shared task
+- StreamFanout: one upstream event stream is buffered and fanned out to every
+  subscriber with the same key; late subscribers replay the buffer from the start
+"""
+
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+import asyncio
+import json
+import logging
+
+from src.pipelines.cache import normalize_query
+
+logger = logging.getLogger(__name__)
+
+
+def filters_key(filters: Optional[Dict[str, Any]]) -> Optional[str]:
+    """Canonical, hashable form of metadata filters for request keys."""
+    return json.dumps(filters, sort_keys=True, default=str) if filters else None
+
+
+def coalesce_key(
+    query: str,
+    top_k: int,
+    provider_override: Optional[str] = None,
+    filters: Optional[Dict[str, Any]] = None,
+    hybrid: bool = False,
+    hnsw_ef: Optional[int] = None,
+    exact: Optional[bool] = None,
+) -> Tuple:
+    """Build the coalescing key for a query request."""
+    return (normalize_query(query), top_k, provider_override, filters_key(filters), hybrid, hnsw_ef, exact)
+
+
+class SingleFlight:
+    """
+    Share one in-flight coroutine between concurrent callers with the same key.
+
+    The shared task is shielded, so a caller that is cancelled (e.g. client
+    disconnect) does not cancel the work other callers are waiting on.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+
+    async def do(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        Run `factory()` once per key while it is in flight.
+
+        Returns:
+            Tuple of (result, shared) where shared is True if this caller joined
+            an execution started by another caller
+        """
+        task = self._inflight.get(key)
+        shared = task is not None
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+        return await asyncio.shield(task), shared
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark the exception as retrieved in case every caller was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._inflight
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+
+class _Broadcast:
+    """Buffered events from one upstream stream, shared by its subscribers."""
+
+    def __init__(self):
+        self.events: List[Any] = []
+        self.finished = False
+        self.error: Optional[BaseException] = None
+        self.subscribers = 0
+        self.condition = asyncio.Condition()
+        self.task: Optional[asyncio.Task] = None
+
+
+class StreamFanout:
+    """
+    Fan one upstream async event stream out to many subscribers.
+
+    The first subscriber for a key starts a producer task that drains the
+    upstream stream into a buffer; every subscriber (including ones that join
+    late) reads the buffer from the start. When the last subscriber leaves
+    before the stream finishes, the producer is cancelled and the upstream
+    stream is closed.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, _Broadcast] = {}
+
+    async def subscribe(
+        self,
+        key: Hashable,
+        factory: Callable[[], AsyncIterator[Any]],
+    ) -> AsyncIterator[Tuple[Any, bool]]:
+        """
+        Subscribe to the stream for `key`, starting it with `factory()` if needed.
+
+        Yields:
+            Tuples of (event, shared) where shared is True if this subscriber
+            joined a stream started by another request
+        """
+        broadcast = self._inflight.get(key)
+        shared = broadcast is not None
+        if broadcast is None:
+            broadcast = _Broadcast()
+            self._inflight[key] = broadcast
+            broadcast.task = asyncio.ensure_future(self._pump(key, broadcast, factory()))
+
+        broadcast.subscribers += 1
+        try:
+            index = 0
+            while True:
+                if index < len(broadcast.events):
+                    yield broadcast.events[index], shared
+                    index += 1
+                    continue
+                if broadcast.finished:
+                    break
+                async with broadcast.condition:
+                    await broadcast.condition.wait_for(
+                        lambda seen=index: seen < len(broadcast.events) or broadcast.finished
+                    )
+            if broadcast.error is not None:
+                raise broadcast.error
+        finally:
+            broadcast.subscribers -= 1
+            if broadcast.subscribers == 0 and not broadcast.finished:
+                logger.info("All subscribers left, cancelling upstream stream")
+                self._forget(key, broadcast)
+                broadcast.task.cancel()
+
+    async def _pump(self, key: Hashable, broadcast: _Broadcast, source: AsyncIterator[Any]) -> None:
+        """Drain the upstream stream into the broadcast buffer."""
+        try:
+            async for event in source:
+                broadcast.events.append(event)
+                async with broadcast.condition:
+                    broadcast.condition.notify_all()
+        except Exception as e:
+            broadcast.error = e
+        finally:
+            broadcast.finished = True
+            self._forget(key, broadcast)
+            await source.aclose()
+            async with broadcast.condition:
+                broadcast.condition.notify_all()
+
+    def _forget(self, key: Hashable, broadcast: _Broadcast) -> None:
+        if self._inflight.get(key) is broadcast:
+            del self._inflight[key]
+
+    def __len__(self) -> int:
+        return len(self._inflight)
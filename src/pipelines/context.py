@@ -0,0 +1,209 @@
+"""
+Context Packing
+
+Fits retrieved chunks into a token budget before they are rendered into the
+RAG prompt. Chunks are taken in score order; the first chunk that does not fit
+is truncated (if enough budget remains to be useful) and the rest are dropped.
+
+Token counts use tiktoken for OpenAI models when it is installed, and a
+per-provider characters-per-token estimate otherwise.
+
+Before packing, chunks that are adjacent in the same parent document can be
+stitched into one passage so the text they share through `chunk_overlap` is
+only sent once.
+"""
+
+from functools import lru_cache
+from typing import Dict, List, Tuple
+import logging
+import math
+
+from haystack.dataclasses import Document
+
+logger = logging.getLogger(__name__)
+
+# Approximate characters per token when no tokenizer is available.
+# Kept slightly conservative so estimates err towards overcounting.
+CHARS_PER_TOKEN = {
+    "openai": 3.8,
+    "groq": 3.6,
+    "anthropic": 3.4,
+}
+DEFAULT_CHARS_PER_TOKEN = 3.4
+
+
+@lru_cache(maxsize=16)
+def _get_encoding(model: str):
+    """Get a tiktoken encoding for an OpenAI model, or None if unavailable."""
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        # tiktoken fetches BPE files on first use; fall back if that fails
+        logger.warning(f"tiktoken unavailable for {model}, estimating tokens: {e}")
+        return None
+
+
+class TokenCounter:
+    """Count and truncate text in tokens for a provider/model."""
+
+    def __init__(self, provider: str, model: str):
+        self.provider = provider
+        self.model = model
+        self.encoding = _get_encoding(model) if provider == "openai" else None
+        self.chars_per_token = CHARS_PER_TOKEN.get(provider, DEFAULT_CHARS_PER_TOKEN)
+
+    def count(self, text: str) -> int:
+        """Count tokens in text."""
+        if not text:
+            return 0
+        if self.encoding is not None:
+            return len(self.encoding.encode(text))
+        return math.ceil(len(text) / self.chars_per_token)
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """Truncate text to at most `max_tokens` tokens."""
+        if max_tokens <= 0:
+            return ""
+        if self.encoding is not None:
+            tokens = self.encoding.encode(text)
+            return text if len(tokens) <= max_tokens else self.encoding.decode(tokens[:max_tokens])
+        max_chars = int(max_tokens * self.chars_per_token)
+        if len(text) <= max_chars:
+            return text
+        # Cut at a word boundary where possible
+        cut = text.rfind(" ", 0, max_chars)
+        return text[: cut if cut > max_chars // 2 else max_chars]
+
+
+@lru_cache(maxsize=16)
+def get_token_counter(provider: str, model: str) -> TokenCounter:
+    """Get a cached token counter for a provider/model."""
+    return TokenCounter(provider, model)
+
+
+def pack_documents(
+    documents: List[Document],
+    counter: TokenCounter,
+    budget_tokens: int,
+    min_chunk_tokens: int = 64,
+) -> Tuple[List[Document], bool]:
+    """
+    Select the highest-scoring chunks that fit in a token budget.
+
+    Args:
+        documents: Retrieved chunks
+        counter: Token counter for the target model
+        budget_tokens: Tokens available for source chunks
+        min_chunk_tokens: Smallest truncated chunk worth including
+
+    Returns:
+        Tuple of (packed documents in score order, whether a chunk was truncated)
+    """
+    ranked = sorted(
+        documents,
+        key=lambda d: d.score if d.score is not None else float("-inf"),
+        reverse=True,
+    )
+
+    packed: List[Document] = []
+    remaining = budget_tokens
+    for doc in ranked:
+        # Each chunk is rendered as "[n] content" followed by a blank line
+        marker_tokens = counter.count(f"[{len(packed) + 1}] \n\n")
+        content = doc.content or ""
+        cost = marker_tokens + counter.count(content)
+        if cost <= remaining:
+            packed.append(doc)
+            remaining -= cost
+            continue
+
+        available = remaining - marker_tokens
+        if available >= min_chunk_tokens:
+            packed.append(Document(
+                id=doc.id,
+                content=counter.truncate(content, available),
+                meta={**doc.meta, "truncated": True},
+                score=doc.score,
+                embedding=doc.embedding,
+            ))
+            return packed, True
+        break
+
+    return packed, False
+
+
+def _has_position(doc: Document) -> bool:
+    return all(doc.meta.get(key) is not None for key in ("parent_id", "char_start", "char_end"))
+
+
+def _stitch(chunks: List[Document]) -> Document:
+    """Join chunks of one parent (sorted by offset) into a passage, skipping overlapping text."""
+    content = chunks[0].content or ""
+    end = chunks[0].meta["char_end"]
+    for chunk in chunks[1:]:
+        if chunk.meta["char_end"] <= end:
+            continue  # fully contained in the passage so far
+        content += (chunk.content or "")[max(0, end - chunk.meta["char_start"]):]
+        end = chunk.meta["char_end"]
+
+    scores = [chunk.score for chunk in chunks if chunk.score is not None]
+    return Document(
+        id=chunks[0].id,
+        content=content,
+        meta={**chunks[0].meta, "char_end": end, "merged_chunk_ids": [chunk.id for chunk in chunks]},
+        score=max(scores) if scores else None,
+    )
+
+
+def merge_adjacent_chunks(documents: List[Document]) -> List[Document]:
+    """
+    Stitch retrieved chunks that touch or overlap in their parent document.
+
+    Chunks need the position payload written by `QdrantDocumentStore.write_documents`
+    (parent_id and char offsets); others pass through unchanged. A merged
+    passage takes the place of its highest-ranked chunk and its best score.
+
+    Args:
+        documents: Retrieved chunks in rank order
+
+    Returns:
+        Chunks and merged passages in rank order
+    """
+    by_parent: Dict[str, List[int]] = {}
+    for i, doc in enumerate(documents):
+        if _has_position(doc):
+            by_parent.setdefault(doc.meta["parent_id"], []).append(i)
+
+    merged: Dict[int, Document] = {}
+    absorbed = set()
+
+    def flush(run: List[int]) -> None:
+        if len(run) > 1:
+            anchor = min(run)
+            merged[anchor] = _stitch([documents[i] for i in run])
+            absorbed.update(i for i in run if i != anchor)
+
+    for indices in by_parent.values():
+        if len(indices) < 2:
+            continue
+        ordered = sorted(indices, key=lambda i: documents[i].meta["char_start"])
+        run = [ordered[0]]
+        run_end = documents[ordered[0]].meta["char_end"]
+        for i in ordered[1:]:
+            if documents[i].meta["char_start"] <= run_end:
+                run.append(i)
+                run_end = max(run_end, documents[i].meta["char_end"])
+            else:
+                flush(run)
+                run, run_end = [i], documents[i].meta["char_end"]
+        flush(run)
+
+    if absorbed:
+        logger.info(f"Merged {len(absorbed) + len(merged)} adjacent chunks into {len(merged)} passages")
+    return [merged.get(i, doc) for i, doc in enumerate(documents) if i not in absorbed]
@@ -0,0 +1,114 @@
+"""
+Request Deadlines
+
+End-to-end time budget for one query. The deadline is created when the request
+arrives and every stage (embedding, search, generation) runs with whatever
+budget remains, so a slow stage eats into later stages instead of extending
+the request. Retries stop once the next backoff would overrun the deadline.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Awaitable, Iterator, Optional
+import asyncio
+import inspect
+import time
+
+from tenacity import RetryCallState
+from tenacity.stop import stop_base
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when a request runs out of its time budget."""
+
+    def __init__(self, stage: str, timeout_seconds: float):
+        self.stage = stage
+        self.timeout_seconds = timeout_seconds
+        super().__init__(f"Request deadline of {timeout_seconds}s exceeded during {stage}")
+
+
+class Deadline:
+    """Absolute deadline for a request, measured on the monotonic clock."""
+
+    def __init__(self, timeout_seconds: float):
+        """
+        Initialize the deadline.
+
+        Args:
+            timeout_seconds: Total time budget from now
+        """
+        self.timeout_seconds = timeout_seconds
+        self.expires_at = time.monotonic() + timeout_seconds
+
+    def remaining(self) -> float:
+        """Seconds left before the deadline (never negative)."""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    async def run(self, stage: str, awaitable: Awaitable[Any]) -> Any:
+        """
+        Await `awaitable` within the remaining budget.
+
+        Raises:
+            DeadlineExceeded: If the deadline passes first (the awaitable is cancelled)
+        """
+        budget = self.remaining()
+        if budget <= 0:
+            if inspect.iscoroutine(awaitable):
+                awaitable.close()
+            raise DeadlineExceeded(stage, self.timeout_seconds)
+        try:
+            async with asyncio.timeout(budget):
+                return await awaitable
+        except TimeoutError as e:
+            if isinstance(e, DeadlineExceeded):
+                raise
+            raise DeadlineExceeded(stage, self.timeout_seconds) from e
+
+    async def iterate(self, stage: str, source: AsyncIterator[Any]) -> AsyncIterator[Any]:
+        """
+        Iterate an async stream, bounding each step by the remaining budget.
+
+        The source is closed when iteration ends, fails or times out.
+        """
+        try:
+            while True:
+                try:
+                    item = await self.run(stage, anext(source))
+                except StopAsyncIteration:
+                    return
+                yield item
+        finally:
+            await source.aclose()
+
+
+_current_deadline: ContextVar[Optional[Deadline]] = ContextVar("current_deadline", default=None)
+
+
+def current_deadline() -> Optional[Deadline]:
+    """Get the deadline of the request running in this context, if any."""
+    return _current_deadline.get()
+
+
+@contextmanager
+def use_deadline(deadline: Deadline) -> Iterator[Deadline]:
+    """Make `deadline` the current deadline for this context (and tasks it starts)."""
+    token = _current_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current_deadline.reset(token)
+
+
+class stop_before_deadline(stop_base):
+    """Tenacity stop condition: give up when the next backoff would overrun the current deadline."""
+
+    def __call__(self, retry_state: RetryCallState) -> bool:
+        deadline = current_deadline()
+        if deadline is None:
+            return False
+        # `upcoming_sleep` is only set by tenacity >= 8.3; older releases stop at the deadline itself
+        return deadline.remaining() <= (getattr(retry_state, "upcoming_sleep", None) or 0)
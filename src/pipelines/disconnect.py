@@ -0,0 +1,61 @@
+"""
+Client Disconnect Handling
+
+Stops a streaming pipeline when the client that requested it goes away, so
+the upstream LLM stream is closed instead of running to `llm_max_tokens`.
+"""
+
+from typing import Any, AsyncIterator, Awaitable, Callable
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+async def _wait_for_disconnect(
+    is_disconnected: Callable[[], Awaitable[bool]],
+    poll_interval: float,
+) -> None:
+    """Return once `is_disconnected()` reports True."""
+    while not await is_disconnected():
+        await asyncio.sleep(poll_interval)
+
+
+async def until_disconnected(
+    events: AsyncIterator[Any],
+    is_disconnected: Callable[[], Awaitable[bool]],
+    poll_interval: float,
+) -> AsyncIterator[Any]:
+    """
+    Relay `events` until the client disconnects, then close the source.
+
+    The disconnect check runs concurrently with the source, so a client that
+    leaves while the pipeline is waiting on the provider is noticed within
+    `poll_interval` rather than at the next token.
+
+    Args:
+        events: Event stream to relay
+        is_disconnected: Async callable reporting client disconnect (e.g. Starlette's `request.is_disconnected`)
+        poll_interval: Seconds between disconnect checks
+    """
+    watcher = asyncio.ensure_future(_wait_for_disconnect(is_disconnected, poll_interval))
+    pending = None
+    try:
+        while True:
+            pending = asyncio.ensure_future(anext(events))
+            done, _ = await asyncio.wait({pending, watcher}, return_when=asyncio.FIRST_COMPLETED)
+            if pending not in done:
+                logger.info("Client disconnected, stopping stream")
+                return
+            task, pending = pending, None
+            try:
+                event = task.result()
+            except StopAsyncIteration:
+                return
+            yield event
+    finally:
+        watcher.cancel()
+        if pending is not None:
+            pending.cancel()
+        await asyncio.gather(watcher, *([pending] if pending else []), return_exceptions=True)
+        await events.aclose()
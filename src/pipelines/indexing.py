@@ -5,36 +5,50 @@ Processes documents through:
 1. Text splitting (chunking)
 2. Embedding generation
 3. Writing to document store
+
+Pipelines are built once and reused from a small pool (see
+`IndexingPipelinePool`), so an upload only pays for splitting, embedding and
+writing.
 """
 
-from typing import List
+from contextlib import contextmanager, nullcontext
+from typing import Callable, Iterator, List, Optional
+import logging
+import queue
+import threading
 from haystack.core.pipeline import Pipeline
 from haystack.dataclasses import Document
-from haystack.components.embedders import OpenAIDocumentEmbedder
 from haystack.components.preprocessors import DocumentSplitter
 from haystack.components.writers import DocumentWriter
-from haystack.utils import Secret
-from src.document_stores.store import QdrantDocumentStore
+from src.document_stores.store import QdrantDocumentStore, chunk_positions, get_document_store, reset_document_store
+from src.embeddings.components import DocumentEmbedder
 from src.config.settings import settings
 
+logger = logging.getLogger(__name__)
+
 
-def create_indexing_pipeline() -> Pipeline:
+def create_indexing_pipeline(document_store: Optional[QdrantDocumentStore] = None) -> Pipeline:
     """
     Create a Haystack 2.x indexing pipeline.
     
     Pipeline flow:
     1. DocumentSplitter - Splits documents into chunks
-    2. OpenAIDocumentEmbedder - Creates embeddings for each chunk
+    2. DocumentEmbedder - Creates embeddings for each chunk with the configured provider
     3. DocumentWriter - Writes documents with embeddings to Qdrant
     
+    Args:
+        document_store: Store to write to (a new connection to the configured
+            collection if not provided)
+    
     Returns:
         Pipeline: Configured indexing pipeline
     """
     # Initialize document store
-    document_store = QdrantDocumentStore(
-        collection_name=settings.qdrant_collection_name,
-        embedding_dimension=settings.embedding_dimension
-    )
+    if document_store is None:
+        document_store = QdrantDocumentStore(
+            collection_name=settings.qdrant_collection_name,
+            embedding_dimension=settings.embedding_dimension
+        )
     
     # Initialize pipeline components
     splitter = DocumentSplitter(
@@ -43,10 +57,7 @@ def create_indexing_pipeline() -> Pipeline:
         split_overlap=settings.chunk_overlap
     )
     
-    embedder = OpenAIDocumentEmbedder(
-        api_key=Secret.from_token(settings.openai_api_key),
-        model=settings.embedding_model
-    )
+    embedder = DocumentEmbedder()
     
     writer = DocumentWriter(document_store=document_store)
     
@@ -63,16 +74,166 @@ def create_indexing_pipeline() -> Pipeline:
     return pipeline
 
 
+def _pipeline_settings() -> tuple:
+    """Settings baked into a pooled pipeline; when they change the pool is rebuilt."""
+    return (
+        settings.qdrant_collection_name,
+        settings.embedding_dimension,
+        settings.chunk_size,
+        settings.chunk_overlap,
+        settings.indexing_pipeline_pool_size,
+    )
+
+
+class IndexingPipelinePool:
+    """
+    Reusable indexing pipelines sharing one document store.
+    
+    A Haystack pipeline is not meant to run in several threads at once, so
+    each run checks out its own pipeline. Pipelines are built on demand up to
+    `size`; further runs wait for one to be returned. The embedder is resolved
+    per run through `get_embedder`, so it is shared with the query path.
+    """
+    
+    def __init__(self, size: int, document_store: QdrantDocumentStore):
+        """
+        Initialize the pool.
+        
+        Args:
+            size: Maximum number of pipelines (and concurrent runs)
+            document_store: Store all pipelines write to
+        """
+        self.size = size
+        self.document_store = document_store
+        self.settings_key = _pipeline_settings()
+        self._idle: queue.LifoQueue = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+    
+    @contextmanager
+    def acquire(self) -> Iterator[Pipeline]:
+        """Check out a pipeline for one run, returning it to the pool afterwards."""
+        pipeline = self._checkout()
+        try:
+            yield pipeline
+        finally:
+            self._idle.put(pipeline)
+    
+    def _checkout(self) -> Pipeline:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            build = self._created < self.size
+            if build:
+                self._created += 1
+        if not build:
+            return self._idle.get()
+        try:
+            pipeline = create_indexing_pipeline(self.document_store)
+        except Exception:
+            with self._lock:
+                self._created -= 1
+            raise
+        logger.info(f"Built indexing pipeline {self._created}/{self.size}")
+        return pipeline
+
+
+# Global pipeline pool
+_pipeline_pool: Optional[IndexingPipelinePool] = None
+_pool_lock = threading.Lock()
+
+
+def get_indexing_pipeline_pool() -> IndexingPipelinePool:
+    """
+    Get the global indexing pipeline pool, rebuilding it if settings changed.
+    
+    Returns:
+        IndexingPipelinePool: Pool writing to the global document store
+    """
+    global _pipeline_pool
+    key = _pipeline_settings()
+    if _pipeline_pool is None or _pipeline_pool.settings_key != key:
+        with _pool_lock:
+            if _pipeline_pool is None or _pipeline_pool.settings_key != key:
+                document_store = get_document_store()
+                if (document_store.collection_name, document_store.embedding_dimension) != key[:2]:
+                    reset_document_store()
+                    document_store = get_document_store()
+                _pipeline_pool = IndexingPipelinePool(settings.indexing_pipeline_pool_size, document_store)
+    return _pipeline_pool
+
+
+def reset_indexing_pipelines() -> None:
+    """Drop the global pipeline pool (for testing or configuration changes)."""
+    global _pipeline_pool
+    with _pool_lock:
+        _pipeline_pool = None
+
+
 def index_documents(documents: List[Document]) -> dict:
     """
-    Index documents through the pipeline.
+    Index documents through a pooled pipeline.
     
     Args:
         documents: List of Haystack Document objects to index
-        
+    
     Returns:
         dict: Pipeline results with number of documents written
     """
-    pipeline = create_indexing_pipeline()
-    result = pipeline.run({"splitter": {"documents": documents}})
-    return result
+    with get_indexing_pipeline_pool().acquire() as pipeline:
+        return pipeline.run({"splitter": {"documents": documents}})
+
+
+def index_documents_in_stages(
+    documents: List[Document],
+    on_progress: Optional[Callable[[str, int, int, int], None]] = None,
+    step_size: Optional[int] = None,
+) -> dict:
+    """
+    Index documents like `index_documents`, reporting progress as it goes.
+    
+    Runs the components of a pooled pipeline one at a time: documents are
+    split once, then chunks are embedded and written `step_size` at a time,
+    inside `bulk_load` when there are at least `qdrant_bulk_load_min_documents`.
+    Chunk positions are computed over the whole split first, so neighbour
+    links survive step boundaries.
+    
+    Args:
+        documents: List of Haystack Document objects to index
+        on_progress: Called as `(stage, chunks_total, chunks_embedded, chunks_written)`
+            when a stage starts ("chunking", "embedding", "writing") and when indexing ends
+        step_size: Chunks per embed/write step (uses `ingestion_step_size` if not provided)
+    
+    Returns:
+        dict: Results in the shape of `index_documents`
+    """
+    step_size = step_size or settings.ingestion_step_size
+    report = on_progress or (lambda *progress: None)
+    
+    with get_indexing_pipeline_pool().acquire() as pipeline:
+        splitter = pipeline.get_component("splitter")
+        embedder = pipeline.get_component("embedder")
+        writer = pipeline.get_component("writer")
+        
+        report("chunking", 0, 0, 0)
+        chunks = splitter.run(documents=documents)["documents"]
+        total, embedded, written = len(chunks), 0, 0
+        # Link neighbours across the whole split, not just within one step
+        positions = chunk_positions(chunks)
+        for chunk in chunks:
+            chunk.meta = {**chunk.meta, **positions.get(chunk.id, {})}
+        
+        threshold = settings.qdrant_bulk_load_min_documents
+        bulk = threshold and total >= threshold
+        with writer.document_store.bulk_load() if bulk else nullcontext():
+            for start in range(0, total, step_size):
+                report("embedding", total, embedded, written)
+                batch = embedder.run(documents=chunks[start:start + step_size])["documents"]
+                embedded += len(batch)
+                report("writing", total, embedded, written)
+                written += writer.run(documents=batch)["documents_written"]
+        
+        report("writing", total, embedded, written)
+    return {"writer": {"documents_written": written}}
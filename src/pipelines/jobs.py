@@ -0,0 +1,654 @@
+"""
+Ingestion Jobs
+
+Uploads are spooled to a durable SQLite queue (`ingestion_queue_path`) and
+acknowledged with a job ID right away. Worker threads, in the API process
+and/or standalone workers (`python -m src.pipelines.worker`), extract,
+chunk, embed and write them in the background, recording the current stage,
+chunk progress and per-stage timings for `GET /documents/jobs/{id}`.
+
+A claimed job is leased to one worker for `ingestion_visibility_timeout`
+seconds and the lease is renewed by a heartbeat while the worker is alive.
+If the worker dies, the lease runs out and another worker takes the job over;
+a worker that finds its lease taken stops working on the job. Failed jobs are
+retried with exponential backoff up to `ingestion_max_attempts`.
+"""
+
+from contextlib import contextmanager
+from enum import Enum
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from haystack.dataclasses import Document
+from src.config.settings import settings
+from src.document_processing.extractor import ExtractionError, extract_text
+from src.document_stores.store import DimensionMismatchError, set_shared_generation
+from src.pipelines.indexing import index_documents_in_stages
+
+logger = logging.getLogger(__name__)
+
+# How long an idle worker sleeps before checking the queue again
+# (submissions wake in-process workers immediately; standalone workers poll)
+POLL_INTERVAL_SECONDS = 1.0
+
+
+class JobStage(str, Enum):
+    """Lifecycle stages of an ingestion job."""
+    QUEUED = "queued"
+    EXTRACTING = "extracting"
+    CHUNKING = "chunking"
+    EMBEDDING = "embedding"
+    WRITING = "writing"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+TERMINAL_STAGES = {JobStage.COMPLETED, JobStage.FAILED}
+RUNNING_STAGES = set(JobStage) - TERMINAL_STAGES - {JobStage.QUEUED}
+
+# How often the API re-reads the shared collection generation (see `start_generation_refresh`)
+GENERATION_REFRESH_SECONDS = 1.0
+
+# Errors caused by the upload or the configuration (unreadable file, collection
+# of another dimension); retrying cannot fix them, so the job fails on the first
+# attempt. Everything else, including ValueErrors from provider or Qdrant
+# clients on bad responses, is retried.
+PERMANENT_ERRORS = (ExtractionError, DimensionMismatchError)
+
+
+class QueueFullError(Exception):
+    """Raised when a job is submitted while `ingestion_max_pending` jobs are queued."""
+    pass
+
+
+class LeaseLostError(Exception):
+    """Raised when a worker's lease on a job has expired and another worker may hold it."""
+    pass
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    document_id TEXT NOT NULL,
+    filename TEXT,
+    extension TEXT,
+    metadata TEXT NOT NULL,
+    payload BLOB,
+    stage TEXT NOT NULL,
+    error TEXT,
+    chunks_total INTEGER NOT NULL DEFAULT 0,
+    chunks_embedded INTEGER NOT NULL DEFAULT 0,
+    chunks_written INTEGER NOT NULL DEFAULT 0,
+    timings TEXT NOT NULL DEFAULT '{}',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    available_at REAL NOT NULL DEFAULT 0,
+    lease_owner TEXT,
+    lease_expires_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_stage_created ON jobs (stage, created_at);
+CREATE TABLE IF NOT EXISTS collection_generations (
+    collection TEXT PRIMARY KEY,
+    generation INTEGER NOT NULL
+);
+"""
+
+# Columns added after the first release of the queue, for existing files
+_ADDED_COLUMNS = {
+    "available_at": "REAL NOT NULL DEFAULT 0",
+    "lease_owner": "TEXT",
+    "lease_expires_at": "REAL",
+}
+
+# Columns returned by `get` (the payload is only handed to workers)
+_STATUS_COLUMNS = (
+    "id, document_id, filename, stage, error, chunks_total, chunks_embedded, "
+    "chunks_written, timings, attempts, created_at, started_at, finished_at, lease_owner"
+)
+
+
+class JobQueue:
+    """
+    Durable FIFO of ingestion jobs in a SQLite file.
+
+    Each job row holds the spooled upload (dropped once the job finishes),
+    its status and the lease of the worker processing it. Every call opens
+    its own connection and claims run in `BEGIN IMMEDIATE` transactions, so
+    the queue can be shared by threads and by processes on one host.
+
+    The file is opened in WAL mode, which relies on shared memory and so only
+    works on a single host. With `shared_filesystem` a rollback journal is
+    used instead, so workers on several hosts can share a file on a network
+    filesystem whose POSIX locks are reliable (e.g. NFSv4; not SMB or NFS
+    mounted with `nolock`). Every process opening the file must agree.
+    """
+
+    def __init__(self, path: str, shared_filesystem: Optional[bool] = None):
+        """
+        Open (or create) the queue.
+
+        Args:
+            path: SQLite file; parent directories are created
+            shared_filesystem: Use a rollback journal instead of WAL (uses
+                `ingestion_queue_shared_filesystem` if not provided)
+        """
+        self.path = path
+        if shared_filesystem is None:
+            shared_filesystem = settings.ingestion_queue_shared_filesystem
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(f"PRAGMA journal_mode={'DELETE' if shared_filesystem else 'WAL'}")
+            conn.executescript(_SCHEMA)
+            existing = {row["name"] for row in conn.execute("PRAGMA table_info(jobs)")}
+            for column, definition in _ADDED_COLUMNS.items():
+                if column not in existing:
+                    conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {definition}")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=30.0, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def submit(
+        self,
+        document_id: str,
+        payload: bytes,
+        extension: Optional[str] = None,
+        filename: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """
+        Spool an upload as a new job.
+
+        Args:
+            document_id: ID the indexed document will get
+            payload: Raw file bytes, or UTF-8 text when `extension` is None
+            extension: File extension selecting the extractor (e.g. ".pdf")
+            filename: Original filename, for status reports
+            metadata: Document metadata
+
+        Returns:
+            str: Job ID
+
+        Raises:
+            QueueFullError: If `ingestion_max_pending` jobs are already queued
+        """
+        job_id = str(uuid.uuid4())
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                limit = settings.ingestion_max_pending
+                if limit and self._count(conn, JobStage.QUEUED) >= limit:
+                    raise QueueFullError(f"{limit} ingestion jobs are already queued")
+                conn.execute(
+                    "INSERT INTO jobs (id, document_id, filename, extension, metadata, payload, stage, created_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (job_id, document_id, filename, extension, json.dumps(metadata or {}),
+                     payload, JobStage.QUEUED.value, time.time()),
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return job_id
+
+    def claim(self, owner: str) -> Optional[Dict[str, Any]]:
+        """
+        Lease the oldest available job and mark it as extracting.
+
+        Available jobs are queued ones whose retry delay has passed and
+        running ones whose lease expired (their worker died). An expired job
+        that has used up `ingestion_max_attempts` is failed instead.
+
+        Args:
+            owner: Worker taking the lease
+
+        Returns:
+            The job row including payload, or None if no job is available
+        """
+        running = [stage.value for stage in RUNNING_STAGES]
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                while True:
+                    now = time.time()
+                    row = conn.execute(
+                        f"SELECT id, stage, attempts, lease_owner FROM jobs "
+                        f"WHERE (stage = ? AND available_at <= ?) "
+                        f"OR (stage IN ({','.join('?' * len(running))}) "
+                        f"AND (lease_expires_at IS NULL OR lease_expires_at <= ?)) "
+                        f"ORDER BY created_at LIMIT 1",
+                        [JobStage.QUEUED.value, now, *running, now],
+                    ).fetchone()
+                    if row is None or row["stage"] == JobStage.QUEUED.value:
+                        break
+                    if row["attempts"] < settings.ingestion_max_attempts:
+                        logger.warning(f"Lease of {row['lease_owner']} on ingestion job {row['id']} expired; reclaiming")
+                        break
+                    conn.execute(
+                        "UPDATE jobs SET stage = ?, error = ?, finished_at = ?, payload = NULL, "
+                        "lease_expires_at = NULL WHERE id = ?",
+                        (JobStage.FAILED.value,
+                         f"Worker {row['lease_owner']} stopped responding on attempt {row['attempts']}; giving up",
+                         now, row["id"]),
+                    )
+                    logger.error(f"Ingestion job {row['id']} abandoned after {row['attempts']} attempts")
+
+                job = None
+                if row is not None:
+                    conn.execute(
+                        "UPDATE jobs SET stage = ?, started_at = ?, attempts = attempts + 1, "
+                        "chunks_embedded = 0, chunks_written = 0, lease_owner = ?, lease_expires_at = ? "
+                        "WHERE id = ?",
+                        (JobStage.EXTRACTING.value, now, owner, now + settings.ingestion_visibility_timeout, row["id"]),
+                    )
+                    job = dict(conn.execute("SELECT * FROM jobs WHERE id = ?", (row["id"],)).fetchone())
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return job
+
+    def update(self, job_id: str, owner: Optional[str] = None, **fields: Any) -> bool:
+        """
+        Update status columns of a job.
+
+        Args:
+            job_id: Job to update
+            owner: Lease holder; if given, the update only applies while it
+                still holds the lease, and renews the lease
+            **fields: Column values (stage, chunk counts, timings, error, ...)
+
+        Returns:
+            bool: False if `owner` no longer holds the lease
+        """
+        values = {"lease_expires_at": time.time() + settings.ingestion_visibility_timeout} if owner else {}
+        values.update({
+            key: value.value if isinstance(value, Enum) else json.dumps(value) if isinstance(value, dict) else value
+            for key, value in fields.items()
+        })
+        assignments = ", ".join(f"{key} = ?" for key in values)
+        where, params = ("id = ? AND lease_owner = ?", [job_id, owner]) if owner else ("id = ?", [job_id])
+        with self._connect() as conn:
+            cursor = conn.execute(f"UPDATE jobs SET {assignments} WHERE {where}", [*values.values(), *params])
+        return cursor.rowcount > 0
+
+    def finish(self, job_id: str, stage: JobStage, owner: Optional[str] = None, **fields: Any) -> bool:
+        """Mark a job completed or failed, drop its spooled payload and release the lease."""
+        finished = self.update(
+            job_id, owner, stage=stage, finished_at=time.time(), payload=None, lease_expires_at=None, **fields
+        )
+        if finished:
+            self._bump_generation()
+        return finished
+
+    def retry(self, job_id: str, owner: str, delay: float, **fields: Any) -> bool:
+        """Release a job back to the queue, available again after `delay` seconds."""
+        released = self.update(
+            job_id, owner, stage=JobStage.QUEUED, available_at=time.time() + delay, lease_expires_at=None, **fields
+        )
+        if released:
+            self._bump_generation()  # the attempt may have written some chunks
+        return released
+
+    def _bump_generation(self) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO collection_generations (collection, generation) VALUES (?, 1) "
+                "ON CONFLICT (collection) DO UPDATE SET generation = generation + 1",
+                (settings.qdrant_collection_name,),
+            )
+
+    def generation(self, collection: str, timeout: float = 30.0) -> int:
+        """
+        Number of jobs that finished writing to a collection, by any worker.
+
+        Every process sharing the queue sees the same counter, so query-side
+        caches in the API notice writes made by standalone workers.
+
+        Args:
+            collection: Qdrant collection name
+            timeout: Seconds to wait for a writer's lock
+        """
+        conn = sqlite3.connect(self.path, timeout=timeout, isolation_level=None)
+        try:
+            row = conn.execute(
+                "SELECT generation FROM collection_generations WHERE collection = ?", (collection,)
+            ).fetchone()
+        finally:
+            conn.close()
+        return row[0] if row else 0
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a job's status.
+
+        Returns:
+            Status columns (timings decoded), or None if the job is unknown
+        """
+        with self._connect() as conn:
+            row = conn.execute(f"SELECT {_STATUS_COLUMNS} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job["timings"] = json.loads(job["timings"])
+        return job
+
+    def pending_count(self) -> int:
+        """Number of jobs waiting for a worker."""
+        with self._connect() as conn:
+            return self._count(conn, JobStage.QUEUED)
+
+    @staticmethod
+    def _count(conn: sqlite3.Connection, stage: JobStage) -> int:
+        return conn.execute("SELECT COUNT(*) FROM jobs WHERE stage = ?", (stage.value,)).fetchone()[0]
+
+
+class _JobProgress:
+    """
+    Tracks the stage of a running job, persisting progress and per-stage
+    timings under the worker's lease.
+    """
+
+    def __init__(self, queue: JobQueue, job: Dict[str, Any]):
+        self.queue = queue
+        self.job_id = job["id"]
+        self.owner = job["lease_owner"]
+        self.stage = JobStage.EXTRACTING
+        self.since = time.monotonic()
+        self.timings: Dict[str, float] = {}
+        self.lost = False
+
+    def enter(self, stage: JobStage, **counts: int) -> None:
+        """
+        Record progress, closing the timing of the previous stage if it changed.
+
+        Raises:
+            LeaseLostError: If the lease was lost, so the job must be abandoned
+        """
+        self.close_stage()
+        self.stage = stage
+        if self.lost or not self.queue.update(self.job_id, self.owner, stage=stage, timings=self.timings, **counts):
+            self.lost = True
+            raise LeaseLostError(f"Lease on ingestion job {self.job_id} lost during {stage.value}")
+
+    def on_indexing_progress(self, stage: str, total: int, embedded: int, written: int) -> None:
+        """Progress callback for `index_documents_in_stages`."""
+        self.enter(JobStage(stage), chunks_total=total, chunks_embedded=embedded, chunks_written=written)
+
+    def renew(self) -> None:
+        """Heartbeat: extend the lease, noting if it was lost."""
+        if not self.lost and not self.queue.update(self.job_id, self.owner):
+            self.lost = True
+
+    def close_stage(self) -> None:
+        """Add the time spent in the current stage to its timing."""
+        now = time.monotonic()
+        self.timings[self.stage.value] = round(self.timings.get(self.stage.value, 0.0) + now - self.since, 3)
+        self.since = now
+
+
+def process_job(
+    queue: JobQueue,
+    job: Dict[str, Any],
+    extract: Callable[[bytes, str], str] = extract_text,
+    progress: Optional[_JobProgress] = None,
+) -> None:
+    """
+    Run a claimed job, recording its outcome in the queue.
+
+    Failures caused by the upload fail the job; other failures (provider or
+    Qdrant outages, ...) put it back in the queue with exponential backoff
+    until `ingestion_max_attempts` is reached.
+
+    Args:
+        queue: Queue the job was claimed from
+        job: Job row returned by `JobQueue.claim`
+        extract: Text extractor for file uploads (e.g. one running in a process pool)
+        progress: Progress tracker (created if not provided)
+    """
+    progress = progress or _JobProgress(queue, job)
+    try:
+        payload = job["payload"]
+        if job["extension"] is None:
+            text = payload.decode("utf-8")
+        else:
+            text = extract(payload, job["extension"])
+        if not text.strip():
+            raise ExtractionError("File contains no extractable text")
+
+        document = Document(id=job["document_id"], content=text, meta=json.loads(job["metadata"]))
+        index_documents_in_stages([document], on_progress=progress.on_indexing_progress)
+        progress.close_stage()
+        if not queue.finish(job["id"], JobStage.COMPLETED, progress.owner, timings=progress.timings, error=None):
+            raise LeaseLostError(f"Lease on ingestion job {job['id']} lost before completion")
+        logger.info(f"Ingestion job {job['id']} completed in {sum(progress.timings.values()):.2f}s")
+    except LeaseLostError as e:
+        # Writes are idempotent (deterministic point IDs), so overlapping work is harmless
+        logger.warning(f"{e}; leaving the job to the worker that reclaimed it")
+    except Exception as e:
+        progress.close_stage()
+        error = f"{type(e).__name__}: {e}"
+        attempts = job["attempts"]
+        if isinstance(e, PERMANENT_ERRORS) or attempts >= settings.ingestion_max_attempts:
+            logger.exception(f"Ingestion job {job['id']} failed during {progress.stage.value}")
+            queue.finish(job["id"], JobStage.FAILED, progress.owner, timings=progress.timings, error=error)
+            return
+        delay = settings.ingestion_retry_backoff * 2 ** (attempts - 1)
+        logger.warning(
+            f"Ingestion job {job['id']} failed during {progress.stage.value} "
+            f"(attempt {attempts}/{settings.ingestion_max_attempts}): {error}; retrying in {delay:.0f}s"
+        )
+        queue.retry(job["id"], progress.owner, delay, timings=progress.timings, error=error)
+
+
+class IngestionWorkers:
+    """Bounded pool of threads draining a `JobQueue`, with a lease heartbeat."""
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        concurrency: int,
+        extract: Callable[[bytes, str], str] = extract_text,
+        worker_id: Optional[str] = None,
+        exit_when_idle: bool = False,
+    ):
+        """
+        Initialize the pool (threads start with `start`).
+
+        Args:
+            queue: Queue to drain
+            concurrency: Number of worker threads, i.e. jobs processed at once
+            extract: Text extractor for file uploads
+            worker_id: Lease owner prefix (defaults to host:pid)
+            exit_when_idle: Let each thread exit once no job is available
+        """
+        self.queue = queue
+        self.concurrency = concurrency
+        self.extract = extract
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.exit_when_idle = exit_when_idle
+        self._threads: List[threading.Thread] = []
+        self._wakeup = threading.Condition()
+        self._stopping = threading.Event()
+        self._active: Dict[str, _JobProgress] = {}
+        self._active_lock = threading.Lock()
+
+    def start(self) -> None:
+        """Start the worker threads and the lease heartbeat."""
+        for i in range(self.concurrency):
+            thread = threading.Thread(
+                target=self._run, args=(f"{self.worker_id}/{i}",), name=f"ingestion-worker-{i}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+        threading.Thread(target=self._heartbeat, name="ingestion-heartbeat", daemon=True).start()
+        logger.info(f"Started {self.concurrency} ingestion workers ({self.worker_id}) on {self.queue.path}")
+
+    def notify(self) -> None:
+        """Wake an idle worker after a submission."""
+        with self._wakeup:
+            self._wakeup.notify()
+
+    def join(self) -> None:
+        """Wait until every worker thread has exited."""
+        for thread in self._threads:
+            thread.join()
+        self._stopping.set()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Stop the workers after their current job.
+
+        Args:
+            timeout: Seconds to wait for each thread; a job still running
+                afterwards is taken over by another worker once its lease expires
+        """
+        self._stopping.set()
+        with self._wakeup:
+            self._wakeup.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def _run(self, owner: str) -> None:
+        while not self._stopping.is_set():
+            try:
+                job = self.queue.claim(owner)
+            except Exception as e:
+                logger.error(f"Failed to claim ingestion job: {e}")
+                job = None
+            if job is None:
+                if self.exit_when_idle:
+                    return
+                with self._wakeup:
+                    self._wakeup.wait(POLL_INTERVAL_SECONDS)
+                continue
+            progress = _JobProgress(self.queue, job)
+            with self._active_lock:
+                self._active[job["id"]] = progress
+            try:
+                process_job(self.queue, job, self.extract, progress)
+            except Exception:
+                # E.g. the queue was locked while recording the outcome; keep the
+                # thread alive and let the job be reclaimed once its lease expires
+                logger.exception(f"Ingestion job {job['id']} could not be processed")
+            finally:
+                with self._active_lock:
+                    del self._active[job["id"]]
+
+    def _heartbeat(self) -> None:
+        """Renew the leases of running jobs well before they expire."""
+        while not self._stopping.wait(settings.ingestion_visibility_timeout / 3):
+            with self._active_lock:
+                running = list(self._active.values())
+            for progress in running:
+                try:
+                    progress.renew()
+                except Exception as e:
+                    logger.error(f"Failed to renew lease on ingestion job {progress.job_id}: {e}")
+
+
+# Global queue and workers
+_queue: Optional[JobQueue] = None
+_workers: Optional[IngestionWorkers] = None
+_lock = threading.Lock()
+_generation_stop: Optional[threading.Event] = None
+
+
+def get_job_queue() -> JobQueue:
+    """Get or open the global ingestion job queue."""
+    global _queue
+    if _queue is None:
+        with _lock:
+            if _queue is None:
+                _queue = JobQueue(settings.ingestion_queue_path)
+    return _queue
+
+
+def start_ingestion_workers() -> IngestionWorkers:
+    """Start the global ingestion workers if they are not running."""
+    global _workers
+    queue = get_job_queue()
+    if _workers is None:
+        with _lock:
+            if _workers is None:
+                _workers = IngestionWorkers(queue, settings.ingestion_concurrency)
+                _workers.start()
+    return _workers
+
+
+def submit_job(
+    document_id: str,
+    payload: bytes,
+    extension: Optional[str] = None,
+    filename: Optional[str] = None,
+    metadata: Optional[Dict[str, Any]] = None,
+) -> str:
+    """
+    Spool an upload and wake an in-process worker (see `JobQueue.submit`).
+
+    Returns:
+        str: Job ID
+
+    Raises:
+        QueueFullError: If `ingestion_max_pending` jobs are already queued
+    """
+    job_id = get_job_queue().submit(document_id, payload, extension, filename, metadata)
+    if settings.ingestion_workers_in_api:
+        start_ingestion_workers().notify()
+    logger.info(f"Queued ingestion job {job_id} for document {document_id}")
+    return job_id
+
+
+def start_generation_refresh() -> None:
+    """
+    Keep the store's shared collection generation in step with the queue.
+
+    A daemon thread re-reads `JobQueue.generation` every
+    `GENERATION_REFRESH_SECONDS` and publishes it with `set_shared_generation`,
+    so query-side caches notice jobs finished by standalone workers without
+    the query path touching SQLite.
+    """
+    global _generation_stop
+    with _lock:
+        if _generation_stop is not None:
+            return
+        _generation_stop = stop = threading.Event()
+    threading.Thread(target=_refresh_generation, args=(stop,), name="ingestion-generation", daemon=True).start()
+
+
+def _refresh_generation(stop: threading.Event) -> None:
+    while True:
+        collection = settings.qdrant_collection_name
+        try:
+            set_shared_generation(collection, get_job_queue().generation(collection))
+        except Exception as e:
+            logger.warning(f"Could not read the shared ingestion generation: {e}")
+        if stop.wait(GENERATION_REFRESH_SECONDS):
+            return
+
+
+def stop_ingestion_workers(timeout: Optional[float] = None) -> None:
+    """Stop the global workers and generation refresh and close the queue (on shutdown, or for testing)."""
+    global _queue, _workers, _generation_stop
+    with _lock:
+        if _workers is not None:
+            _workers.stop(timeout)
+        if _generation_stop is not None:
+            _generation_stop.set()
+        _queue = None
+        _workers = None
+        _generation_stop = None
@@ -0,0 +1,73 @@
+"""
+Maximal Marginal Relevance
+
+Re-ranks an over-fetched candidate set so the chunks sent to the prompt are
+relevant but not redundant. With `chunk_overlap`, neighbouring chunks of the
+same document are often near-duplicates; MMR penalizes each candidate by its
+similarity to the chunks already selected.
+
+All similarities are computed up front as matrix products, so selection is
+a cheap vector update per pick.
+"""
+
+from typing import List, Sequence
+import logging
+
+import numpy as np
+from haystack.dataclasses import Document
+
+logger = logging.getLogger(__name__)
+
+
+def _unit_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return matrix / np.where(norms == 0, 1.0, norms)
+
+
+def mmr_select(
+    query_embedding: Sequence[float],
+    documents: List[Document],
+    top_k: int,
+    lambda_mult: float,
+) -> List[Document]:
+    """
+    Select `top_k` documents by maximal marginal relevance.
+
+    Each pick maximizes `lambda_mult * sim(query, d) - (1 - lambda_mult) * max sim(d, selected)`
+    using cosine similarity. The first pick is the most relevant candidate.
+
+    Args:
+        query_embedding: Query vector
+        documents: Candidates with `embedding` set (e.g. searched with `with_vectors`)
+        top_k: Number of documents to select
+        lambda_mult: Relevance/diversity trade-off (1.0 = relevance only)
+
+    Returns:
+        Selected documents in pick order; the first `top_k` unchanged if any
+        candidate has no embedding
+    """
+    if len(documents) <= 1 or top_k <= 0:
+        return documents[:top_k]
+    if any(doc.embedding is None for doc in documents):
+        logger.warning("MMR skipped: candidates were retrieved without vectors")
+        return documents[:top_k]
+
+    vectors = _unit_rows(np.asarray([doc.embedding for doc in documents], dtype=np.float32))
+    query = _unit_rows(np.asarray(query_embedding, dtype=np.float32))
+    relevance = vectors @ query
+    similarity = vectors @ vectors.T
+
+    selected = [int(np.argmax(relevance))]
+    max_similarity = similarity[selected[0]].copy()
+    available = np.ones(len(documents), dtype=bool)
+    available[selected[0]] = False
+
+    for _ in range(min(top_k, len(documents)) - 1):
+        scores = lambda_mult * relevance - (1 - lambda_mult) * max_similarity
+        scores[~available] = -np.inf
+        pick = int(np.argmax(scores))
+        selected.append(pick)
+        available[pick] = False
+        np.maximum(max_similarity, similarity[pick], out=max_similarity)
+
+    return [documents[i] for i in selected]
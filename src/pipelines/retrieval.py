@@ -5,21 +5,34 @@ Processes queries through:
 1. Query embedding generation
 2. Vector similarity search in Qdrant
 3. LLM-based answer generation (streaming or complete) via aisuite multi-provider support
+
+Each entry point has a native asyncio twin (`aretrieve_documents`,
+`aretrieve_documents_streaming`) used by the API so that embedding, search
+and token streaming never block the event loop.
 """
 
-from typing import List, Dict, Any, Iterator, Optional
-from haystack.core.pipeline import Pipeline
+from typing import List, Dict, Any, AsyncIterator, Awaitable, Callable, Iterator, Optional, Tuple
 from haystack.dataclasses import Document
-from haystack.components.embedders import OpenAITextEmbedder
-from haystack.components.builders import PromptBuilder
-from haystack.components.generators import OpenAIGenerator
-from haystack.dataclasses import ChatMessage
-from haystack.utils import Secret
+from src.document_stores import store as document_stores
 from src.document_stores.store import QdrantDocumentStore
 from src.config.settings import settings
+from src.embeddings import Embedder, get_embedder, reset_embedder
 from src.llm.router import get_router
 from src.llm.provider import get_provider_registry
+from src.llm.hedging import open_hedged_stream, open_stream
+from src.pipelines.cache import get_embedding_cache, get_semantic_cache, reset_caches
+from src.pipelines.coalescing import SingleFlight, StreamFanout, coalesce_key, filters_key
+from src.pipelines.context import get_token_counter, merge_adjacent_chunks, pack_documents
+from src.pipelines.disconnect import until_disconnected
+from src.pipelines.mmr import mmr_select
+from src.pipelines.deadline import Deadline, DeadlineExceeded, stop_before_deadline, use_deadline
+from src.pipelines.stages import StageGraph
+from collections import defaultdict
+import asyncio
+import contextlib
+import dataclasses
 import logging
+import re
 import time
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 import openai
@@ -51,44 +64,32 @@ Rules:
 Answer:"""
 
 
-# Module-level cached instances (lazy-initialized)
-# Avoids expensive object recreation (especially Qdrant connections) on every query
-_cached_embedder = None
-_cached_document_store = None
+# Coalescing of identical in-flight queries on the async path
+_single_flight = SingleFlight()
+_stream_fanout = StreamFanout()
 
 
-def get_text_embedder() -> OpenAITextEmbedder:
+def get_text_embedder() -> Embedder:
     """
-    Get or create cached OpenAI text embedder.
+    Get the embedder for the configured embedding provider.
     
     Returns:
-        OpenAITextEmbedder: Singleton embedder instance
+        Embedder: Singleton embedder instance
     """
-    global _cached_embedder
-    if _cached_embedder is None:
-        _cached_embedder = OpenAITextEmbedder(
-            api_key=Secret.from_token(settings.openai_api_key),
-            model=settings.embedding_model
-        )
-    return _cached_embedder
+    return get_embedder()
 
 
 def get_document_store() -> QdrantDocumentStore:
     """
-    Get or create cached Qdrant document store.
+    Get the process-wide Qdrant document store.
     
-    Reuses connection to avoid expensive reconnection overhead.
+    The query path shares the store (and its Qdrant connections) with the
+    indexing pipelines; see `src.document_stores.store.get_document_store`.
     
     Returns:
         QdrantDocumentStore: Singleton document store instance
     """
-    global _cached_document_store
-    if _cached_document_store is None:
-        _cached_document_store = QdrantDocumentStore(
-            collection_name=settings.qdrant_collection_name,
-            embedding_dimension=settings.embedding_dimension
-        )
-    return _cached_document_store
+    return document_stores.get_document_store()
 
 
 def _reset_cache():
@@ -97,9 +98,60 @@ def _reset_cache():
     
     Useful for testing or when configuration changes.
     """
-    global _cached_embedder, _cached_document_store
-    _cached_embedder = None
-    _cached_document_store = None
+    document_stores.reset_document_store()
+    reset_embedder()
+    reset_caches()
+
+
+def _build_prompt(query: str, documents: List[Document]) -> str:
+    """Render the RAG prompt with numbered source documents."""
+    context = "\n\n".join([f"[{i+1}] {doc.content}" for i, doc in enumerate(documents)])
+    prompt = RAG_PROMPT_TEMPLATE.replace("{% for doc in documents %}\n{{ doc.content }}\n{% endfor %}", context)
+    return prompt.replace("{{ question }}", query)
+
+
+def _pack_prompt(
+    query: str,
+    documents: List[Document],
+    provider_name: str,
+    model: str,
+) -> Tuple[List[Document], str, int]:
+    """
+    Fit retrieved chunks into the model's input token budget and render the prompt.
+    
+    Adjacent chunks of the same document are merged first (when
+    `context_merge_adjacent_chunks` is set), so their overlap is sent once.
+    
+    Returns:
+        Tuple of (packed documents, prompt, prompt_tokens)
+    """
+    if settings.context_merge_adjacent_chunks:
+        documents = merge_adjacent_chunks(documents)
+    counter = get_token_counter(provider_name, model)
+    overhead_tokens = counter.count(_build_prompt(query, []))
+    packed, truncated = pack_documents(
+        documents,
+        counter,
+        settings.context_max_input_tokens - overhead_tokens,
+        settings.context_min_chunk_tokens,
+    )
+    if len(packed) < len(documents) or truncated:
+        logger.info(
+            f"Packed {len(packed)}/{len(documents)} chunks into "
+            f"{settings.context_max_input_tokens}-token budget (truncated: {truncated})"
+        )
+    prompt = _build_prompt(query, packed)
+    return packed, prompt, counter.count(prompt)
+
+
+def _embedding_cache_metadata(cache_hit: bool) -> Dict[str, Any]:
+    """Build response metadata for the query-embedding cache."""
+    stats = get_embedding_cache().stats()
+    return {
+        "embedding_cache_hit": cache_hit,
+        "embedding_cache_hits": stats["hits"],
+        "embedding_cache_misses": stats["misses"],
+    }
 
 
 @retry(
@@ -108,7 +160,7 @@ def _reset_cache():
     retry=retry_if_exception_type((openai.APIError, openai.APIConnectionError)),
     reraise=True
 )
-def _generate_embedding_with_retry(text_embedder: OpenAITextEmbedder, query: str):
+def _generate_embedding_with_retry(text_embedder: Embedder, query: str):
     """Generate embedding with automatic retry on transient failures."""
     return text_embedder.run(text=query)
 
@@ -119,29 +171,235 @@ def _generate_embedding_with_retry(text_embedder: OpenAITextEmbedder, query: str
     retry=retry_if_exception_type(Exception),
     reraise=True
 )
-def _search_documents_with_retry(document_store: QdrantDocumentStore, query_embedding, top_k: int, score_threshold: float):
+def _search_documents_with_retry(document_store: QdrantDocumentStore, query_embedding, top_k: int, score_threshold: float, filters: Optional[Dict[str, Any]] = None, hnsw_ef: Optional[int] = None, exact: Optional[bool] = None, with_vectors: bool = False):
     """Search documents with automatic retry on transient failures."""
     return document_store.search(
         query_embedding=query_embedding,
         top_k=top_k,
-        score_threshold=score_threshold
+        filters=filters,
+        score_threshold=score_threshold,
+        with_vectors=with_vectors,
+        hnsw_ef=hnsw_ef,
+        exact=exact
+    )
+
+
+@retry(
+    stop=stop_after_attempt(3) | stop_before_deadline(),
+    wait=wait_exponential(multiplier=1, min=1, max=10),
+    retry=retry_if_exception_type((openai.APIError, openai.APIConnectionError)),
+    reraise=True
+)
+async def _agenerate_embedding_with_retry(text_embedder: Embedder, query: str):
+    """Generate embedding asynchronously with automatic retry on transient failures."""
+    return await text_embedder.run_async(text=query)
+
+
+@retry(
+    stop=stop_after_attempt(2) | stop_before_deadline(),
+    wait=wait_exponential(multiplier=1, min=1, max=5),
+    retry=retry_if_exception_type(Exception),
+    reraise=True
+)
+async def _asearch_documents_with_retry(document_store: QdrantDocumentStore, query_embedding, top_k: int, score_threshold: float, query_text: Optional[str] = None, with_vectors: bool = False, filters: Optional[Dict[str, Any]] = None, hnsw_ef: Optional[int] = None, exact: Optional[bool] = None):
+    """Search documents asynchronously with automatic retry on transient failures."""
+    return await document_store.search_async(
+        query_embedding=query_embedding,
+        top_k=top_k,
+        filters=filters,
+        score_threshold=score_threshold,
+        query_text=query_text,
+        with_vectors=with_vectors,
+        hnsw_ef=hnsw_ef,
+        exact=exact
     )
 
 
+@retry(
+    stop=stop_after_attempt(3) | stop_before_deadline(),
+    wait=wait_exponential(multiplier=1, min=1, max=10),
+    retry=retry_if_exception_type((openai.APIError, openai.APIConnectionError)),
+    reraise=True
+)
+async def _agenerate_embeddings_batch_with_retry(text_embedder: Embedder, texts: List[str]) -> List[List[float]]:
+    """Embed many texts in as few backend calls as possible with automatic retry on transient failures."""
+    return await text_embedder.aembed(texts)
+
+
+@retry(
+    stop=stop_after_attempt(2) | stop_before_deadline(),
+    wait=wait_exponential(multiplier=1, min=1, max=5),
+    retry=retry_if_exception_type(Exception),
+    reraise=True
+)
+async def _asearch_documents_batch_with_retry(document_store: QdrantDocumentStore, query_embeddings, top_k: int, score_threshold: float, query_texts: Optional[List[str]] = None, with_vectors: bool = False, filters: Optional[Dict[str, Any]] = None, hnsw_ef: Optional[int] = None, exact: Optional[bool] = None):
+    """Search documents for many query vectors in one Qdrant request with automatic retry."""
+    return await document_store.search_batch_async(
+        query_embeddings=query_embeddings,
+        top_k=top_k,
+        filters=filters,
+        score_threshold=score_threshold,
+        query_texts=query_texts,
+        with_vectors=with_vectors,
+        hnsw_ef=hnsw_ef,
+        exact=exact
+    )
+
+
+def _use_hybrid(hybrid: Optional[bool]) -> bool:
+    """Resolve a per-request hybrid search choice against the configured default."""
+    return settings.hybrid_search_enabled if hybrid is None else hybrid
+
+
+def _search_mode(hybrid: bool) -> str:
+    return "hybrid" if hybrid else "dense"
+
+
+def _fetch_k(top_k: int) -> int:
+    """Number of chunks to search for: over-fetched when MMR re-ranks them."""
+    return top_k * settings.mmr_fetch_factor if settings.mmr_enabled else top_k
+
+
+def _diversify(
+    query_embedding: List[float],
+    documents: List[Document],
+    top_k: int,
+    keep_vectors: bool = False
+) -> List[Document]:
+    """
+    Apply MMR to over-fetched candidates when enabled (see `src.pipelines.mmr`).
+    
+    Candidate vectors are only needed for MMR, so they are dropped from the
+    selection unless the caller asked for them.
+    """
+    if not settings.mmr_enabled:
+        return documents
+    selected = mmr_select(query_embedding, documents, top_k, settings.mmr_lambda)
+    logger.info(f"MMR kept {len(selected)} of {len(documents)} candidates")
+    if keep_vectors:
+        return selected
+    return [dataclasses.replace(doc, embedding=None) for doc in selected]
+
+
+def _neighbour_ids(documents: List[Document]) -> Iterator[Tuple[Document, str]]:
+    """Yield (hit, neighbour ID) for each previous/next chunk not already among the documents."""
+    present = {doc.id for doc in documents}
+    for doc in documents:
+        for key in ("prev_chunk_id", "next_chunk_id"):
+            neighbour_id = doc.meta.get(key)
+            if neighbour_id and neighbour_id not in present:
+                present.add(neighbour_id)
+                yield doc, neighbour_id
+
+
+def _wanted_neighbours(document_lists: List[List[Document]]) -> List[str]:
+    """Neighbour IDs to fetch for all lists, without duplicates."""
+    return list(dict.fromkeys(
+        neighbour_id for documents in document_lists for _, neighbour_id in _neighbour_ids(documents)
+    ))
+
+
+def _attach_neighbours(document_lists: List[List[Document]], fetched: List[Document]) -> List[List[Document]]:
+    """Append fetched neighbours to each list, scored like the hit that pulled them in."""
+    by_id = {doc.id: doc for doc in fetched}
+    return [
+        documents + [
+            dataclasses.replace(by_id[neighbour_id], score=hit.score)
+            for hit, neighbour_id in _neighbour_ids(documents)
+            if neighbour_id in by_id
+        ]
+        for documents in document_lists
+    ]
+
+
+def _expand_neighbours(
+    document_store: QdrantDocumentStore,
+    document_lists: List[List[Document]]
+) -> List[List[Document]]:
+    """
+    Add each hit's previous and next chunk when `context_expand_neighbours` is set.
+    
+    Neighbours of every list are fetched by ID in one request and take the
+    score of the hit that pulled them in, so merging folds them into its
+    passage. Expansion is best-effort: if the fetch fails, the hits are used as is.
+    """
+    if not settings.context_expand_neighbours:
+        return document_lists
+    wanted = _wanted_neighbours(document_lists)
+    if not wanted:
+        return document_lists
+    try:
+        fetched = document_store.get_documents_by_id(wanted)
+    except Exception as e:
+        logger.warning(f"Neighbour chunk fetch failed, using hits only: {e}")
+        return document_lists
+    return _attach_neighbours(document_lists, fetched)
+
+
+async def _aexpand_neighbours(
+    document_store: QdrantDocumentStore,
+    document_lists: List[List[Document]],
+    deadline: Deadline
+) -> List[List[Document]]:
+    """Async variant of `_expand_neighbours`; the fetch counts against the request deadline."""
+    if not settings.context_expand_neighbours:
+        return document_lists
+    wanted = _wanted_neighbours(document_lists)
+    if not wanted:
+        return document_lists
+    try:
+        fetched = await deadline.run("neighbour expansion", document_store.get_documents_by_id_async(wanted))
+    except DeadlineExceeded:
+        raise
+    except Exception as e:
+        logger.warning(f"Neighbour chunk fetch failed, using hits only: {e}")
+        return document_lists
+    return _attach_neighbours(document_lists, fetched)
+
+
+def _embed_query(query: str) -> Tuple[List[float], bool]:
+    """
+    Embed a query, consulting the query-embedding cache first.
+    
+    Returns:
+        Tuple of (embedding, cache_hit)
+    """
+    if not settings.embedding_cache_enabled:
+        embedding_result = _generate_embedding_with_retry(get_text_embedder(), query)
+        return embedding_result["embedding"], False
+    
+    cache = get_embedding_cache()
+    cached = cache.get(settings.active_embedding_model, query)
+    if cached is not None:
+        return cached.tolist(), True
+    
+    embedding_result = _generate_embedding_with_retry(get_text_embedder(), query)
+    cache.put(settings.active_embedding_model, query, embedding_result["embedding"])
+    return embedding_result["embedding"], False
+
+
 def retrieve_documents(
     query: str,
     top_k: int = None,
-    provider_override: Optional[str] = None
+    provider_override: Optional[str] = None,
+    filters: Optional[Dict[str, Any]] = None,
+    hnsw_ef: Optional[int] = None,
+    exact: Optional[bool] = None
 ) -> Dict[str, Any]:
     """
     Retrieve relevant documents and generate an answer for a query.
     
     Includes automatic retry logic, performance timing, and multi-provider support.
+    Search results go through the same MMR selection, neighbour expansion and
+    adjacent-chunk merging as the async path, as configured.
     
     Args:
         query: The user's question
         top_k: Number of documents to retrieve (uses settings default if not provided)
         provider_override: Optional manual provider selection (openai|anthropic|groq)
+        filters: Metadata filters (see `src.document_stores.filters`)
+        hnsw_ef: HNSW search beam size; higher trades latency for recall (uses settings default if not provided)
+        exact: Exact (brute-force) search; None lets the store decide by collection size and filters
         
     Returns:
         dict: Contains retrieved documents and generated answer with timing metadata
@@ -160,9 +418,7 @@ def retrieve_documents(
     embed_start = time.time()
     
     try:
-        text_embedder = get_text_embedder()
-        embedding_result = _generate_embedding_with_retry(text_embedder, query)
-        query_embedding = embedding_result["embedding"]
+        query_embedding, cache_hit = _embed_query(query)
         timing["embedding_ms"] = round((time.time() - embed_start) * 1000, 2)
         logger.info(f"Embedding generated in {timing['embedding_ms']}ms")
     except Exception as e:
@@ -177,9 +433,15 @@ def retrieve_documents(
         documents = _search_documents_with_retry(
             document_store,
             query_embedding,
-            top_k,
-            settings.min_similarity_score
+            _fetch_k(top_k),
+            settings.min_similarity_score,
+            filters,
+            hnsw_ef=hnsw_ef,
+            exact=exact,
+            with_vectors=settings.mmr_enabled
         )
+        documents = _diversify(query_embedding, documents, top_k)
+        documents = _expand_neighbours(document_store, [documents])[0]
         timing["search_ms"] = round((time.time() - search_start) * 1000, 2)
         logger.info(f"Retrieved {len(documents)} documents in {timing['search_ms']}ms")
     except Exception as e:
@@ -198,10 +460,9 @@ def retrieve_documents(
         registry = get_provider_registry()
         client = registry.client
         
-        # Build prompt with documents
-        context = "\n\n".join([f"[{i+1}] {doc.content}" for i, doc in enumerate(documents)])
-        prompt = RAG_PROMPT_TEMPLATE.replace("{% for doc in documents %}\n{{ doc.content }}\n{% endfor %}", context)
-        prompt = prompt.replace("{{ question }}", query)
+        # Build prompt from the chunks that fit the input token budget
+        num_retrieved = len(documents)
+        documents, prompt, prompt_tokens = _pack_prompt(query, documents, provider_name, model)
         
         # Generate answer using aisuite with fallback chain
         answer = None
@@ -262,10 +523,13 @@ def retrieve_documents(
             "documents": documents,
             "answer": answer or "No answer generated",
             "metadata": {
-                "num_documents_retrieved": len(documents),
+                "num_documents_retrieved": num_retrieved,
                 "top_k": top_k,
                 "provider_used": provider_used,
                 "provider_fallback": fallback_occurred,
+                "prompt_tokens": prompt_tokens,
+                "chunks_packed": len(documents),
+                **_embedding_cache_metadata(cache_hit),
                 **timing
             }
         }
@@ -277,17 +541,25 @@ def retrieve_documents(
 def retrieve_documents_streaming(
     query: str,
     top_k: int = None,
-    provider_override: Optional[str] = None
+    provider_override: Optional[str] = None,
+    filters: Optional[Dict[str, Any]] = None,
+    hnsw_ef: Optional[int] = None,
+    exact: Optional[bool] = None
 ) -> Iterator[Dict[str, Any]]:
     """
     Retrieve documents and stream the LLM's answer token by token.
     
-    Uses aisuite with multi-provider support, retry logic, and timing.
+    Uses aisuite with multi-provider support, retry logic, and timing. Search
+    results go through the same MMR selection, neighbour expansion and
+    adjacent-chunk merging as the async path, as configured.
     
     Args:
         query: The user's question
         top_k: Number of documents to retrieve
         provider_override: Optional manual provider selection (openai|anthropic|groq)
+        filters: Metadata filters (see `src.document_stores.filters`)
+        hnsw_ef: HNSW search beam size; higher trades latency for recall (uses settings default if not provided)
+        exact: Exact (brute-force) search; None lets the store decide by collection size and filters
         
     Yields:
         dict: Documents first, then individual answer tokens with timing
@@ -306,9 +578,7 @@ def retrieve_documents_streaming(
     embed_start = time.time()
     
     try:
-        text_embedder = get_text_embedder()
-        embedding_result = _generate_embedding_with_retry(text_embedder, query)
-        query_embedding = embedding_result["embedding"]
+        query_embedding, cache_hit = _embed_query(query)
         timing["embedding_ms"] = round((time.time() - embed_start) * 1000, 2)
         logger.info(f"Embedding generated in {timing['embedding_ms']}ms")
     except Exception as e:
@@ -327,9 +597,15 @@ def retrieve_documents_streaming(
         documents = _search_documents_with_retry(
             document_store,
             query_embedding,
-            top_k,
-            settings.min_similarity_score
+            _fetch_k(top_k),
+            settings.min_similarity_score,
+            filters,
+            hnsw_ef=hnsw_ef,
+            exact=exact,
+            with_vectors=settings.mmr_enabled
         )
+        documents = _diversify(query_embedding, documents, top_k)
+        documents = _expand_neighbours(document_store, [documents])[0]
         timing["search_ms"] = round((time.time() - search_start) * 1000, 2)
         logger.info(f"Retrieved {len(documents)} documents in {timing['search_ms']}ms")
     except Exception as e:
@@ -347,6 +623,7 @@ def retrieve_documents_streaming(
         "metadata": {
             "num_documents_retrieved": len(documents),
             "top_k": top_k,
+            **_embedding_cache_metadata(cache_hit),
             **timing
         }
     }
@@ -363,15 +640,10 @@ def retrieve_documents_streaming(
         registry = get_provider_registry()
         client = registry.client
         
-        # Format documents into context string
-        context = "\n\n".join([
-            f"[{i+1}] {doc.content}"
-            for i, doc in enumerate(documents)
-        ])
-        
-        # Build the prompt
-        prompt = RAG_PROMPT_TEMPLATE.replace("{% for doc in documents %}\n{{ doc.content }}\n{% endfor %}", context)
-        prompt = prompt.replace("{{ question }}", query)
+        # Build the prompt from the chunks that fit the input token budget.
+        # Search results are score-ordered, so packed chunks keep their numbering.
+        packed_documents, prompt, prompt_tokens = _pack_prompt(query, documents, provider_name, model)
+        context_metadata = {"prompt_tokens": prompt_tokens, "chunks_packed": len(packed_documents)}
         
         # Try primary provider with streaming
         provider_used = provider_name
@@ -415,6 +687,7 @@ def retrieve_documents_streaming(
                     "tokens_streamed": token_count,
                     "provider_used": provider_used,
                     "provider_fallback": fallback_occurred,
+                    **context_metadata,
                     **timing
                 }
             }
@@ -471,6 +744,7 @@ def retrieve_documents_streaming(
                             "tokens_streamed": token_count,
                             "provider_used": provider_used,
                             "provider_fallback": fallback_occurred,
+                            **context_metadata,
                             **timing
                         }
                     }
@@ -493,3 +767,1072 @@ def retrieve_documents_streaming(
             "type": "error",
             "error": f"Failed to stream answer: {str(e)}"
         }
+
+
+# -----------------------------------------------------------------------------
+# Async query path
+# -----------------------------------------------------------------------------
+
+def _provider_candidates(router, provider_name: str, model: str) -> Iterator[Tuple[str, str]]:
+    """
+    Yield the selected provider followed by its fallback chain.
+    
+    The fallback chain is resolved lazily, after the primary has been tried,
+    so a primary failure recorded in the registry is reflected in the chain.
+    """
+    yield provider_name, model
+    yield from router.get_fallback_chain(provider_name)
+
+
+def _lookup_cached_answer(
+    query_embedding: List[float],
+    document_store: QdrantDocumentStore,
+    generation: int,
+    cache_params: Tuple,
+) -> Optional[Dict[str, Any]]:
+    """Look up a semantically equivalent cached answer, if the semantic cache is enabled."""
+    if not settings.semantic_cache_enabled:
+        return None
+    return get_semantic_cache().lookup(
+        query_embedding, document_store.collection_name, generation, cache_params
+    )
+
+
+def _store_cached_answer(
+    query_embedding: List[float],
+    document_store: QdrantDocumentStore,
+    generation: int,
+    cache_params: Tuple,
+    answer: str,
+    documents: List[Document],
+    provider_used: str,
+    fallback_occurred: bool,
+) -> None:
+    """Store a generated answer in the semantic cache, if enabled."""
+    if not settings.semantic_cache_enabled or not answer:
+        return
+    get_semantic_cache().put(
+        query_embedding,
+        document_store.collection_name,
+        generation,
+        cache_params,
+        {
+            "answer": answer,
+            "documents": documents,
+            "provider_used": provider_used,
+            "provider_fallback": fallback_occurred,
+        },
+    )
+
+
+def _replay_tokens(answer: str) -> List[str]:
+    """Split a cached answer into word-sized tokens for SSE replay."""
+    return re.findall(r"\s*\S+\s*", answer) or [answer]
+
+
+async def _aembed_query(query: str) -> Tuple[List[float], bool]:
+    """
+    Embed a query without blocking the event loop, consulting the cache first.
+    
+    Returns:
+        Tuple of (embedding, cache_hit)
+    """
+    if not settings.embedding_cache_enabled:
+        embedding_result = await _agenerate_embedding_with_retry(get_text_embedder(), query)
+        return embedding_result["embedding"], False
+    
+    cache = get_embedding_cache()
+    cached = cache.get(settings.active_embedding_model, query)
+    if cached is not None:
+        return cached.tolist(), True
+    
+    embedding_result = await _agenerate_embedding_with_retry(get_text_embedder(), query)
+    cache.put(settings.active_embedding_model, query, embedding_result["embedding"])
+    return embedding_result["embedding"], False
+
+
+async def _agenerate_answer(
+    router,
+    provider_name: str,
+    model: str,
+    messages: List[Dict[str, str]],
+    deadline: Deadline,
+    provider_limits: Optional[Dict[str, asyncio.Semaphore]] = None,
+) -> Tuple[str, str, bool]:
+    """
+    Generate a complete answer with the async provider client and fallback chain.
+    
+    Each attempt is capped at `llm_timeout_seconds` and the request's remaining
+    budget; a provider that times out on its own cap falls through to the next.
+    If `provider_limits` is given, each call holds its provider's semaphore.
+    
+    Returns:
+        Tuple of (answer, provider_used, fallback_occurred)
+        
+    Raises:
+        ExternalServiceError: If every provider in the chain fails
+        DeadlineExceeded: If the request deadline passes during generation
+    """
+    registry = get_provider_registry()
+    client = registry.async_client
+    
+    first_error = None
+    for candidate, candidate_model in _provider_candidates(router, provider_name, model):
+        try:
+            if candidate != provider_name:
+                logger.info(f"Attempting fallback: {candidate}:{candidate_model}")
+            limit = provider_limits[candidate] if provider_limits is not None else contextlib.nullcontext()
+            answer = await deadline.run(
+                "generation", _acomplete(client, limit, candidate, candidate_model, messages, deadline)
+            )
+            registry.record_request_success(candidate)
+            return answer, candidate, candidate != provider_name
+        except DeadlineExceeded:
+            raise
+        except Exception as e:
+            logger.warning(f"Provider {candidate} failed: {e}")
+            registry.record_request_failure(candidate, str(e))
+            first_error = first_error or e
+    
+    raise ExternalServiceError(f"All LLM providers failed. Last error: {first_error}")
+
+
+async def _acomplete(client, limit, provider: str, model: str, messages: List[Dict[str, str]], deadline: Deadline) -> str:
+    """One non-streaming completion, holding `limit` (a provider semaphore or null context) while it runs."""
+    async with limit:
+        return await client.complete(
+            provider,
+            model,
+            messages,
+            temperature=settings.llm_temperature,
+            max_tokens=settings.llm_max_tokens,
+            timeout=_llm_timeout(deadline),
+        )
+
+
+def _llm_timeout(deadline: Deadline) -> float:
+    """Timeout for one LLM call: the per-call cap or the remaining request budget."""
+    return min(settings.llm_timeout_seconds, deadline.remaining())
+
+
+def _build_query_graph(
+    query: str,
+    top_k: int,
+    provider_override: Optional[str],
+    document_store: QdrantDocumentStore,
+    generation: int,
+    cache_params: Tuple,
+    deadline: Deadline,
+    hybrid: bool = False,
+    filters: Optional[Dict[str, Any]] = None,
+    hnsw_ef: Optional[int] = None,
+    exact: Optional[bool] = None,
+) -> StageGraph:
+    """
+    Build the query stages shared by both async entry points.
+    
+    Routing depends only on the query text, so it runs concurrently with
+    embedding and search:
+    
+        embedding -> semantic_cache -> search -> prompt
+        routing --------------------------------^
+    
+    The prompt stage packs chunks into the selected model's input token budget.
+    With `hybrid`, search fuses dense and BM25 keyword rankings (see
+    `QdrantDocumentStore.search`); with `mmr_enabled` it over-fetches and
+    diversifies the candidates. On a semantic cache hit, search and prompt building are skipped. Embedding
+    and search run within the remaining request budget.
+    """
+    async def embed():
+        try:
+            return await deadline.run("embedding", _aembed_query(query))
+        except DeadlineExceeded:
+            raise
+        except Exception as e:
+            logger.error(f"Embedding generation failed after retries: {e}")
+            raise ExternalServiceError(f"Failed to generate embedding: {e}")
+    
+    async def route():
+        try:
+            router = get_router()
+            provider_name, model = router.select_provider(query, provider_override)
+            return router, provider_name, model
+        except Exception as e:
+            logger.error(f"Provider selection failed: {e}")
+            raise ExternalServiceError(f"Failed to select provider: {e}")
+    
+    async def lookup(embedded):
+        query_embedding, _ = embedded
+        return _lookup_cached_answer(query_embedding, document_store, generation, cache_params)
+    
+    async def search(embedded, cached):
+        if cached is not None:
+            return cached["documents"]
+        query_embedding, _ = embedded
+        try:
+            documents = await deadline.run("search", _asearch_documents_with_retry(
+                document_store,
+                query_embedding,
+                _fetch_k(top_k),
+                settings.min_similarity_score,
+                query if hybrid else None,
+                with_vectors=settings.mmr_enabled,
+                filters=filters,
+                hnsw_ef=hnsw_ef,
+                exact=exact
+            ))
+        except DeadlineExceeded:
+            raise
+        except Exception as e:
+            logger.error(f"Document search failed after retries: {e}")
+            raise ExternalServiceError(f"Failed to search documents: {e}")
+        documents = _diversify(query_embedding, documents, top_k)
+        documents = (await _aexpand_neighbours(document_store, [documents], deadline))[0]
+        logger.info(f"Retrieved {len(documents)} documents ({_search_mode(hybrid)} search)")
+        return documents
+    
+    async def prompt(documents, cached, routed):
+        if cached is not None:
+            return {"documents": documents, "messages": None, "prompt_tokens": None}
+        _, provider_name, model = routed
+        packed, prompt_text, prompt_tokens = _pack_prompt(query, documents, provider_name, model)
+        return {
+            "documents": packed,
+            "messages": [{"role": "user", "content": prompt_text}],
+            "prompt_tokens": prompt_tokens,
+        }
+    
+    graph = StageGraph()
+    graph.add("embedding", embed)
+    graph.add("routing", route)
+    graph.add("semantic_cache", lookup, after=["embedding"])
+    graph.add("search", search, after=["embedding", "semantic_cache"])
+    graph.add("prompt", prompt, after=["search", "semantic_cache", "routing"])
+    return graph
+
+
+async def aretrieve_documents(
+    query: str,
+    top_k: int = None,
+    provider_override: Optional[str] = None,
+    timeout_seconds: Optional[float] = None,
+    hybrid: Optional[bool] = None,
+    filters: Optional[Dict[str, Any]] = None,
+    hnsw_ef: Optional[int] = None,
+    exact: Optional[bool] = None
+) -> Dict[str, Any]:
+    """
+    Async variant of `retrieve_documents`.
+    
+    Concurrent identical requests (same query, top_k, provider, search mode,
+    filters and search parameters) share a single pipeline execution when
+    `query_coalescing_enabled` is set. Each caller still waits no longer than
+    its own deadline.
+    
+    Args:
+        query: The user's question
+        top_k: Number of documents to retrieve (uses settings default if not provided)
+        provider_override: Optional manual provider selection (openai|anthropic|groq)
+        timeout_seconds: End-to-end time budget (uses settings default if not provided)
+        hybrid: Fuse dense and BM25 keyword search (uses settings default if not provided)
+        filters: Metadata filters (see `src.document_stores.filters`)
+        hnsw_ef: HNSW search beam size; higher trades latency for recall (uses settings default if not provided)
+        exact: Exact (brute-force) search; None lets the store decide by collection size and filters
+        
+    Returns:
+        dict: Contains retrieved documents and generated answer with timing metadata
+        
+    Raises:
+        ExternalServiceError: If external services fail after retries
+        DeadlineExceeded: If the request runs out of time
+    """
+    if top_k is None:
+        top_k = settings.retrieval_top_k
+    hybrid = _use_hybrid(hybrid)
+    deadline = Deadline(timeout_seconds or settings.request_timeout_seconds)
+    
+    if not settings.query_coalescing_enabled:
+        return await _aretrieve_documents(query, top_k, provider_override, deadline, hybrid, filters, hnsw_ef, exact)
+    
+    key = coalesce_key(query, top_k, provider_override, filters, hybrid, hnsw_ef, exact)
+    flight = _single_flight.do(
+        key, lambda: _aretrieve_documents(query, top_k, provider_override, deadline, hybrid, filters, hnsw_ef, exact)
+    )
+    if key in _single_flight:
+        # Joining another caller's execution, which runs under that caller's
+        # deadline: stop waiting when ours runs out
+        flight = deadline.run("coalesced query", flight)
+    result, shared = await flight
+    if shared:
+        logger.info(f"Coalesced with in-flight query: {query[:100]}")
+    # Callers of a shared execution each get their own top-level dicts
+    return {**result, "metadata": {**result["metadata"], "coalesced": shared}}
+
+
+async def _aretrieve_documents(
+    query: str,
+    top_k: int,
+    provider_override: Optional[str],
+    deadline: Deadline,
+    hybrid: bool = False,
+    filters: Optional[Dict[str, Any]] = None,
+    hnsw_ef: Optional[int] = None,
+    exact: Optional[bool] = None
+) -> Dict[str, Any]:
+    """
+    Run the async retrieval pipeline once (see `aretrieve_documents`).
+    
+    Stages run as a dependency graph (see `_build_query_graph`) with
+    generation as the final stage.
+    """
+    overall_start = time.time()
+    logger.info(f"Starting async retrieval for query: {query[:100]}")
+    
+    document_store = get_document_store()
+    generation = document_store.generation  # snapshot before searching
+    cache_params = (top_k, provider_override, hybrid, filters_key(filters), hnsw_ef, exact)
+    graph = _build_query_graph(
+        query, top_k, provider_override, document_store, generation, cache_params, deadline, hybrid, filters, hnsw_ef, exact
+    )
+    
+    async def generate(prompt, routed, cached):
+        if cached is not None:
+            return cached["answer"], cached["provider_used"], cached["provider_fallback"]
+        router, provider_name, model = routed
+        try:
+            return await _agenerate_answer(router, provider_name, model, prompt["messages"], deadline)
+        except (ExternalServiceError, DeadlineExceeded):
+            raise
+        except Exception as e:
+            logger.error(f"Answer generation failed: {e}")
+            raise ExternalServiceError(f"Failed to generate answer: {e}")
+    
+    graph.add("generation", generate, after=["prompt", "routing", "semantic_cache"])
+    with use_deadline(deadline):
+        try:
+            results = await graph.run()
+        except DeadlineExceeded as e:
+            logger.warning(f"{e} (completed: {graph.timings()})")
+            raise
+    
+    query_embedding, embedding_cache_hit = results["embedding"]
+    cached = results["semantic_cache"]
+    num_retrieved = len(results["search"])
+    documents = results["prompt"]["documents"]
+    answer, provider_used, fallback_occurred = results["generation"]
+    
+    timing = {
+        **graph.timings(),
+        "critical_path_ms": graph.critical_path_ms(),
+        "total_ms": round((time.time() - overall_start) * 1000, 2),
+        "deadline_remaining_ms": round(deadline.remaining() * 1000, 2),
+    }
+    
+    if cached is not None:
+        logger.info(f"Semantic cache hit (distance={cached['distance']}) in {timing['total_ms']}ms")
+    else:
+        logger.info(
+            f"Answer generated by {provider_used} in {timing['generation_ms']}ms "
+            f"(total: {timing['total_ms']}ms, critical path: {timing['critical_path_ms']}ms, "
+            f"fallback: {fallback_occurred})"
+        )
+        _store_cached_answer(
+            query_embedding, document_store, generation, cache_params,
+            answer, documents, provider_used, fallback_occurred,
+        )
+    
+    metadata = {
+        "num_documents_retrieved": num_retrieved,
+        "top_k": top_k,
+        "search_mode": _search_mode(hybrid),
+        "provider_used": provider_used,
+        "provider_fallback": fallback_occurred,
+        "prompt_tokens": results["prompt"]["prompt_tokens"],
+        "chunks_packed": len(documents),
+        "semantic_cache_hit": cached is not None,
+        **_embedding_cache_metadata(embedding_cache_hit),
+        **timing
+    }
+    if cached is not None:
+        metadata["semantic_cache_distance"] = cached["distance"]
+    
+    return {
+        "query": query,
+        "documents": documents,
+        "answer": answer or "No answer generated",
+        "metadata": metadata,
+    }
+
+
+async def aretrieve_documents_streaming(
+    query: str,
+    top_k: int = None,
+    provider_override: Optional[str] = None,
+    timeout_seconds: Optional[float] = None,
+    is_disconnected: Optional[Callable[[], Awaitable[bool]]] = None,
+    hybrid: Optional[bool] = None,
+    filters: Optional[Dict[str, Any]] = None,
+    hnsw_ef: Optional[int] = None,
+    exact: Optional[bool] = None
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Async variant of `retrieve_documents_streaming`.
+    
+    Yields the same event dicts (documents, token, done, error). When
+    `query_coalescing_enabled` is set, concurrent identical requests subscribe
+    to one upstream stream; subscribers that join late receive the buffered
+    events from the start and share the deadline of the request that started it.
+    
+    If the deadline passes, an error event with "timeout": True and the stage
+    is sent; tokens already streamed form a partial answer. If the client
+    disconnects, the stream stops without a done event and the upstream
+    provider stream is closed (once no coalesced subscriber is left).
+    
+    Args:
+        query: The user's question
+        top_k: Number of documents to retrieve
+        provider_override: Optional manual provider selection (openai|anthropic|groq)
+        timeout_seconds: End-to-end time budget (uses settings default if not provided)
+        is_disconnected: Optional async callable reporting client disconnect
+            (e.g. Starlette's `request.is_disconnected`)
+        hybrid: Fuse dense and BM25 keyword search (uses settings default if not provided)
+        filters: Metadata filters (see `src.document_stores.filters`)
+        hnsw_ef: HNSW search beam size; higher trades latency for recall (uses settings default if not provided)
+        exact: Exact (brute-force) search; None lets the store decide by collection size and filters
+        
+    Yields:
+        dict: Documents first, then individual answer tokens with timing
+    """
+    if top_k is None:
+        top_k = settings.retrieval_top_k
+    hybrid = _use_hybrid(hybrid)
+    deadline = Deadline(timeout_seconds or settings.request_timeout_seconds)
+    
+    if settings.query_coalescing_enabled:
+        events = _subscribe_streaming(query, top_k, provider_override, deadline, hybrid, filters, hnsw_ef, exact)
+    else:
+        events = _aretrieve_documents_streaming(query, top_k, provider_override, deadline, hybrid, filters, hnsw_ef, exact)
+    if is_disconnected is not None:
+        events = until_disconnected(events, is_disconnected, settings.sse_disconnect_poll_ms / 1000)
+    
+    try:
+        async for event in events:
+            yield event
+    finally:
+        await events.aclose()
+
+
+async def _subscribe_streaming(
+    query: str,
+    top_k: int,
+    provider_override: Optional[str],
+    deadline: Deadline,
+    hybrid: bool = False,
+    filters: Optional[Dict[str, Any]] = None,
+    hnsw_ef: Optional[int] = None,
+    exact: Optional[bool] = None
+) -> AsyncIterator[Dict[str, Any]]:
+    """Subscribe to the shared stream for an identical in-flight query, starting it if needed."""
+    key = coalesce_key(query, top_k, provider_override, filters, hybrid, hnsw_ef, exact)
+    async for event, shared in _stream_fanout.subscribe(
+        key, lambda: _aretrieve_documents_streaming(query, top_k, provider_override, deadline, hybrid, filters, hnsw_ef, exact)
+    ):
+        if event["type"] == "done":
+            event = {**event, "metadata": {**event["metadata"], "coalesced": shared}}
+        yield event
+
+
+async def _aretrieve_documents_streaming(
+    query: str,
+    top_k: int,
+    provider_override: Optional[str],
+    deadline: Deadline,
+    hybrid: bool = False,
+    filters: Optional[Dict[str, Any]] = None,
+    hnsw_ef: Optional[int] = None,
+    exact: Optional[bool] = None
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Run the async streaming pipeline once (see `aretrieve_documents_streaming`).
+    
+    The retrieval stages run as a dependency graph (see `_build_query_graph`);
+    the answer is then streamed. Closing the generator closes the upstream
+    provider stream.
+    """
+    overall_start = time.time()
+    logger.info(f"Starting async streaming retrieval for query: {query[:100]}")
+    
+    document_store = get_document_store()
+    generation = document_store.generation  # snapshot before searching
+    cache_params = (top_k, provider_override, hybrid, filters_key(filters), hnsw_ef, exact)
+    graph = _build_query_graph(
+        query, top_k, provider_override, document_store, generation, cache_params, deadline, hybrid, filters, hnsw_ef, exact
+    )
+    try:
+        with use_deadline(deadline):
+            results = await graph.run()
+    except ExternalServiceError as e:
+        yield {"type": "error", "error": str(e)}
+        return
+    except DeadlineExceeded as e:
+        logger.warning(f"{e} (completed: {graph.timings()})")
+        yield {"type": "error", "error": str(e), "timeout": True, "stage": e.stage}
+        return
+    
+    query_embedding, embedding_cache_hit = results["embedding"]
+    cached = results["semantic_cache"]
+    documents = results["prompt"]["documents"]
+    messages = results["prompt"]["messages"]
+    prompt_tokens = results["prompt"]["prompt_tokens"]
+    router, provider_name, model = results["routing"]
+    timing = graph.timings()
+    
+    yield {
+        "type": "documents",
+        "data": documents,
+        "metadata": {
+            "num_documents_retrieved": len(results["search"]),
+            "top_k": top_k,
+            "search_mode": _search_mode(hybrid),
+            "chunks_packed": len(documents),
+            "semantic_cache_hit": cached is not None,
+            **_embedding_cache_metadata(embedding_cache_hit),
+            **timing
+        }
+    }
+    
+    # Replay a semantically equivalent cached answer as tokens
+    if cached is not None:
+        logger.info(f"Semantic cache hit (distance={cached['distance']}), replaying answer")
+        tokens = _replay_tokens(cached["answer"])
+        for token in tokens:
+            yield {"type": "token", "data": token}
+        yield {
+            "type": "done",
+            "metadata": {
+                "tokens_streamed": len(tokens),
+                "provider_used": cached["provider_used"],
+                "provider_fallback": cached["provider_fallback"],
+                "semantic_cache_hit": True,
+                "semantic_cache_distance": cached["distance"],
+                **timing,
+                "critical_path_ms": graph.critical_path_ms(),
+                "total_ms": round((time.time() - overall_start) * 1000, 2),
+            }
+        }
+        return
+    
+    gen_start = time.time()
+    try:
+        registry = get_provider_registry()
+        client = registry.async_client
+    except Exception as e:
+        logger.error(f"Streaming generation failed: {e}")
+        yield {"type": "error", "error": f"Failed to stream answer: {str(e)}"}
+        return
+    
+    provider_used = None
+    answer_parts = []
+    first_error = None
+    # Only the primary attempt is hedged; later attempts are plain fallbacks
+    hedge_eligible = settings.llm_hedging_enabled
+    hedge_fired = False
+    hedge_winner = None
+    candidates = _provider_candidates(router, provider_name, model)
+    for candidate, candidate_model in candidates:
+        stream_started = False
+        try:
+            if candidate != provider_name:
+                logger.info(f"Attempting fallback: {candidate}:{candidate_model}")
+            stream_kwargs = {
+                "temperature": settings.llm_temperature,
+                "max_tokens": settings.llm_max_tokens,
+                "timeout": _llm_timeout(deadline),
+            }
+            if hedge_eligible:
+                hedge_eligible = False
+                candidate, candidate_model, first_token, stream, hedge_fired = await deadline.run(
+                    "generation",
+                    open_hedged_stream(
+                        client, registry, (candidate, candidate_model), candidates, messages, **stream_kwargs
+                    ),
+                )
+                hedge_winner = candidate if hedge_fired else None
+            else:
+                first_token, stream = await deadline.run(
+                    "generation",
+                    open_stream(client, registry, candidate, candidate_model, messages, **stream_kwargs),
+                )
+            if first_token:
+                stream_started = True
+                answer_parts.append(first_token)
+                yield {"type": "token", "data": first_token}
+            async for token in deadline.iterate("generation", stream):
+                stream_started = True
+                answer_parts.append(token)
+                yield {"type": "token", "data": token}
+            registry.record_request_success(candidate)
+            provider_used = candidate
+            break
+        except (asyncio.CancelledError, GeneratorExit):
+            # Client went away: the provider was fine, but its stream is being closed
+            registry.record_request_aborted(candidate)
+            raise
+        except DeadlineExceeded as e:
+            logger.warning(f"{e} after {len(answer_parts)} tokens from {candidate}")
+            yield {
+                "type": "error",
+                "error": str(e),
+                "timeout": True,
+                "stage": e.stage,
+                "partial": stream_started,
+            }
+            return
+        except Exception as e:
+            logger.warning(f"Provider {candidate} failed: {e}")
+            registry.record_request_failure(candidate, str(e))
+            # Once tokens have been sent we can't fall back gracefully
+            if stream_started:
+                yield {
+                    "type": "error",
+                    "error": f"Stream interrupted from {candidate}: {str(e)}"
+                }
+                return
+            first_error = first_error or e
+    
+    if provider_used is None:
+        yield {
+            "type": "error",
+            "error": f"All LLM providers failed. Last error: {str(first_error)}"
+        }
+        return
+    
+    timing["generation_ms"] = round((time.time() - gen_start) * 1000, 2)
+    timing["critical_path_ms"] = round(graph.critical_path_ms() + timing["generation_ms"], 2)
+    timing["total_ms"] = round((time.time() - overall_start) * 1000, 2)
+    
+    logger.info(
+        f"Streamed {len(answer_parts)} tokens from {provider_used} in {timing['generation_ms']}ms "
+        f"(total: {timing['total_ms']}ms, critical path: {timing['critical_path_ms']}ms)"
+    )
+    
+    _store_cached_answer(
+        query_embedding, document_store, generation, cache_params,
+        "".join(answer_parts), documents, provider_used, provider_used != provider_name,
+    )
+    
+    yield {
+        "type": "done",
+        "metadata": {
+            "tokens_streamed": len(answer_parts),
+            "provider_used": provider_used,
+            "provider_fallback": provider_used != provider_name,
+            "hedge_fired": hedge_fired,
+            "hedge_winner": hedge_winner,
+            "prompt_tokens": prompt_tokens,
+            "chunks_packed": len(documents),
+            "semantic_cache_hit": False,
+            **timing
+        }
+    }
+
+
+# -----------------------------------------------------------------------------
+# Batch query path
+# -----------------------------------------------------------------------------
+
+async def _aembed_queries(queries: List[str]) -> Tuple[List[List[float]], List[bool]]:
+    """
+    Embed many queries, sending every cache miss in one embedder call
+    (split into `embedding_batch_size` requests that run concurrently).
+    
+    Returns:
+        Tuple of (embeddings, cache_hits), both in input order
+    """
+    cache = get_embedding_cache() if settings.embedding_cache_enabled else None
+    embeddings: List[Optional[List[float]]] = [None] * len(queries)
+    cache_hits = [False] * len(queries)
+    
+    if cache is not None:
+        for i, query in enumerate(queries):
+            cached = cache.get(settings.active_embedding_model, query)
+            if cached is not None:
+                embeddings[i] = cached.tolist()
+                cache_hits[i] = True
+    
+    missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+    if missing:
+        # Embed each distinct text once
+        texts = list(dict.fromkeys(queries[i] for i in missing))
+        vectors = dict(zip(texts, await _agenerate_embeddings_batch_with_retry(get_text_embedder(), texts)))
+        for i in missing:
+            embeddings[i] = vectors[queries[i]]
+        if cache is not None:
+            for text, vector in vectors.items():
+                cache.put(settings.active_embedding_model, text, vector)
+    
+    return embeddings, cache_hits
+
+
+async def _aanswer_batch_item(
+    query: str,
+    query_embedding: List[float],
+    embedding_cache_hit: bool,
+    documents: List[Document],
+    top_k: int,
+    provider_override: Optional[str],
+    document_store: QdrantDocumentStore,
+    generation: int,
+    provider_limits: Dict[str, asyncio.Semaphore],
+    deadline: Deadline,
+    hybrid: bool = False,
+    filters: Optional[Dict[str, Any]] = None,
+    hnsw_ef: Optional[int] = None,
+    exact: Optional[bool] = None,
+) -> Dict[str, Any]:
+    """Generate the answer for one batch item; failures become a per-item error."""
+    cache_params = (top_k, provider_override, hybrid, filters_key(filters), hnsw_ef, exact)
+    try:
+        cached = _lookup_cached_answer(query_embedding, document_store, generation, cache_params)
+        if cached is not None:
+            return {
+                "query": query,
+                "documents": cached["documents"],
+                "answer": cached["answer"],
+                "metadata": {
+                    "num_documents_retrieved": len(documents),
+                    "provider_used": cached["provider_used"],
+                    "provider_fallback": cached["provider_fallback"],
+                    "semantic_cache_hit": True,
+                    "semantic_cache_distance": cached["distance"],
+                    "embedding_cache_hit": embedding_cache_hit,
+                },
+            }
+        
+        router = get_router()
+        provider_name, model = router.select_provider(query, provider_override)
+        packed, prompt, prompt_tokens = _pack_prompt(query, documents, provider_name, model)
+        answer, provider_used, fallback_occurred = await _agenerate_answer(
+            router,
+            provider_name,
+            model,
+            [{"role": "user", "content": prompt}],
+            deadline,
+            provider_limits=provider_limits,
+        )
+        _store_cached_answer(
+            query_embedding, document_store, generation, cache_params,
+            answer, packed, provider_used, fallback_occurred,
+        )
+        return {
+            "query": query,
+            "documents": packed,
+            "answer": answer or "No answer generated",
+            "metadata": {
+                "num_documents_retrieved": len(documents),
+                "provider_used": provider_used,
+                "provider_fallback": fallback_occurred,
+                "prompt_tokens": prompt_tokens,
+                "chunks_packed": len(packed),
+                "semantic_cache_hit": False,
+                "embedding_cache_hit": embedding_cache_hit,
+            },
+        }
+    except Exception as e:
+        logger.warning(f"Batch query failed: {query[:100]}: {e}")
+        return {"query": query, "error": str(e)}
+
+
+async def retrieve_documents_batch(
+    queries: List[str],
+    top_k: int = None,
+    provider_override: Optional[str] = None,
+    timeout_seconds: Optional[float] = None,
+    hybrid: Optional[bool] = None,
+    filters: Optional[Dict[str, Any]] = None,
+    hnsw_ef: Optional[int] = None,
+    exact: Optional[bool] = None
+) -> Dict[str, Any]:
+    """
+    Answer many queries with one embedding request and one Qdrant batch search.
+    
+    Answers are then generated concurrently, with at most
+    `batch_max_concurrency_per_provider` in-flight LLM calls per provider.
+    Embedding or search failures fail the whole batch; anything after that
+    (routing, generation, the deadline running out) fails only its item.
+    
+    Args:
+        queries: The user's questions
+        top_k: Number of documents to retrieve per query (uses settings default if not provided)
+        provider_override: Optional manual provider selection (openai|anthropic|groq)
+        timeout_seconds: Deadline for the whole batch (uses settings default if not provided)
+        hybrid: Fuse dense and BM25 keyword search (uses settings default if not provided)
+        filters: Metadata filters applied to every query (see `src.document_stores.filters`)
+        hnsw_ef: HNSW search beam size; higher trades latency for recall (uses settings default if not provided)
+        exact: Exact (brute-force) search; None lets the store decide by collection size and filters
+        
+    Returns:
+        dict: "results" in input order (each with documents, answer and metadata,
+        or an "error"), and batch-level "metadata" with timing
+        
+    Raises:
+        ExternalServiceError: If embedding or search fails after retries
+        DeadlineExceeded: If the deadline passes before search completes
+    """
+    if top_k is None:
+        top_k = settings.retrieval_top_k
+    hybrid = _use_hybrid(hybrid)
+    deadline = Deadline(timeout_seconds or settings.batch_timeout_seconds)
+    overall_start = time.time()
+    timing = {}
+    
+    results: List[Optional[Dict[str, Any]]] = [None] * len(queries)
+    pending = []
+    for i, query in enumerate(queries):
+        if query.strip():
+            pending.append(i)
+        else:
+            results[i] = {"query": query, "error": "Query cannot be empty"}
+    
+    logger.info(f"Starting batch retrieval for {len(pending)} queries")
+    if pending:
+        document_store = get_document_store()
+        generation = document_store.generation  # snapshot before searching
+        texts = [queries[i] for i in pending]
+        
+        with use_deadline(deadline):
+            embed_start = time.time()
+            try:
+                embeddings, cache_hits = await deadline.run("embedding", _aembed_queries(texts))
+            except DeadlineExceeded:
+                raise
+            except Exception as e:
+                logger.error(f"Batch embedding failed after retries: {e}")
+                raise ExternalServiceError(f"Failed to generate embeddings: {e}")
+            timing["embedding_ms"] = round((time.time() - embed_start) * 1000, 2)
+            
+            search_start = time.time()
+            try:
+                searched = await deadline.run("search", _asearch_documents_batch_with_retry(
+                    document_store,
+                    embeddings,
+                    _fetch_k(top_k),
+                    settings.min_similarity_score,
+                    texts if hybrid else None,
+                    with_vectors=settings.mmr_enabled,
+                    filters=filters,
+                    hnsw_ef=hnsw_ef,
+                    exact=exact
+                ))
+                searched = [
+                    _diversify(embedding, documents, top_k)
+                    for embedding, documents in zip(embeddings, searched)
+                ]
+                searched = await _aexpand_neighbours(document_store, searched, deadline)
+            except DeadlineExceeded:
+                raise
+            except Exception as e:
+                logger.error(f"Batch search failed after retries: {e}")
+                raise ExternalServiceError(f"Failed to search documents: {e}")
+            timing["search_ms"] = round((time.time() - search_start) * 1000, 2)
+            
+            gen_start = time.time()
+            provider_limits = defaultdict(
+                lambda: asyncio.Semaphore(settings.batch_max_concurrency_per_provider)
+            )
+            answers = await asyncio.gather(*(
+                _aanswer_batch_item(
+                    text, embedding, cache_hit, documents, top_k, provider_override,
+                    document_store, generation, provider_limits, deadline, hybrid, filters, hnsw_ef, exact,
+                )
+                for text, embedding, cache_hit, documents in zip(texts, embeddings, cache_hits, searched)
+            ))
+            timing["generation_ms"] = round((time.time() - gen_start) * 1000, 2)
+        
+        for i, answer in zip(pending, answers):
+            results[i] = answer
+    
+    timing["total_ms"] = round((time.time() - overall_start) * 1000, 2)
+    num_failed = sum(1 for result in results if "error" in result)
+    logger.info(
+        f"Batch of {len(queries)} queries answered in {timing['total_ms']}ms ({num_failed} failed)"
+    )
+    
+    return {
+        "results": results,
+        "metadata": {
+            "num_queries": len(queries),
+            "num_failed": num_failed,
+            "top_k": top_k,
+            "search_mode": _search_mode(hybrid),
+            **timing
+        }
+    }
+
+
+# -----------------------------------------------------------------------------
+# Retrieval-only path
+# -----------------------------------------------------------------------------
+# These entry points stop after search: they never touch the provider router
+# or registry, so their latency is embedding plus search.
+
+def _chunks_result(
+    query: str,
+    documents: List[Document],
+    top_k: int,
+    cache_hit: bool,
+    timing: Dict[str, float],
+    hybrid: bool,
+) -> Dict[str, Any]:
+    """Build the retrieval-only response dict."""
+    return {
+        "query": query,
+        "documents": documents,
+        "metadata": {
+            "num_documents_retrieved": len(documents),
+            "top_k": top_k,
+            "search_mode": _search_mode(hybrid),
+            **_embedding_cache_metadata(cache_hit),
+            **timing
+        }
+    }
+
+
+def retrieve_chunks(
+    query: str,
+    top_k: int = None,
+    with_vectors: bool = False,
+    hybrid: Optional[bool] = None,
+    filters: Optional[Dict[str, Any]] = None,
+    hnsw_ef: Optional[int] = None,
+    exact: Optional[bool] = None
+) -> Dict[str, Any]:
+    """
+    Retrieve scored chunks for a query without generating an answer.
+    
+    Args:
+        query: The user's question
+        top_k: Number of documents to retrieve (uses settings default if not provided)
+        with_vectors: Include stored chunk vectors (as Document.embedding)
+        hybrid: Fuse dense and BM25 keyword search (uses settings default if not provided)
+        filters: Metadata filters (see `src.document_stores.filters`)
+        hnsw_ef: HNSW search beam size; higher trades latency for recall (uses settings default if not provided)
+        exact: Exact (brute-force) search; None lets the store decide by collection size and filters
+        
+    Returns:
+        dict: Contains retrieved documents with scores, metadata and IDs, plus timing metadata
+        
+    Raises:
+        ExternalServiceError: If embedding or search fails after retries
+    """
+    if top_k is None:
+        top_k = settings.retrieval_top_k
+    hybrid = _use_hybrid(hybrid)
+    
+    timing = {}
+    overall_start = time.time()
+    
+    try:
+        query_embedding, cache_hit = _embed_query(query)
+    except Exception as e:
+        logger.error(f"Embedding generation failed after retries: {e}")
+        raise ExternalServiceError(f"Failed to generate embedding: {e}")
+    timing["embedding_ms"] = round((time.time() - overall_start) * 1000, 2)
+    
+    search_start = time.time()
+    try:
+        documents = get_document_store().search(
+            query_embedding=query_embedding,
+            top_k=_fetch_k(top_k),
+            score_threshold=settings.min_similarity_score,
+            with_vectors=with_vectors or settings.mmr_enabled,
+            query_text=query if hybrid else None,
+            filters=filters,
+            hnsw_ef=hnsw_ef,
+            exact=exact,
+        )
+        documents = _diversify(query_embedding, documents, top_k, keep_vectors=with_vectors)
+    except Exception as e:
+        logger.error(f"Document search failed: {e}")
+        raise ExternalServiceError(f"Failed to search documents: {e}")
+    timing["search_ms"] = round((time.time() - search_start) * 1000, 2)
+    timing["total_ms"] = round((time.time() - overall_start) * 1000, 2)
+    
+    return _chunks_result(query, documents, top_k, cache_hit, timing, hybrid)
+
+
+async def aretrieve_chunks(
+    query: str,
+    top_k: int = None,
+    with_vectors: bool = False,
+    timeout_seconds: Optional[float] = None,
+    hybrid: Optional[bool] = None,
+    filters: Optional[Dict[str, Any]] = None,
+    hnsw_ef: Optional[int] = None,
+    exact: Optional[bool] = None
+) -> Dict[str, Any]:
+    """
+    Async variant of `retrieve_chunks`.
+    
+    Args:
+        query: The user's question
+        top_k: Number of documents to retrieve (uses settings default if not provided)
+        with_vectors: Include stored chunk vectors (as Document.embedding)
+        timeout_seconds: End-to-end time budget (uses settings default if not provided)
+        hybrid: Fuse dense and BM25 keyword search (uses settings default if not provided)
+        filters: Metadata filters (see `src.document_stores.filters`)
+        hnsw_ef: HNSW search beam size; higher trades latency for recall (uses settings default if not provided)
+        exact: Exact (brute-force) search; None lets the store decide by collection size and filters
+        
+    Returns:
+        dict: Contains retrieved documents with scores, metadata and IDs, plus timing metadata
+        
+    Raises:
+        ExternalServiceError: If embedding or search fails after retries
+        DeadlineExceeded: If the request runs out of time
+    """
+    if top_k is None:
+        top_k = settings.retrieval_top_k
+    hybrid = _use_hybrid(hybrid)
+    deadline = Deadline(timeout_seconds or settings.request_timeout_seconds)
+    
+    timing = {}
+    overall_start = time.time()
+    
+    with use_deadline(deadline):
+        try:
+            query_embedding, cache_hit = await deadline.run("embedding", _aembed_query(query))
+        except DeadlineExceeded:
+            raise
+        except Exception as e:
+            logger.error(f"Embedding generation failed after retries: {e}")
+            raise ExternalServiceError(f"Failed to generate embedding: {e}")
+        timing["embedding_ms"] = round((time.time() - overall_start) * 1000, 2)
+        
+        search_start = time.time()
+        try:
+            documents = await deadline.run("search", get_document_store().search_async(
+                query_embedding=query_embedding,
+                top_k=_fetch_k(top_k),
+                score_threshold=settings.min_similarity_score,
+                with_vectors=with_vectors or settings.mmr_enabled,
+                query_text=query if hybrid else None,
+                filters=filters,
+                hnsw_ef=hnsw_ef,
+                exact=exact,
+            ))
+            documents = _diversify(query_embedding, documents, top_k, keep_vectors=with_vectors)
+        except DeadlineExceeded:
+            raise
+        except Exception as e:
+            logger.error(f"Document search failed: {e}")
+            raise ExternalServiceError(f"Failed to search documents: {e}")
+        timing["search_ms"] = round((time.time() - search_start) * 1000, 2)
+    
+    timing["total_ms"] = round((time.time() - overall_start) * 1000, 2)
+    logger.info(
+        f"Retrieved {len(documents)} chunks in {timing['total_ms']}ms "
+        f"(retrieval only, {_search_mode(hybrid)} search: {timing['search_ms']}ms)"
+    )
+    
+    return _chunks_result(query, documents, top_k, cache_hit, timing, hybrid)
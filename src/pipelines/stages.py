@@ -0,0 +1,98 @@
+"""
+Stage Graph
+
+Minimal async dependency-graph runner for the query pipeline. Stages whose
+inputs are ready run concurrently (e.g. provider routing while the query is
+being embedded), and per-stage durations plus the critical path are recorded
+for response metadata.
+"""
+
+from typing import Any, Awaitable, Callable, Dict, Sequence, Tuple
+import asyncio
+import time
+
+
+class StageGraph:
+    """
+    Run async stages as a dependency graph.
+
+    Each stage is an async callable receiving the results of the stages it
+    depends on, in the order they were declared. Stages must be added after
+    their dependencies. If any stage fails, the remaining stages are cancelled
+    and the first error is raised.
+
+    Example:
+        graph = StageGraph()
+        graph.add("embedding", embed)
+        graph.add("routing", route)
+        graph.add("search", search, after=["embedding"])
+        graph.add("generation", generate, after=["search", "routing"])
+        results = await graph.run()
+    """
+
+    def __init__(self):
+        self._stages: Dict[str, Tuple[Callable[..., Awaitable[Any]], Tuple[str, ...]]] = {}
+        self.durations_ms: Dict[str, float] = {}
+
+    def add(
+        self,
+        name: str,
+        fn: Callable[..., Awaitable[Any]],
+        after: Sequence[str] = (),
+    ) -> "StageGraph":
+        """
+        Add a stage.
+
+        Args:
+            name: Stage name (also used for the "<name>_ms" timing key)
+            fn: Async callable taking the results of `after` as positional arguments
+            after: Names of stages this stage depends on
+        """
+        for dependency in after:
+            if dependency not in self._stages:
+                raise ValueError(f"Stage '{name}' depends on unknown stage '{dependency}'")
+        self._stages[name] = (fn, tuple(after))
+        return self
+
+    async def run(self) -> Dict[str, Any]:
+        """
+        Run all stages, starting each as soon as its dependencies complete.
+
+        Returns:
+            Mapping of stage name to result
+        """
+        tasks: Dict[str, asyncio.Task] = {}
+
+        async def run_stage(name: str) -> Any:
+            fn, dependencies = self._stages[name]
+            args = [await tasks[dependency] for dependency in dependencies]
+            start = time.perf_counter()
+            try:
+                return await fn(*args)
+            finally:
+                self.durations_ms[name] = round((time.perf_counter() - start) * 1000, 2)
+
+        for name in self._stages:
+            tasks[name] = asyncio.ensure_future(run_stage(name))
+
+        try:
+            await asyncio.gather(*tasks.values())
+        except BaseException:
+            for task in tasks.values():
+                task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+            raise
+
+        return {name: task.result() for name, task in tasks.items()}
+
+    def timings(self) -> Dict[str, float]:
+        """Per-stage durations keyed as "<stage>_ms"."""
+        return {f"{name}_ms": duration for name, duration in self.durations_ms.items()}
+
+    def critical_path_ms(self) -> float:
+        """Longest chain of dependent stage durations."""
+        path_ms: Dict[str, float] = {}
+        for name, (_, dependencies) in self._stages.items():
+            longest_dependency = max((path_ms[d] for d in dependencies), default=0.0)
+            path_ms[name] = self.durations_ms.get(name, 0.0) + longest_dependency
+        return round(max(path_ms.values(), default=0.0), 2)
@@ -0,0 +1,126 @@
+"""
+Standalone Ingestion Worker
+
+Drains the ingestion job queue outside the API process, so ingestion scales
+separately from query serving:
+
+    python -m src.pipelines.worker --concurrency 4 --extract-processes 4
+
+Text extraction (PDF, DOCX, ...) runs in a process pool so it does not hold
+the GIL; chunking, embedding and writing run on worker threads with pooled
+indexing pipelines, as in the API. Any number of workers can share a queue
+file: each job is leased to one worker at a time (see `src.pipelines.jobs`).
+By default the queue is single-host (SQLite WAL). Workers on several hosts
+need the file on a network filesystem with reliable POSIX locks and
+INGESTION_QUEUE_SHARED_FILESYSTEM=true in every process, API included. Set
+INGESTION_WORKERS_IN_API=false to leave all ingestion to standalone workers.
+
+SIGINT/SIGTERM stop claiming new jobs and exit once running ones finish.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Optional
+import argparse
+import logging
+import multiprocessing
+import os
+import signal
+import threading
+from src.config.settings import settings
+from src.document_processing.extractor import extract_text
+from src.document_stores.store import get_document_store
+from src.middleware.logging import configure_logging
+from src.pipelines.jobs import IngestionWorkers, JobQueue
+
+logger = logging.getLogger(__name__)
+
+
+class ExtractionPool:
+    """
+    Process pool running `extract_text`, replaced when one of its processes dies.
+
+    A crashed process (a parser segfault, the OOM killer) breaks a
+    `ProcessPoolExecutor` for good. The call that hits it still fails, so its
+    job is retried, but the next call gets a fresh pool.
+    """
+
+    def __init__(self, processes: int):
+        self.processes = processes
+        self._lock = threading.Lock()
+        self._pool = self._create()
+
+    def _create(self) -> ProcessPoolExecutor:
+        # Spawned (not forked) extraction processes: the parent runs threads
+        return ProcessPoolExecutor(self.processes, mp_context=multiprocessing.get_context("spawn"))
+
+    def __call__(self, payload: bytes, extension: str) -> str:
+        pool = self._pool
+        try:
+            return pool.submit(extract_text, payload, extension).result()
+        except BrokenProcessPool:
+            self._replace(pool)
+            raise
+
+    def _replace(self, broken: ProcessPoolExecutor) -> None:
+        with self._lock:
+            if self._pool is broken:
+                logger.error("An extraction process died; starting a new extraction pool")
+                broken.shutdown(wait=False, cancel_futures=True)
+                self._pool = self._create()
+
+    def shutdown(self) -> None:
+        self._pool.shutdown()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Process ingestion jobs from the durable job queue.")
+    parser.add_argument("--queue", default=settings.ingestion_queue_path, help="SQLite queue file")
+    parser.add_argument(
+        "--concurrency", type=int, default=settings.ingestion_concurrency, help="Jobs processed at once"
+    )
+    parser.add_argument(
+        "--extract-processes",
+        type=int,
+        default=settings.ingestion_extract_processes,
+        help="Text extraction processes",
+    )
+    parser.add_argument("--drain", action="store_true", help="Exit once no job is available")
+    args = parser.parse_args(argv)
+
+    configure_logging(
+        log_level=os.getenv("LOG_LEVEL", "INFO"),
+        json_logs=os.getenv("JSON_LOGS", "false").lower() == "true"
+    )
+    # Fail before claiming jobs if Qdrant is unreachable or the collection dimension mismatches
+    get_document_store()
+    # One warm indexing pipeline per worker thread
+    settings.indexing_pipeline_pool_size = max(settings.indexing_pipeline_pool_size, args.concurrency)
+
+    queue = JobQueue(args.queue)
+    pool = ExtractionPool(args.extract_processes)
+    try:
+        workers = IngestionWorkers(
+            queue,
+            args.concurrency,
+            extract=pool,
+            exit_when_idle=args.drain,
+        )
+
+        def shutdown(signum, frame):
+            logger.info(f"Received {signal.Signals(signum).name}; finishing running jobs")
+            workers.stop(timeout=0)
+
+        signal.signal(signal.SIGINT, shutdown)
+        signal.signal(signal.SIGTERM, shutdown)
+
+        workers.start()
+        workers.join()
+    finally:
+        pool.shutdown()
+    logger.info("Ingestion worker stopped")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
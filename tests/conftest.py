@@ -5,10 +5,19 @@ Provides mocked LLM providers and other test utilities.
 """
 
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import AsyncMock, Mock, patch, MagicMock
 from typing import Iterator
 
 
+@pytest.fixture(autouse=True)
+def reset_retrieval_caches():
+    """Start every test with empty in-process retrieval caches."""
+    from src.pipelines.cache import reset_caches
+    reset_caches()
+    yield
+    reset_caches()
+
+
 @pytest.fixture
 def mock_aisuite_client():
     """Mock aisuite client for LLM calls."""
@@ -63,6 +72,16 @@ def mock_provider_registry():
         mock_client.chat.completions.create.return_value = mock_response
         
         mock_registry.client = mock_client
+        
+        # Async client used by the asyncio query path
+        async def mock_async_stream(*args, **kwargs):
+            for token in ["Mocked ", "AI ", "response."]:
+                yield token
+        
+        mock_async_client = Mock()
+        mock_async_client.complete = AsyncMock(return_value="Mocked AI response.")
+        mock_async_client.stream = Mock(side_effect=mock_async_stream)
+        mock_registry.async_client = mock_async_client
         mock_registry.record_request_success = Mock()
         mock_registry.record_request_failure = Mock()
         mock_registry.get_all_health.return_value = {
@@ -93,10 +112,13 @@ def mock_llm_components(mock_provider_registry, mock_router):
     """Convenience fixture that mocks all LLM components at once."""
     # Also mock the retrieval functions to avoid real LLM calls
     with patch('src.pipelines.retrieval._generate_embedding_with_retry') as mock_embed, \
-         patch('src.pipelines.retrieval._search_documents_with_retry') as mock_search:
+         patch('src.pipelines.retrieval._search_documents_with_retry') as mock_search, \
+         patch('src.pipelines.retrieval._agenerate_embedding_with_retry', new_callable=AsyncMock) as mock_aembed, \
+         patch('src.pipelines.retrieval._asearch_documents_with_retry', new_callable=AsyncMock) as mock_asearch:
         
         # Mock embedding with retry
         mock_embed.return_value = {"embedding": [0.1] * 1536}
+        mock_aembed.return_value = {"embedding": [0.1] * 1536}
         
         # Mock search with sample documents
         from haystack.dataclasses import Document
@@ -105,12 +127,15 @@ def mock_llm_components(mock_provider_registry, mock_router):
             Document(content="It combines information retrieval with language models.", score=0.87),
             Document(content="This improves accuracy and reduces hallucinations.", score=0.82)
         ]
+        mock_asearch.return_value = mock_search.return_value
         
         yield {
             "registry": mock_provider_registry,
             "router": mock_router,
             "embed": mock_embed,
-            "search": mock_search
+            "search": mock_search,
+            "aembed": mock_aembed,
+            "asearch": mock_asearch,
         }
 
 
@@ -146,5 +171,27 @@ def mock_document_store(sample_documents):
         mock_store_instance.search.return_value = sample_documents
         mock_store_instance.count_documents.return_value = len(sample_documents)
         mock_store_instance.collection_name = "test_collection"
+        mock_store_instance.generation = 0
         mock_get_store.return_value = mock_store_instance
         yield mock_store_instance
+
+
+@pytest.fixture
+def indexing_store():
+    """In-process Qdrant store behind the indexing pipelines, with a stub 2-dim embedder."""
+    from qdrant_client import QdrantClient
+    from src.config.settings import settings
+    from src.document_stores.store import QdrantDocumentStore
+    from src.pipelines import indexing
+    
+    with patch('src.document_stores.store.QdrantClient', lambda **kwargs: QdrantClient(":memory:")), \
+         patch.object(settings, "qdrant_payload_indexes", []):
+        store = QdrantDocumentStore(collection_name=settings.qdrant_collection_name, embedding_dimension=2)
+    embedder = Mock()
+    embedder.embed.side_effect = lambda texts: [[1.0, float(i)] for i in range(len(texts))]
+    indexing.reset_indexing_pipelines()
+    with patch.object(indexing, "get_document_store", return_value=store), \
+         patch.object(settings, "embedding_dimension", 2), \
+         patch('src.embeddings.components.get_embedder', return_value=embedder):
+        yield store
+    indexing.reset_indexing_pipelines()
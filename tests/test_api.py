@@ -96,4 +96,28 @@ def test_query_response_structure(check_prerequisites, mock_llm_components, mock
         doc = data["documents"][0]
         assert "content" in doc, "Document should have 'content' field"
         assert "score" in doc, "Document should have 'score' field"
-        assert isinstance(doc["score"], (int, float)), "Score should be numeric"
\ No newline at end of file
+        assert isinstance(doc["score"], (int, float)), "Score should be numeric"
+
+def test_query_batch_endpoint(check_prerequisites):
+    """Test batch query returns one result per query in request order."""
+    queries = ["What is RAG?", "", "How does retrieval work?"]
+    response = client.post("/query/batch", json={"queries": queries, "top_k": 3})
+    assert response.status_code == 200, f"Expected 200, got {response.status_code}: {response.json()}"
+    
+    data = response.json()
+    assert [item["query"] for item in data["results"]] == queries, "Results should keep request order"
+    assert data["results"][1]["error"], "Empty query should fail on its own"
+    assert data["metadata"]["num_queries"] == 3
+
+
+def test_retrieve_endpoint(check_prerequisites):
+    """Test retrieval-only endpoint returns chunks without an answer."""
+    response = client.post("/retrieve", json={"query": "What is RAG?", "top_k": 3, "with_vectors": True})
+    assert response.status_code == 200, f"Expected 200, got {response.status_code}: {response.json()}"
+    
+    data = response.json()
+    assert "answer" not in data, "Retrieve should not generate an answer"
+    assert len(data["documents"]) <= 3, "Should return at most 3 chunks"
+    for chunk in data["documents"]:
+        assert "id" in chunk and "score" in chunk and "metadata" in chunk
+        assert isinstance(chunk["vector"], list), "Vectors should be included when requested"
@@ -0,0 +1,116 @@
+"""
+Tests for Batch Queries
+
+Tests the batch query path: one embeddings request, one Qdrant batch search,
+and concurrent generation under a per-provider concurrency cap.
+"""
+
+import asyncio
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock, patch
+from haystack.dataclasses import Document
+from src.config.settings import settings
+from src.embeddings.openai_embedder import OpenAIEmbedder
+from src.pipelines.retrieval import (
+    _agenerate_embeddings_batch_with_retry,
+    retrieve_documents_batch,
+)
+
+
+@pytest.fixture
+def mock_batch_components(mock_llm_components, mock_embedder, mock_document_store):
+    """Mock the batch embedding and batch search calls."""
+    async def embed_batch(text_embedder, texts):
+        return [[float(len(text)), 1.0] for text in texts]
+
+    async def search_batch(document_store, query_embeddings, top_k, score_threshold, query_texts=None, **kwargs):
+        return [
+            [Document(content=f"Chunk for vector {embedding[0]:.0f}", score=0.9)]
+            for embedding in query_embeddings
+        ]
+
+    with patch('src.pipelines.retrieval._agenerate_embeddings_batch_with_retry',
+               new_callable=AsyncMock, side_effect=embed_batch) as mock_embed_batch, \
+         patch('src.pipelines.retrieval._asearch_documents_batch_with_retry',
+               new_callable=AsyncMock, side_effect=search_batch) as mock_search_batch:
+        yield {
+            **mock_llm_components,
+            "embed_batch": mock_embed_batch,
+            "search_batch": mock_search_batch,
+        }
+
+
+async def test_batch_order_and_per_item_errors(mock_batch_components):
+    """Test that results keep input order and failures stay per item."""
+    complete = mock_batch_components["registry"].async_client.complete
+
+    async def answer(provider, model, messages, **kwargs):
+        if "fail me" in messages[0]["content"]:
+            raise RuntimeError("provider down")
+        return f"Answer from {provider}"
+
+    complete.side_effect = answer
+    result = await retrieve_documents_batch(["What is RAG?", "   ", "fail me", "What is MMR?"])
+
+    items = result["results"]
+    assert [item["query"] for item in items] == ["What is RAG?", "   ", "fail me", "What is MMR?"]
+    assert items[0]["answer"] == "Answer from openai"
+    assert items[1]["error"] == "Query cannot be empty"
+    assert "All LLM providers failed" in items[2]["error"]
+    assert items[3]["answer"] == "Answer from openai"
+    assert result["metadata"]["num_failed"] == 2
+
+    # One embeddings request and one batch search for all non-empty queries
+    mock_batch_components["embed_batch"].assert_awaited_once()
+    assert mock_batch_components["embed_batch"].await_args.args[1] == ["What is RAG?", "fail me", "What is MMR?"]
+    mock_batch_components["search_batch"].assert_awaited_once()
+
+
+async def test_batch_per_provider_concurrency_cap(mock_batch_components):
+    """Test that in-flight LLM calls per provider never exceed the cap."""
+    in_flight = 0
+    peak = 0
+
+    async def slow_answer(*args, **kwargs):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return "ok"
+
+    mock_batch_components["registry"].async_client.complete.side_effect = slow_answer
+    with patch.object(settings, "batch_max_concurrency_per_provider", 2):
+        result = await retrieve_documents_batch([f"Question {i}?" for i in range(8)])
+
+    assert result["metadata"]["num_failed"] == 0
+    assert peak == 2
+
+
+async def test_batch_uses_embedding_cache(mock_batch_components):
+    """Test that cached queries are not re-embedded and duplicates are embedded once."""
+    await retrieve_documents_batch(["What is RAG?", "What is RAG?"])
+    assert mock_batch_components["embed_batch"].await_args.args[1] == ["What is RAG?"]
+
+    result = await retrieve_documents_batch(["What is RAG?", "What is BM25?"])
+    assert mock_batch_components["embed_batch"].await_args.args[1] == ["What is BM25?"]
+    assert [item["metadata"]["embedding_cache_hit"] for item in result["results"]] == [True, False]
+
+
+async def test_embeddings_batch_single_request():
+    """Test that all texts go out in one embeddings request and come back in order."""
+    response = SimpleNamespace(data=[
+        SimpleNamespace(index=1, embedding=[0.2]),
+        SimpleNamespace(index=0, embedding=[0.1]),
+    ])
+    embedder = OpenAIEmbedder(model="text-embedding-3-small", api_key="sk-test")
+    embedder.async_client = Mock()
+    embedder.async_client.embeddings.create = AsyncMock(return_value=response)
+
+    embeddings = await _agenerate_embeddings_batch_with_retry(embedder, ["first", "second"])
+
+    assert embeddings == [[0.1], [0.2]]
+    embedder.async_client.embeddings.create.assert_awaited_once_with(
+        model="text-embedding-3-small", input=["first", "second"]
+    )
@@ -0,0 +1,168 @@
+"""
+Tests for Bulk Writes
+
+Tests the columnar write path: batching, parallel non-blocking upserts with a
+final waiting upsert, validation of embeddings, and bulk loads that suspend
+HNSW indexing.
+"""
+
+import threading
+import pytest
+from unittest.mock import Mock, patch
+from haystack.dataclasses import Document
+from qdrant_client import QdrantClient
+from qdrant_client.models import Batch, CollectionStatus
+from src.config.settings import settings
+from src.document_stores import store as store_module
+from src.document_stores.store import QdrantDocumentStore, SPARSE_VECTOR_NAME, _point_id
+
+
+def _docs(n, dim=2):
+    return [Document(id=f"doc{i}", content=f"chunk {i}", embedding=[float(i)] + [0.5] * (dim - 1)) for i in range(n)]
+
+
+def _remote_store(client):
+    client.get_collections.return_value.collections = []
+    with patch('src.document_stores.store.QdrantClient', return_value=client), \
+         patch.object(settings, "qdrant_payload_indexes", []):
+        return QdrantDocumentStore(collection_name="bulk", embedding_dimension=2)
+
+
+def test_parallel_batches_then_barrier():
+    """Test that all but the last batch are non-blocking and run in parallel, and the last one waits."""
+    client = Mock()
+    store = _remote_store(client)
+    threads = set()
+    client.upsert.side_effect = lambda **kwargs: threads.add(threading.current_thread().name)
+
+    with patch.object(settings, "qdrant_write_parallelism", 3):
+        written = store.write_documents(_docs(10), batch_size=3)
+
+    assert written == 10
+    calls = [call.kwargs for call in client.upsert.call_args_list]
+    assert [call["wait"] for call in calls] == [False, False, False, True]
+    assert calls[-1]["points"].ids == [_point_id("doc9")]
+    assert all(isinstance(call["points"], Batch) for call in calls)
+    assert sorted(id_ for call in calls for id_ in call["points"].ids) == sorted(_point_id(f"doc{i}") for i in range(10))
+    assert any(name.startswith("qdrant-upsert") for name in threads)
+
+    batch = next(call["points"] for call in calls if call["points"].ids[0] == _point_id("doc0"))
+    assert batch.vectors[""] == [[0.0, 0.5], [1.0, 0.5], [2.0, 0.5]]
+    assert len(batch.vectors[SPARSE_VECTOR_NAME]) == 3
+    assert batch.payloads[1] == {"content": "chunk 1", "doc_id": "doc1"}
+
+
+def test_failed_batch_propagates():
+    """Test that a failed upsert fails the write."""
+    client = Mock()
+    store = _remote_store(client)
+    client.upsert.side_effect = RuntimeError("connection reset")
+
+    with pytest.raises(RuntimeError, match="connection reset"):
+        store.write_documents(_docs(5), batch_size=2)
+    assert client.upsert.call_count < 3
+
+
+def test_rejects_wrong_dimension():
+    """Test that mis-sized or ragged embeddings are rejected before anything is sent."""
+    client = Mock()
+    store = _remote_store(client)
+
+    with pytest.raises(ValueError, match="2 dimensions"):
+        store.write_documents(_docs(3, dim=3))
+    with pytest.raises(ValueError, match="2 dimensions"):
+        store.write_documents(_docs(2) + _docs(1, dim=3))
+    client.upsert.assert_not_called()
+
+
+def test_in_memory_round_trip():
+    """Test that a multi-batch write against in-process Qdrant is complete and searchable."""
+    with patch('src.document_stores.store.QdrantClient', lambda **kwargs: QdrantClient(":memory:")), \
+         patch.object(settings, "qdrant_payload_indexes", []):
+        store = QdrantDocumentStore(collection_name="test_bulk", embedding_dimension=2)
+
+    docs = _docs(7) + [Document(id="no-vector", content="skipped")]
+    assert store.write_documents(docs, batch_size=3) == 7
+    assert store.count_documents() == 7
+
+    [hit] = store.search([1.0, 0.0], top_k=1, query_text="chunk 6")
+    assert hit.id == "doc6" and hit.content == "chunk 6"
+
+
+def _collection_info(status=CollectionStatus.GREEN):
+    info = Mock()
+    info.status = status
+    return info
+
+
+def _thresholds(client):
+    return [call.kwargs["optimizers_config"].indexing_threshold for call in client.update_collection.call_args_list]
+
+
+def test_bulk_load_suspends_and_restores_indexing():
+    """Test that indexing is disabled inside the block, restored after it and waited on until green."""
+    client = Mock()
+    store = _remote_store(client)
+    client.get_collection.side_effect = [
+        _collection_info(CollectionStatus.YELLOW),
+        _collection_info(CollectionStatus.GREEN),
+    ]
+
+    with patch.object(store_module, "BULK_LOAD_POLL_SECONDS", 0), \
+         patch.object(settings, "qdrant_indexing_threshold_kb", 10000):
+        with store.bulk_load():
+            assert _thresholds(client) == [0]
+            with store.bulk_load():
+                store.write_documents(_docs(3))
+        assert _thresholds(client) == [0, 10000]
+    assert client.get_collection.call_count == 2
+
+
+def test_bulk_load_restores_on_error():
+    """Test that a failed ingest still re-enables indexing, without waiting for green."""
+    client = Mock()
+    store = _remote_store(client)
+
+    with pytest.raises(RuntimeError):
+        with store.bulk_load():
+            raise RuntimeError("embedding failed")
+    assert _thresholds(client) == [0, settings.qdrant_indexing_threshold_kb]
+    client.get_collection.assert_not_called()
+
+
+def test_bulk_load_restores_configured_threshold():
+    """Test that the configured threshold is restored even while another process has indexing suspended."""
+    client = Mock()
+    store = _remote_store(client)
+    client.get_collection.return_value = _collection_info()
+    client.get_collection.return_value.config.optimizer_config.indexing_threshold = 0
+
+    with patch.object(store_module, "BULK_LOAD_POLL_SECONDS", 0), \
+         patch.object(settings, "qdrant_indexing_threshold_kb", 5000):
+        with store.bulk_load():
+            pass
+    assert _thresholds(client) == [0, 5000]
+
+
+def test_bulk_load_timeout_does_not_fail():
+    """Test that a collection still indexing after the timeout only ends the wait."""
+    client = Mock()
+    store = _remote_store(client)
+    client.get_collection.return_value = _collection_info(CollectionStatus.YELLOW)
+
+    with patch.object(store_module, "BULK_LOAD_POLL_SECONDS", 0):
+        with store.bulk_load(timeout=0.01):
+            pass
+    assert _thresholds(client) == [0, settings.qdrant_indexing_threshold_kb]
+
+
+@pytest.mark.parametrize("count, bulk", [(4, False), (5, True)])
+def test_large_writes_use_bulk_load(count, bulk):
+    """Test that writes at or above the configured size run as bulk loads."""
+    client = Mock()
+    store = _remote_store(client)
+    client.get_collection.return_value = _collection_info()
+
+    with patch.object(settings, "qdrant_bulk_load_min_documents", 5):
+        assert store.write_documents(_docs(count), batch_size=2) == count
+    assert _thresholds(client) == ([0, settings.qdrant_indexing_threshold_kb] if bulk else [])
@@ -0,0 +1,146 @@
+"""
+Tests for Retrieval Caches
+
+Tests the query-embedding cache used in front of the text embedder and the
+semantic answer cache used after embedding.
+"""
+
+import numpy as np
+from unittest.mock import patch
+from src.config.settings import settings
+from src.pipelines.cache import EmbeddingCache, SemanticCache, normalize_query
+
+
+class TestEmbeddingCache:
+    """Test query-embedding LRU/TTL cache."""
+    
+    def test_miss_then_hit(self):
+        """Test that a stored embedding is returned on the next lookup."""
+        cache = EmbeddingCache(max_size=10, ttl_seconds=60)
+        assert cache.get("model", "What is RAG?") is None
+        
+        cache.put("model", "What is RAG?", [0.1, 0.2, 0.3])
+        vector = cache.get("model", "What is RAG?")
+        
+        assert vector is not None
+        assert vector.dtype == np.float32
+        assert np.allclose(vector, [0.1, 0.2, 0.3])
+        assert cache.stats() == {"hits": 1, "misses": 1, "size": 1}
+    
+    def test_key_normalization(self):
+        """Test that whitespace and case differences share a cache entry."""
+        cache = EmbeddingCache()
+        cache.put("model", "What is  RAG?", [1.0])
+        assert cache.get("model", "  what is rag? ") is not None
+        assert normalize_query(" What\tis RAG? ") == "what is rag?"
+    
+    def test_model_is_part_of_key(self):
+        """Test that embeddings from different models are not shared."""
+        cache = EmbeddingCache()
+        cache.put("model-a", "query", [1.0])
+        assert cache.get("model-b", "query") is None
+    
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted when full."""
+        cache = EmbeddingCache(max_size=2)
+        cache.put("m", "a", [1.0])
+        cache.put("m", "b", [2.0])
+        cache.get("m", "a")  # "b" is now least recently used
+        cache.put("m", "c", [3.0])
+        
+        assert len(cache) == 2
+        assert cache.get("m", "b") is None
+        assert cache.get("m", "a") is not None
+        assert cache.get("m", "c") is not None
+    
+    def test_ttl_expiry(self):
+        """Test that expired entries are treated as misses."""
+        cache = EmbeddingCache(ttl_seconds=10)
+        with patch("src.pipelines.cache.time.monotonic", return_value=100.0):
+            cache.put("m", "q", [1.0])
+        with patch("src.pipelines.cache.time.monotonic", return_value=111.0):
+            assert cache.get("m", "q") is None
+        assert len(cache) == 0
+
+
+class TestSemanticCache:
+    """Test similarity-keyed answer cache."""
+    
+    def test_near_duplicate_hits(self):
+        """Test that a query within the distance threshold returns the cached answer."""
+        cache = SemanticCache(max_size=4, max_distance=0.05)
+        cache.put([1.0, 0.0, 0.0], "docs", 0, (5, None), {"answer": "cached"})
+        
+        hit = cache.lookup([0.99, 0.05, 0.0], "docs", 0, (5, None))
+        assert hit is not None
+        assert hit["answer"] == "cached"
+        assert hit["distance"] < 0.05
+    
+    def test_distant_query_misses(self):
+        """Test that dissimilar queries miss."""
+        cache = SemanticCache(max_distance=0.05)
+        cache.put([1.0, 0.0], "docs", 0, None, {"answer": "cached"})
+        assert cache.lookup([0.0, 1.0], "docs", 0, None) is None
+    
+    def test_generation_and_params_must_match(self):
+        """Test that collection changes and different request params invalidate entries."""
+        cache = SemanticCache()
+        cache.put([1.0, 0.0], "docs", 3, (5, None), {"answer": "cached"})
+        
+        assert cache.lookup([1.0, 0.0], "docs", 4, (5, None)) is None
+        assert cache.lookup([1.0, 0.0], "docs", 3, (5, "groq")) is None
+        assert cache.lookup([1.0, 0.0], "other", 3, (5, None)) is None
+        assert cache.lookup([1.0, 0.0], "docs", 3, (5, None)) is not None
+    
+    def test_fifo_slot_reuse(self):
+        """Test that the oldest entry is overwritten when full."""
+        cache = SemanticCache(max_size=2)
+        cache.put([1.0, 0.0, 0.0], "docs", 0, None, {"answer": "a"})
+        cache.put([0.0, 1.0, 0.0], "docs", 0, None, {"answer": "b"})
+        cache.put([0.0, 0.0, 1.0], "docs", 0, None, {"answer": "c"})
+        
+        assert cache.lookup([1.0, 0.0, 0.0], "docs", 0, None) is None
+        assert cache.lookup([0.0, 0.0, 1.0], "docs", 0, None)["answer"] == "c"
+        assert cache.stats()["size"] == 2
+
+
+def test_retrieve_documents_uses_embedding_cache(mock_llm_components, mock_embedder, mock_document_store):
+    """Test that a repeated query skips the embedding call and reports cache stats."""
+    from src.pipelines.retrieval import retrieve_documents
+    
+    first = retrieve_documents("What is RAG?")
+    second = retrieve_documents("what is  RAG?")
+    
+    assert mock_llm_components["embed"].call_count == 1
+    assert first["metadata"]["embedding_cache_hit"] is False
+    assert second["metadata"]["embedding_cache_hit"] is True
+    assert second["metadata"]["embedding_cache_hits"] == 1
+    assert second["metadata"]["embedding_cache_misses"] == 1
+
+
+async def test_aretrieve_documents_semantic_cache(mock_llm_components, mock_embedder, mock_document_store):
+    """Test that a repeated query is served from the semantic cache until the collection changes."""
+    from src.pipelines.retrieval import aretrieve_documents, aretrieve_documents_streaming
+    
+    mock_document_store.generation = 1
+    complete = mock_llm_components["registry"].async_client.complete
+    with patch.object(settings, "semantic_cache_enabled", True):
+        first = await aretrieve_documents("What is RAG?")
+        second = await aretrieve_documents("What is RAG?")
+        assert first["metadata"]["semantic_cache_hit"] is False
+        assert second["metadata"]["semantic_cache_hit"] is True
+        assert second["answer"] == first["answer"]
+        assert complete.await_count == 1
+        assert mock_llm_components["asearch"].await_count == 1
+        
+        # Streaming replays the cached answer as tokens
+        events = [event async for event in aretrieve_documents_streaming("What is RAG?")]
+        tokens = "".join(event["data"] for event in events if event["type"] == "token")
+        assert tokens == first["answer"]
+        assert events[-1]["metadata"]["semantic_cache_hit"] is True
+        
+        # A write to the collection invalidates the entry
+        mock_document_store.generation = 2
+        third = await aretrieve_documents("What is RAG?")
+        assert third["metadata"]["semantic_cache_hit"] is False
+        assert complete.await_count == 2
@@ -0,0 +1,116 @@
+"""
+Tests for Request Coalescing
+
+Tests single-flight sharing of identical in-flight queries and stream fan-out.
+"""
+
+import asyncio
+from src.pipelines.coalescing import SingleFlight, StreamFanout, coalesce_key
+
+
+def test_coalesce_key_normalizes_query_and_filters():
+    """Test that equivalent requests map to the same key."""
+    assert coalesce_key("What is RAG?", 5) == coalesce_key("  what is  rag? ", 5)
+    assert coalesce_key("q", 5, filters={"a": 1, "b": 2}) == coalesce_key("q", 5, filters={"b": 2, "a": 1})
+    assert coalesce_key("q", 5) != coalesce_key("q", 3)
+    assert coalesce_key("q", 5) != coalesce_key("q", 5, provider_override="groq")
+
+
+class TestSingleFlight:
+    """Test shared execution of concurrent identical calls."""
+    
+    async def test_concurrent_calls_share_execution(self):
+        """Test that concurrent callers with one key run the factory once."""
+        flight = SingleFlight()
+        calls = 0
+        
+        async def work():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return "result"
+        
+        results = await asyncio.gather(*[flight.do("key", work) for _ in range(20)])
+        
+        assert calls == 1
+        assert all(result == "result" for result, _ in results)
+        assert sum(1 for _, shared in results if not shared) == 1
+        assert len(flight) == 0
+    
+    async def test_errors_propagate_to_all_callers(self):
+        """Test that a failing execution raises in every caller."""
+        flight = SingleFlight()
+        
+        async def work():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("boom")
+        
+        results = await asyncio.gather(flight.do("key", work), flight.do("key", work), return_exceptions=True)
+        assert all(isinstance(result, RuntimeError) for result in results)
+
+
+class TestStreamFanout:
+    """Test one upstream stream fanned out to many subscribers."""
+    
+    async def test_late_subscriber_receives_full_stream(self):
+        """Test that a subscriber joining mid-stream still receives every event."""
+        fanout = StreamFanout()
+        started = 0
+        
+        async def upstream():
+            nonlocal started
+            started += 1
+            for i in range(5):
+                await asyncio.sleep(0.005)
+                yield i
+        
+        async def consume(delay):
+            await asyncio.sleep(delay)
+            return [event async for event, _ in fanout.subscribe("key", upstream)]
+        
+        first, late = await asyncio.gather(consume(0), consume(0.012))
+        
+        assert started == 1
+        assert first == [0, 1, 2, 3, 4]
+        assert late == [0, 1, 2, 3, 4]
+        assert len(fanout) == 0
+    
+    async def test_upstream_closed_when_all_subscribers_leave(self):
+        """Test that the upstream stream is closed once nobody is listening."""
+        fanout = StreamFanout()
+        closed = asyncio.Event()
+        
+        async def upstream():
+            try:
+                for i in range(1000):
+                    await asyncio.sleep(0.001)
+                    yield i
+            finally:
+                closed.set()
+        
+        subscription = fanout.subscribe("key", upstream)
+        async for event, _ in subscription:
+            if event == 2:
+                break
+        await subscription.aclose()
+        
+        await asyncio.wait_for(closed.wait(), timeout=1)
+        assert len(fanout) == 0
+
+
+async def test_aretrieve_documents_coalesces_identical_queries(mock_llm_components, mock_embedder, mock_document_store):
+    """Test that concurrent identical queries share one generation call."""
+    from src.pipelines.retrieval import aretrieve_documents
+    
+    complete = mock_llm_components["registry"].async_client.complete
+    
+    async def slow_complete(*args, **kwargs):
+        await asyncio.sleep(0.01)
+        return "Shared answer."
+    
+    complete.side_effect = slow_complete
+    results = await asyncio.gather(*[aretrieve_documents("What is RAG?") for _ in range(10)])
+    
+    assert complete.await_count == 1
+    assert all(result["answer"] == "Shared answer." for result in results)
+    assert sum(1 for result in results if result["metadata"]["coalesced"]) == 9
@@ -0,0 +1,124 @@
+"""
+Tests for Vector Compression Profiles
+
+Tests collection creation per profile, search parameters for quantized
+collections, adoption of an existing collection's profile and memory stats.
+"""
+
+import pytest
+from unittest.mock import Mock, patch
+from haystack.dataclasses import Document
+from qdrant_client import QdrantClient
+from qdrant_client.models import (
+    BinaryQuantization,
+    BinaryQuantizationConfig,
+    Datatype,
+    Distance,
+    ScalarQuantization,
+    VectorParams,
+)
+from src.config.settings import settings
+from src.document_stores.compression import CompressionProfile, get_profile, memory_footprint
+from src.document_stores.store import QdrantDocumentStore
+
+
+def _new_collection_client():
+    client = Mock()
+    client.get_collections.return_value.collections = []
+    return client
+
+
+@pytest.mark.parametrize("profile, datatype, quantization", [
+    ("none", None, None),
+    ("float16", Datatype.FLOAT16, None),
+    ("int8", None, ScalarQuantization),
+    ("binary", None, BinaryQuantization),
+])
+def test_collection_created_with_profile(profile, datatype, quantization):
+    """Test that each profile sets the vector datatype and quantization at creation."""
+    client = _new_collection_client()
+    with patch('src.document_stores.store.QdrantClient', return_value=client), \
+         patch.object(settings, "qdrant_payload_indexes", []):
+        store = QdrantDocumentStore(collection_name="c", embedding_dimension=8, compression=profile)
+
+    kwargs = client.create_collection.call_args.kwargs
+    assert kwargs["vectors_config"].datatype == datatype
+    assert kwargs["vectors_config"].on_disk is None
+    if quantization is None:
+        assert kwargs["quantization_config"] is None
+        assert store._search_params() is None
+    else:
+        assert isinstance(kwargs["quantization_config"], quantization)
+        assert store._search_params().quantization.rescore is True
+
+
+def test_unknown_profile():
+    """Test that an unknown profile name is rejected."""
+    with pytest.raises(ValueError):
+        get_profile("int4")
+
+
+def test_quantized_search_uses_rescoring():
+    """Test that dense and hybrid searches pass oversampling + rescore params."""
+    with patch('src.document_stores.store.QdrantClient', lambda **kwargs: QdrantClient(":memory:")), \
+         patch.object(settings, "qdrant_payload_indexes", []), \
+         patch.object(settings, "qdrant_quantization_oversampling", 4.0), \
+         patch.object(settings, "exact_search_max_points", 0):
+        store = QdrantDocumentStore(collection_name="test_int8", embedding_dimension=2, compression="int8")
+        store.write_documents([
+            Document(id="a", content="offer and acceptance", embedding=[1.0, 0.0]),
+            Document(id="b", content="duty of care", embedding=[0.0, 1.0]),
+        ])
+
+        with patch.object(store.client, "query_points", wraps=store.client.query_points) as query_points:
+            assert [doc.id for doc in store.search([1.0, 0.1], top_k=1)] == ["a"]
+            params = query_points.call_args.kwargs["search_params"].quantization
+            assert (params.oversampling, params.rescore) == (4.0, True)
+
+            store.search([1.0, 0.1], top_k=1, query_text="duty of care")
+            dense_prefetch = query_points.call_args.kwargs["prefetch"][0]
+            assert dense_prefetch.params.quantization.oversampling == 4.0
+
+
+def test_existing_collection_profile_is_adopted():
+    """Test that an existing collection's profile wins over the configured one."""
+    client = Mock()
+    client.get_collections.return_value.collections = [Mock()]
+    client.get_collections.return_value.collections[0].name = "c"
+    info = client.get_collection.return_value
+    info.config.params.vectors = VectorParams(size=8, distance=Distance.COSINE, on_disk=True)
+    info.config.params.sparse_vectors = {}
+    info.config.quantization_config = BinaryQuantization(binary=BinaryQuantizationConfig(always_ram=True))
+    info.payload_schema = {}
+    info.points_count = 1000
+
+    with patch('src.document_stores.store.QdrantClient', return_value=client), \
+         patch.object(settings, "qdrant_payload_indexes", []):
+        store = QdrantDocumentStore(collection_name="c", embedding_dimension=8, compression="int8")
+
+    client.create_collection.assert_not_called()
+    assert store.compression == CompressionProfile.BINARY
+    assert store._search_params().quantization.oversampling == 3.0
+    assert store.memory_stats() == {
+        "compression": "binary",
+        "points": 1000,
+        "dimension": 8,
+        "originals_on_disk": True,
+        "original_vector_bytes": 32000,
+        "quantized_vector_bytes": 1000,
+        "ram_bytes": 1000,
+        "disk_bytes": 32000,
+    }
+
+
+def test_memory_footprint():
+    """Test the per-profile storage estimates for 1M 1536-dim vectors."""
+    ram = {
+        profile: memory_footprint(profile, 1_000_000, 1536)["ram_bytes"]
+        for profile in CompressionProfile
+    }
+    assert ram[CompressionProfile.NONE] == 6_144_000_000
+    assert ram[CompressionProfile.FLOAT16] == 3_072_000_000
+    assert ram[CompressionProfile.INT8] == 6_144_000_000 + 1_536_000_000
+    assert memory_footprint(CompressionProfile.INT8, 1_000_000, 1536, originals_on_disk=True)["ram_bytes"] == 1_536_000_000
+    assert memory_footprint(CompressionProfile.BINARY, 1_000_000, 1536, originals_on_disk=True)["ram_bytes"] == 192_000_000
@@ -0,0 +1,202 @@
+"""
+Tests for Context Packing
+
+Tests token counting, merging of adjacent chunks and packing of retrieved
+chunks into the prompt budget.
+"""
+
+import pytest
+from unittest.mock import patch
+from haystack.components.preprocessors import DocumentSplitter
+from haystack.dataclasses import Document
+from qdrant_client import AsyncQdrantClient, QdrantClient
+from src.config.settings import settings
+from src.document_stores.store import QdrantDocumentStore, chunk_positions
+from src.pipelines.context import TokenCounter, merge_adjacent_chunks, pack_documents
+
+
+@pytest.fixture
+def counter():
+    """Character-estimate token counter (no tokenizer)."""
+    return TokenCounter("groq", "llama-3.1-70b-versatile")
+
+
+class TestTokenCounter:
+    """Test token counting and truncation."""
+
+    def test_count_estimate(self, counter):
+        """Test the characters-per-token estimate."""
+        assert counter.count("") == 0
+        assert counter.count("x" * 36) == 10
+
+    def test_truncate(self, counter):
+        """Test that truncated text fits the token limit."""
+        text = "word " * 200
+        truncated = counter.truncate(text, 20)
+        assert counter.count(truncated) <= 20
+        assert text.startswith(truncated)
+        assert counter.truncate("short", 20) == "short"
+        assert counter.truncate(text, 0) == ""
+
+
+class TestPackDocuments:
+    """Test packing chunks into a token budget."""
+
+    def test_all_fit(self, counter, sample_documents):
+        """Test that chunks within budget are kept unchanged."""
+        packed, truncated = pack_documents(sample_documents, counter, 1000)
+        assert packed == sample_documents
+        assert truncated is False
+
+    def test_score_order(self, counter):
+        """Test that the highest-scoring chunks are packed first."""
+        documents = [
+            Document(content="low", score=0.1),
+            Document(content="high", score=0.9),
+            Document(content="unscored"),
+        ]
+        packed, _ = pack_documents(documents, counter, 1000)
+        assert [d.content for d in packed] == ["high", "low", "unscored"]
+
+    def test_truncates_then_drops_tail(self, counter):
+        """Test that the first overflowing chunk is truncated and the rest dropped."""
+        documents = [
+            Document(content="a " * 100, score=0.9),
+            Document(content="b " * 400, score=0.8),
+            Document(content="c " * 100, score=0.7),
+        ]
+        packed, truncated = pack_documents(documents, counter, 200, min_chunk_tokens=16)
+
+        assert truncated is True
+        assert len(packed) == 2
+        assert packed[1].meta["truncated"] is True
+        assert packed[1].content.startswith("b ")
+        assert "truncated" not in documents[1].meta
+        total = sum(counter.count(f"[{i}] \n\n") + counter.count(d.content) for i, d in enumerate(packed, 1))
+        assert total <= 200
+
+    def test_drops_when_remaining_too_small(self, counter):
+        """Test that a chunk is dropped rather than truncated below the minimum."""
+        documents = [
+            Document(content="a " * 100, score=0.9),
+            Document(content="b " * 100, score=0.8),
+        ]
+        packed, truncated = pack_documents(documents, counter, 70, min_chunk_tokens=64)
+        assert len(packed) == 1
+        assert truncated is False
+
+
+def test_retrieve_documents_reports_prompt_tokens(mock_llm_components, mock_embedder, mock_document_store):
+    """Test that the sync pipeline reports packing metadata."""
+    from src.pipelines.retrieval import retrieve_documents
+
+    result = retrieve_documents("What is RAG?")
+    assert result["metadata"]["num_documents_retrieved"] == 3
+    assert result["metadata"]["chunks_packed"] == 3
+    assert result["metadata"]["prompt_tokens"] > 0
+
+
+async def test_aretrieve_documents_packs_to_budget(mock_llm_components, mock_embedder, mock_document_store):
+    """Test that the async pipeline only sends packed chunks to the LLM."""
+    from src.pipelines.retrieval import aretrieve_documents
+
+    long_documents = [
+        Document(content="word " * 2000, score=0.9),
+        Document(content="more " * 2000, score=0.8),
+    ]
+    mock_llm_components["asearch"].return_value = long_documents
+    complete = mock_llm_components["registry"].async_client.complete
+
+    with patch.object(settings, "context_max_input_tokens", 1024):
+        result = await aretrieve_documents("What is RAG?")
+
+    metadata = result["metadata"]
+    assert metadata["num_documents_retrieved"] == 2
+    assert metadata["chunks_packed"] == 1
+    assert metadata["prompt_tokens"] <= 1024
+    assert result["documents"][0].meta["truncated"] is True
+    prompt = complete.await_args.kwargs.get("messages") or complete.await_args.args[2]
+    assert "more" not in prompt[0]["content"]
+
+
+PARENT_TEXT = " ".join(f"w{i}" for i in range(40))
+
+
+def _split_chunks(split_overlap=3):
+    """Split PARENT_TEXT like the indexing pipeline and attach the stored position payload."""
+    splitter = DocumentSplitter(split_by="word", split_length=10, split_overlap=split_overlap)
+    chunks = splitter.run([Document(id="parent", content=PARENT_TEXT)])["documents"]
+    positions = chunk_positions(chunks)
+    return [
+        Document(id=chunk.id, content=chunk.content, meta={**chunk.meta, **positions[chunk.id]}, score=0.5)
+        for chunk in chunks
+    ]
+
+
+class TestMergeAdjacentChunks:
+    """Test overlap-aware stitching of neighbouring chunks."""
+
+    def test_chunk_positions(self):
+        """Test that positions record the parent, offsets and neighbour IDs."""
+        chunks = _split_chunks()
+        first, second = chunks[0].meta, chunks[1].meta
+        assert first["parent_id"] == "parent"
+        assert (first["split_index"], second["split_index"]) == (0, 1)
+        assert PARENT_TEXT[first["char_start"]:first["char_end"]] == chunks[0].content
+        assert "prev_chunk_id" not in first
+        assert first["next_chunk_id"] == chunks[1].id
+        assert second["prev_chunk_id"] == chunks[0].id
+
+    @pytest.mark.parametrize("split_overlap", [0, 3])
+    def test_overlap_removed(self, split_overlap):
+        """Test that adjacent chunks become one passage without repeated text."""
+        chunks = _split_chunks(split_overlap)
+        chunks[1].score = 0.9
+
+        merged = merge_adjacent_chunks([chunks[1], chunks[0]])
+
+        assert len(merged) == 1
+        start, end = chunks[0].meta["char_start"], chunks[1].meta["char_end"]
+        assert merged[0].content == PARENT_TEXT[start:end]
+        assert merged[0].score == 0.9
+        assert merged[0].meta["merged_chunk_ids"] == [chunks[0].id, chunks[1].id]
+
+    def test_non_adjacent_and_unpositioned_pass_through(self):
+        """Test that gaps and chunks without positions are left alone, in rank order."""
+        chunks = _split_chunks()
+        plain = Document(content="no position", score=0.7)
+        merged = merge_adjacent_chunks([chunks[3], plain, chunks[0]])
+        assert merged == [chunks[3], plain, chunks[0]]
+
+
+async def test_neighbour_expansion(mock_llm_components, mock_embedder):
+    """Test that hits pull in their neighbours by ID and merge into one passage, sync and async."""
+    from src.pipelines.retrieval import aretrieve_documents, retrieve_documents
+
+    with patch('src.document_stores.store.QdrantClient', lambda **kwargs: QdrantClient(":memory:")):
+        store = QdrantDocumentStore(collection_name="test_neighbours", embedding_dimension=2)
+    store._async_client = AsyncQdrantClient(":memory:")
+    store._async_client._client.collections = store.client._client.collections
+    splitter = DocumentSplitter(split_by="word", split_length=10, split_overlap=3)
+    chunks = splitter.run([Document(id="parent", content=PARENT_TEXT)])["documents"]
+    for chunk in chunks:
+        chunk.embedding = [1.0, 0.0]
+    store.write_documents(chunks)
+
+    # The search hit is the stored second chunk; its neighbours come from Qdrant
+    hit = (await store.get_documents_by_id_async([chunks[1].id]))[0]
+    hit.score = 0.8
+    mock_llm_components["asearch"].return_value = [hit]
+    mock_llm_components["search"].return_value = [hit]
+
+    with patch('src.pipelines.retrieval.get_document_store', return_value=store), \
+         patch.object(settings, "context_expand_neighbours", True):
+        results = [await aretrieve_documents("What follows w12?"), retrieve_documents("What follows w12?")]
+
+    start = chunks[0].meta["split_idx_start"]
+    end = chunks[2].meta["split_idx_start"] + len(chunks[2].content)
+    for result in results:
+        assert len(result["documents"]) == 1
+        passage = result["documents"][0]
+        assert passage.content == PARENT_TEXT[start:end]
+        assert passage.score == 0.8
@@ -0,0 +1,144 @@
+"""
+Tests for Request Deadlines
+
+Tests the per-request time budget and its propagation through the async query path.
+"""
+
+import asyncio
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+from tenacity import retry, stop_after_attempt, wait_fixed
+from src.pipelines.deadline import Deadline, DeadlineExceeded, stop_before_deadline, use_deadline
+
+
+async def _sleep(seconds, result=None):
+    await asyncio.sleep(seconds)
+    return result
+
+
+class TestDeadline:
+    """Test deadline budgeting."""
+
+    async def test_run_within_budget(self):
+        """Test that a stage finishing in time returns its result."""
+        deadline = Deadline(1.0)
+        assert await deadline.run("embedding", _sleep(0, "ok")) == "ok"
+        assert 0 < deadline.remaining() <= 1.0
+
+    async def test_run_exceeds_budget(self):
+        """Test that a slow stage is cancelled with the stage name."""
+        deadline = Deadline(0.05)
+        with pytest.raises(DeadlineExceeded) as exc_info:
+            await deadline.run("search", _sleep(1))
+        assert exc_info.value.stage == "search"
+        assert deadline.expired
+
+    async def test_run_after_expiry(self):
+        """Test that nothing is awaited once the budget is spent."""
+        deadline = Deadline(0.01)
+        await asyncio.sleep(0.02)
+        with pytest.raises(DeadlineExceeded):
+            await deadline.run("generation", _sleep(0))
+
+    async def test_iterate_bounds_each_step(self):
+        """Test that a stalled stream times out and is closed."""
+        closed = []
+
+        async def stream():
+            try:
+                yield "a"
+                await asyncio.sleep(1)
+                yield "b"
+            finally:
+                closed.append(True)
+
+        deadline = Deadline(0.05)
+        received = []
+        with pytest.raises(DeadlineExceeded):
+            async for item in deadline.iterate("generation", stream()):
+                received.append(item)
+        assert received == ["a"]
+        assert closed == [True]
+
+    async def test_retries_stop_at_deadline(self):
+        """Test that retries give up when the next backoff would overrun the deadline."""
+        calls = []
+
+        @retry(stop=stop_after_attempt(5) | stop_before_deadline(), wait=wait_fixed(0.1), reraise=True)
+        async def flaky():
+            calls.append(1)
+            raise ValueError("transient")
+
+        with use_deadline(Deadline(0.15)):
+            with pytest.raises(ValueError):
+                await flaky()
+        assert len(calls) == 2
+
+        # Without a deadline in context, only the attempt limit applies
+        calls.clear()
+        with pytest.raises(ValueError):
+            await flaky()
+        assert len(calls) == 5
+
+    def test_stop_without_upcoming_sleep(self):
+        """Test the stop condition on tenacity releases whose retry state has no `upcoming_sleep`."""
+        stop = stop_before_deadline()
+        with use_deadline(Deadline(10)):
+            assert stop(SimpleNamespace()) is False
+        with use_deadline(Deadline(0)):
+            assert stop(SimpleNamespace()) is True
+
+
+async def test_aretrieve_documents_deadline(mock_llm_components, mock_embedder, mock_document_store):
+    """Test that a slow search fails with a deadline error instead of hanging."""
+    from src.pipelines.retrieval import aretrieve_documents
+
+    async def slow_search(*args, **kwargs):
+        return await _sleep(1, [])
+
+    mock_llm_components["asearch"].side_effect = slow_search
+    with pytest.raises(DeadlineExceeded) as exc_info:
+        await aretrieve_documents("What is RAG?", timeout_seconds=0.05)
+    assert exc_info.value.stage == "search"
+    mock_llm_components["registry"].async_client.complete.assert_not_awaited()
+
+
+async def test_aretrieve_documents_streaming_partial(mock_llm_components, mock_embedder, mock_document_store):
+    """Test that a stalled token stream ends with a partial timeout error."""
+    from src.pipelines.retrieval import aretrieve_documents_streaming
+
+    async def stalled_stream(*args, **kwargs):
+        yield "Partial "
+        await asyncio.sleep(1)
+        yield "answer."
+
+    mock_llm_components["registry"].async_client.stream.side_effect = stalled_stream
+    events = [event async for event in aretrieve_documents_streaming("What is RAG?", timeout_seconds=0.1)]
+
+    assert [e["data"] for e in events if e["type"] == "token"] == ["Partial "]
+    assert events[-1]["type"] == "error"
+    assert events[-1]["timeout"] is True
+    assert events[-1]["stage"] == "generation"
+    assert events[-1]["partial"] is True
+    # A provider timeout is not a provider failure
+    mock_llm_components["registry"].record_request_failure.assert_not_called()
+
+
+@pytest.mark.parametrize("provider", ["openai", "groq"])
+async def test_complete_forwards_timeout(provider):
+    """Test that non-streaming OpenAI-compatible calls are capped by the per-call timeout."""
+    from src.llm.async_client import AsyncLLMClient
+
+    client = AsyncLLMClient({provider: {"api_key": "test"}})
+    sdk = MagicMock()
+    sdk.chat.completions.create = AsyncMock(
+        return_value=MagicMock(choices=[MagicMock(message=MagicMock(content="answer"))])
+    )
+    client._clients[provider] = sdk
+
+    assert await client.complete(provider, "model", [], 0.0, 10, timeout=2.5) == "answer"
+    assert sdk.chat.completions.create.await_args.kwargs["timeout"] == 2.5
+
+    await client.complete(provider, "model", [], 0.0, 10)
+    assert "timeout" not in sdk.chat.completions.create.await_args.kwargs
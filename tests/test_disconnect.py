@@ -0,0 +1,100 @@
+"""
+Tests for Client Disconnect Handling
+
+Tests that a streaming query stops and closes the upstream provider stream
+when the client disconnects.
+"""
+
+import asyncio
+import pytest
+from unittest.mock import patch
+from src.llm.provider import LLMProviderRegistry
+from src.pipelines.disconnect import until_disconnected
+
+
+class DisconnectAfter:
+    """Fake `request.is_disconnected` that reports a disconnect after a delay."""
+
+    def __init__(self, seconds):
+        self.at = asyncio.get_running_loop().time() + seconds
+
+    async def __call__(self):
+        return asyncio.get_running_loop().time() >= self.at
+
+
+async def test_until_disconnected_closes_source():
+    """Test that a disconnect stops iteration while the source is still waiting."""
+    closed = []
+
+    async def source():
+        try:
+            yield "a"
+            await asyncio.sleep(10)
+            yield "b"
+        finally:
+            closed.append(True)
+
+    start = asyncio.get_running_loop().time()
+    received = [item async for item in until_disconnected(source(), DisconnectAfter(0.05), 0.01)]
+
+    assert received == ["a"]
+    assert closed == [True]
+    assert asyncio.get_running_loop().time() - start < 1
+
+
+async def test_until_disconnected_passes_through():
+    """Test that a connected client receives the whole stream."""
+    async def source():
+        for item in ["a", "b", "c"]:
+            yield item
+
+    received = [item async for item in until_disconnected(source(), DisconnectAfter(60), 0.01)]
+    assert received == ["a", "b", "c"]
+
+
+@pytest.mark.parametrize("coalescing", [True, False])
+async def test_streaming_aborts_on_disconnect(coalescing, mock_llm_components, mock_embedder, mock_document_store):
+    """Test that a disconnect closes the provider stream and records it as aborted."""
+    from src.config.settings import settings
+    from src.pipelines.retrieval import aretrieve_documents_streaming
+
+    closed = []
+
+    async def long_stream(*args, **kwargs):
+        try:
+            yield "Partial "
+            await asyncio.sleep(10)
+            yield "answer."
+        finally:
+            closed.append(True)
+
+    registry = mock_llm_components["registry"]
+    registry.async_client.stream.side_effect = long_stream
+
+    with patch.object(settings, "query_coalescing_enabled", coalescing), \
+         patch.object(settings, "sse_disconnect_poll_ms", 10):
+        events = [
+            event async for event in aretrieve_documents_streaming(
+                "What is RAG?", is_disconnected=DisconnectAfter(0.1)
+            )
+        ]
+        await asyncio.sleep(0)  # let a cancelled coalescing producer finish closing
+
+    assert [e["type"] for e in events] == ["documents", "token"]
+    assert closed == [True]
+    registry.record_request_aborted.assert_called_once_with("openai")
+    registry.record_request_failure.assert_not_called()
+    registry.record_request_success.assert_not_called()
+
+
+@patch('src.llm.provider.aisuite.Client')
+def test_record_request_aborted(mock_client_class):
+    """Test that an aborted stream counts as a healthy, aborted request."""
+    registry = LLMProviderRegistry()
+    registry.record_request_aborted("groq")
+
+    health = registry.get_provider_health("groq")
+    assert health["status"] == "healthy"
+    assert health["aborted_requests"] == 1
+    assert health["failed_requests"] == 0
+    assert health["total_requests"] == 1
@@ -8,6 +8,7 @@ These tests require:
 Run with: uv run pytest tests/test_documents.py -v
 """
 
+import time
 import pytest
 from fastapi.testclient import TestClient
 from src.api.main import app
@@ -40,6 +41,17 @@ def check_prerequisites():
         pytest.skip(f"Prerequisites not met: {'; '.join(issues)}")
 
 
+def wait_for_job(status_url: str, timeout: float = 60.0) -> dict:
+    """Poll an ingestion job until it completes or fails."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = client.get(status_url).json()
+        if job["stage"] in ("completed", "failed"):
+            return job
+        time.sleep(0.5)
+    pytest.fail(f"Job {status_url} did not finish within {timeout}s")
+
+
 # ============================================================================
 # Health Endpoint Tests
 # ============================================================================
@@ -87,13 +99,16 @@ class TestDocumentCreation:
             }
         )
         
-        assert response.status_code == 201, f"Expected 201, got {response.status_code}: {response.json()}"
+        assert response.status_code == 202, f"Expected 202, got {response.status_code}: {response.json()}"
         
         data = response.json()
         assert "document_id" in data
-        assert "chunk_count" in data
-        assert data["chunk_count"] >= 1
+        assert "job_id" in data
         assert "message" in data
+        
+        job = wait_for_job(data["status_url"])
+        assert job["stage"] == "completed", job.get("error")
+        assert job["progress"]["chunks_written"] >= 1
     
     def test_create_document_empty_content(self, check_prerequisites):
         """Test error when creating document with empty content."""
@@ -121,7 +136,7 @@ class TestDocumentCreation:
             json={"content": "Document without metadata for testing purposes."}
         )
         
-        assert response.status_code == 201
+        assert response.status_code == 202
         data = response.json()
         assert "document_id" in data
 
@@ -142,12 +157,12 @@ class TestFileUpload:
             files={"file": ("test.txt", content, "text/plain")}
         )
         
-        assert response.status_code == 201, f"Expected 201, got {response.status_code}: {response.json()}"
+        assert response.status_code == 202, f"Expected 202, got {response.status_code}: {response.json()}"
         
         data = response.json()
         assert "document_id" in data
-        assert "chunk_count" in data
         assert "test.txt" in data["message"]
+        assert wait_for_job(data["status_url"])["stage"] == "completed"
     
     def test_upload_md_file(self, check_prerequisites):
         """Test uploading a .md file."""
@@ -158,7 +173,7 @@ class TestFileUpload:
             files={"file": ("readme.md", content, "text/markdown")}
         )
         
-        assert response.status_code == 201
+        assert response.status_code == 202
     
     def test_upload_unsupported_file(self, check_prerequisites):
         """Test error when uploading unsupported file type."""
@@ -240,8 +255,9 @@ class TestDocumentDeletion:
             "/documents",
             json={"content": "Document to be deleted."}
         )
-        assert create_response.status_code == 201
+        assert create_response.status_code == 202
         doc_id = create_response.json()["document_id"]
+        wait_for_job(create_response.json()["status_url"])
         
         # Then delete it
         delete_response = client.delete(f"/documents/{doc_id}")
@@ -0,0 +1,224 @@
+"""
+Tests for Embedding Backends
+
+Tests the local sentence-transformers backend with a tiny model built on the
+fly (no downloads), provider selection, Matryoshka dimension reduction and
+the indexing component.
+"""
+
+import asyncio
+import threading
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock, patch
+from haystack.dataclasses import Document
+from qdrant_client import QdrantClient
+from src.config.settings import settings
+from src.document_stores.store import DimensionMismatchError, QdrantDocumentStore
+from src.embeddings import create_embedder
+from src.embeddings.base import reduce_dimension
+from src.embeddings.components import DocumentEmbedder
+from src.embeddings.openai_embedder import OpenAIEmbedder
+
+VOCAB = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]", "offer", "acceptance", "duty", "of", "care", "tort", "contract"]
+
+
+@pytest.fixture(scope="module")
+def tiny_model(tmp_path_factory):
+    """A randomly initialized 1-layer BERT wrapped as a SentenceTransformer."""
+    pytest.importorskip("sentence_transformers")
+    from sentence_transformers import SentenceTransformer, models
+    from transformers import BertConfig, BertModel, BertTokenizerFast
+
+    path = tmp_path_factory.mktemp("tiny-bert")
+    (path / "vocab.txt").write_text("\n".join(VOCAB))
+    BertTokenizerFast(vocab_file=str(path / "vocab.txt")).save_pretrained(path)
+    BertModel(BertConfig(
+        vocab_size=len(VOCAB),
+        hidden_size=16,
+        num_hidden_layers=1,
+        num_attention_heads=2,
+        intermediate_size=32,
+        max_position_embeddings=64,
+    )).save_pretrained(path)
+
+    transformer = models.Transformer(str(path), max_seq_length=32)
+    pooling = models.Pooling(transformer.get_word_embedding_dimension())
+    return SentenceTransformer(modules=[transformer, pooling], device="cpu")
+
+
+@pytest.fixture
+def local_embedder(tiny_model):
+    from src.embeddings.local import LocalEmbedder
+
+    embedder = LocalEmbedder(tiny_model, batch_size=8, max_wait_ms=50, model_name="tiny")
+    yield embedder
+    embedder.close()
+
+
+def test_local_embeddings_match_model(local_embedder, tiny_model):
+    """Test that vectors are normalized, in input order and equal to a direct encode."""
+    texts = ["offer and acceptance", "duty of care", "tort"]
+    vectors = local_embedder.embed(texts)
+
+    expected = tiny_model.encode(texts, normalize_embeddings=True)
+    assert len(vectors) == 3 and local_embedder.dimension == 16
+    for vector, reference in zip(vectors, expected):
+        assert vector == pytest.approx(reference.tolist(), abs=1e-5)
+        assert sum(v * v for v in vector) == pytest.approx(1.0, abs=1e-4)
+    assert local_embedder.run("tort")["embedding"] == pytest.approx(vectors[2], abs=1e-5)
+
+
+async def test_concurrent_requests_share_a_batch(local_embedder):
+    """Test that concurrent async calls are encoded in one forward pass on a worker thread."""
+    encode = local_embedder.model.encode
+    calls = []
+
+    def spy(texts, **kwargs):
+        calls.append((list(texts), threading.current_thread().name))
+        return encode(texts, **kwargs)
+
+    with patch.object(local_embedder.model, "encode", side_effect=spy):
+        results = await asyncio.gather(*(local_embedder.aembed([text]) for text in ["offer", "duty", "care"]))
+
+    assert [len(result) for result in results] == [1, 1, 1]
+    assert calls == [(["offer", "duty", "care"], "local-embedder-0")]
+
+
+async def test_encode_failure_reaches_callers(local_embedder):
+    """Test that a model error is raised to every request in the batch."""
+    with patch.object(local_embedder.model, "encode", side_effect=RuntimeError("boom")):
+        with pytest.raises(RuntimeError, match="boom"):
+            await local_embedder.aembed(["offer"])
+    assert len(local_embedder.embed(["offer"])) == 1
+
+
+def test_provider_selection(tiny_model):
+    """Test that the provider setting picks the backend and unknown providers fail."""
+    with patch.object(settings, "embedding_provider", "sentence-transformers"), \
+         patch.object(settings, "embedding_dimension", 16), \
+         patch("sentence_transformers.SentenceTransformer", return_value=tiny_model) as load:
+        embedder = create_embedder()
+    try:
+        assert type(embedder).__name__ == "LocalEmbedder"
+        load.assert_called_once_with(settings.local_embedding_model, device="cpu")
+    finally:
+        embedder.close()
+
+    with patch.object(settings, "embedding_provider", "local"), \
+         patch.object(settings, "embedding_dimension", 32), \
+         patch("sentence_transformers.SentenceTransformer", return_value=tiny_model):
+        with pytest.raises(ValueError, match="exceeds"):
+            create_embedder()
+
+    assert type(create_embedder("openai")).__name__ == "OpenAIEmbedder"
+    with pytest.raises(ValueError):
+        create_embedder("word2vec")
+
+
+def test_embedding_dimension_follows_provider_model(monkeypatch):
+    """Test that the dimension defaults to the active model's size and invalid combinations fail at load."""
+    from pydantic import ValidationError
+    from src.config.settings import Settings
+
+    monkeypatch.delenv("EMBEDDING_DIMENSION", raising=False)
+    assert Settings(_env_file=None).embedding_dimension == 1536
+
+    local = Settings(_env_file=None, embedding_provider="local")
+    assert (local.active_embedding_model, local.embedding_dimension) == ("sentence-transformers/all-MiniLM-L6-v2", 384)
+
+    with pytest.raises(ValidationError, match="exceeds the 384 dims"):
+        Settings(_env_file=None, embedding_provider="local", embedding_dimension=1536)
+    with pytest.raises(ValidationError, match="EMBEDDING_DIMENSION"):
+        Settings(_env_file=None, embedding_provider="local", local_embedding_model="./my-model")
+    assert Settings(
+        _env_file=None, embedding_provider="local", local_embedding_model="./my-model", embedding_dimension=256
+    ).embedding_dimension == 256
+
+
+def test_document_embedder_component():
+    """Test that the indexing component embeds all documents in one call."""
+    embedder = Mock()
+    embedder.embed.return_value = [[1.0, 0.0], [0.0, 1.0]]
+    documents = [Document(id="a", content="offer"), Document(id="b", content=None)]
+
+    result = DocumentEmbedder(embedder).run(documents=documents)
+
+    embedder.embed.assert_called_once_with(["offer", ""])
+    assert [doc.embedding for doc in result["documents"]] == [[1.0, 0.0], [0.0, 1.0]]
+    assert [doc.id for doc in result["documents"]] == ["a", "b"]
+
+
+def test_reduce_dimension():
+    """Test that vectors are truncated to a prefix and re-normalized."""
+    assert reduce_dimension([[3.0, 4.0, 12.0]], 2) == [pytest.approx([0.6, 0.8])]
+    assert reduce_dimension([[0.0, 0.0, 1.0]], 2) == [[0.0, 0.0]]
+    vectors = [[0.6, 0.8]]
+    assert reduce_dimension(vectors, 2) is vectors
+    assert reduce_dimension(vectors, None) is vectors
+    with pytest.raises(ValueError):
+        reduce_dimension(vectors, 3)
+
+
+def test_local_matryoshka_truncation(tiny_model):
+    """Test that the local backend shortens and re-normalizes embeddings."""
+    from src.embeddings.local import LocalEmbedder
+
+    embedder = LocalEmbedder(tiny_model, dimension=8)
+    try:
+        full = tiny_model.encode(["duty of care"], normalize_embeddings=True)[0]
+        [vector] = embedder.embed(["duty of care"])
+    finally:
+        embedder.close()
+    assert embedder.dimension == 8 and len(vector) == 8
+    assert vector == pytest.approx(reduce_dimension([full.tolist()], 8)[0], abs=1e-5)
+
+
+async def test_openai_dimensions():
+    """Test that text-embedding-3 models get `dimensions` and older models are truncated locally."""
+    response = SimpleNamespace(data=[SimpleNamespace(index=0, embedding=[3.0, 4.0, 12.0])])
+
+    embedder = OpenAIEmbedder(model="text-embedding-3-large", api_key="sk-test", dimensions=256)
+    embedder.async_client = Mock()
+    embedder.async_client.embeddings.create = AsyncMock(
+        return_value=SimpleNamespace(data=[SimpleNamespace(index=0, embedding=[0.0] * 256)])
+    )
+    await embedder.aembed(["offer"])
+    assert embedder.async_client.embeddings.create.await_args.kwargs["dimensions"] == 256
+
+    legacy = OpenAIEmbedder(model="text-embedding-ada-002", api_key="sk-test", dimensions=2)
+    legacy.client = Mock()
+    legacy.client.embeddings.create.return_value = response
+    assert legacy.embed(["offer"]) == [pytest.approx([0.6, 0.8])]
+    assert "dimensions" not in legacy.client.embeddings.create.call_args.kwargs
+
+
+async def test_openai_batches_run_concurrently():
+    """Test that sub-batches of a large input are requested at once and returned in order."""
+    in_flight, peak = 0, 0
+
+    async def create(model, input):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return SimpleNamespace(data=[SimpleNamespace(index=i, embedding=[float(t)]) for i, t in enumerate(input)][::-1])
+
+    embedder = OpenAIEmbedder(model="text-embedding-ada-002", api_key="sk-test", batch_size=2)
+    embedder.async_client = Mock()
+    embedder.async_client.embeddings.create = create
+
+    assert await embedder.aembed([str(i) for i in range(5)]) == [[float(i)] for i in range(5)]
+    assert peak == 3
+
+
+def test_store_rejects_dimension_mismatch():
+    """Test that opening an existing collection with another dimension fails at startup."""
+    client = QdrantClient(":memory:")
+    with patch('src.document_stores.store.QdrantClient', lambda **kwargs: client), \
+         patch.object(settings, "qdrant_payload_indexes", []):
+        QdrantDocumentStore(collection_name="test_dims", embedding_dimension=256)
+        QdrantDocumentStore(collection_name="test_dims", embedding_dimension=256)
+        with pytest.raises(DimensionMismatchError, match="256-dim"):
+            QdrantDocumentStore(collection_name="test_dims", embedding_dimension=128)
@@ -0,0 +1,133 @@
+"""
+Tests for Metadata Filters
+
+Tests filter translation, filtered search against an in-memory Qdrant,
+payload index management and filter plumbing through the query pipeline.
+"""
+
+import pytest
+from unittest.mock import Mock, patch
+from haystack.dataclasses import Document
+from qdrant_client import QdrantClient
+from qdrant_client.models import Distance, MatchAny, MatchExcept, PayloadSchemaType, Range, VectorParams
+from src.config.settings import settings
+from src.document_stores.filters import FilterError, build_filter
+from src.document_stores.store import QdrantDocumentStore, parse_payload_indexes
+
+
+class TestBuildFilter:
+    """Test translation of request filters to Qdrant filters."""
+
+    def test_operators(self):
+        """Test exact, any-of, range, not-equal and none-of conditions."""
+        qdrant_filter = build_filter({
+            "course.code": "LAW101",
+            "tags": ["contracts", "torts"],
+            "year": {"$gte": 2020, "$lt": 2024},
+            "status": {"$ne": "draft"},
+            "source": {"$nin": ["archive"]},
+        })
+        must = {condition.key: condition for condition in qdrant_filter.must}
+        assert must["course.code"].match.value == "LAW101"
+        assert must["tags"].match == MatchAny(any=["contracts", "torts"])
+        assert must["year"].range == Range(gte=2020, lt=2024)
+        assert isinstance(must["source"].match, MatchExcept)
+        assert [c.key for c in qdrant_filter.must_not] == ["status"]
+
+    def test_empty(self):
+        """Test that no filters means no Qdrant filter."""
+        assert build_filter(None) is None
+        assert build_filter({}) is None
+
+    @pytest.mark.parametrize("filters", [
+        {"year": {"$regex": "20.*"}},
+        {"year": {}},
+        {"year": {"$gte": 2020, "$lt": "2024-01-01"}},
+        {"tags": {"$in": []}},
+        {"score": 0.5},
+        {"$or": "x"},
+    ])
+    def test_malformed(self, filters):
+        """Test that malformed filters are rejected with a clear error."""
+        with pytest.raises(FilterError):
+            build_filter(filters)
+
+    def test_request_validation(self):
+        """Test that requests with malformed filters fail validation."""
+        from pydantic import ValidationError
+        from src.api.schemas.query import QueryRequest, RetrieveRequest
+
+        with pytest.raises(ValidationError):
+            QueryRequest(query="q", filters={"year": {"$regex": "x"}})
+        assert RetrieveRequest(query="q", filters={"year": {"$gt": 1}}).filters == {"year": {"$gt": 1}}
+
+
+def test_filtered_search():
+    """Test that filters restrict search results, including nested keys and ranges."""
+    with patch('src.document_stores.store.QdrantClient', lambda **kwargs: QdrantClient(":memory:")), \
+         patch.object(settings, "qdrant_payload_indexes", []):
+        store = QdrantDocumentStore(collection_name="test_filters", embedding_dimension=2)
+    store.write_documents([
+        Document(id="a", content="Offer and acceptance.", embedding=[1.0, 0.0],
+                 meta={"course": {"code": "LAW101"}, "year": 2021}),
+        Document(id="b", content="Duty of care.", embedding=[1.0, 0.1],
+                 meta={"course": {"code": "LAW205"}, "year": 2023}),
+        Document(id="c", content="Consideration.", embedding=[0.9, 0.2],
+                 meta={"course": {"code": "LAW101"}, "year": 2019}),
+    ])
+
+    results = store.search([1.0, 0.0], top_k=5, filters={"course.code": "LAW101"})
+    assert {doc.id for doc in results} == {"a", "c"}
+
+    results = store.search([1.0, 0.0], top_k=5, filters={"course.code": ["LAW101", "LAW205"], "year": {"$gte": 2020}})
+    assert {doc.id for doc in results} == {"a", "b"}
+
+
+class TestPayloadIndexes:
+    """Test payload index declarations and creation at collection setup."""
+
+    def test_parse(self):
+        """Test parsing field:type declarations."""
+        assert parse_payload_indexes(["course.code:keyword", "year:Integer"]) == {
+            "course.code": PayloadSchemaType.KEYWORD,
+            "year": PayloadSchemaType.INTEGER,
+        }
+        with pytest.raises(ValueError):
+            parse_payload_indexes(["year"])
+        with pytest.raises(ValueError):
+            parse_payload_indexes(["year:bigint"])
+
+    def test_creates_missing_indexes(self):
+        """Test that only missing indexes are created and type mismatches are left alone."""
+        client = Mock()
+        client.get_collections.return_value.collections = [Mock()]
+        client.get_collections.return_value.collections[0].name = "courses"
+        client.get_collection.return_value.config.params.sparse_vectors = {}
+        client.get_collection.return_value.config.params.vectors = VectorParams(size=2, distance=Distance.COSINE)
+        client.get_collection.return_value.payload_schema = {
+            "course": Mock(data_type=PayloadSchemaType.KEYWORD),
+            "year": Mock(data_type=PayloadSchemaType.KEYWORD),
+        }
+
+        with patch('src.document_stores.store.QdrantClient', return_value=client), \
+             patch.object(settings, "qdrant_payload_indexes", ["course:keyword", "year:integer", "published:datetime"]):
+            QdrantDocumentStore(collection_name="courses", embedding_dimension=2)
+
+        client.create_payload_index.assert_called_once_with(
+            collection_name="courses",
+            field_name="published",
+            field_schema=PayloadSchemaType.DATETIME,
+            wait=True,
+        )
+
+
+async def test_filters_reach_search_and_keys(mock_llm_components, mock_embedder, mock_document_store):
+    """Test that filters are passed to search and are part of the coalescing key."""
+    from src.pipelines.coalescing import coalesce_key
+    from src.pipelines.retrieval import aretrieve_documents
+
+    filters = {"course.code": "LAW101"}
+    await aretrieve_documents("What is consideration?", filters=filters)
+    assert mock_llm_components["asearch"].await_args.kwargs["filters"] == filters
+
+    assert coalesce_key("q", 5, filters=filters) != coalesce_key("q", 5)
@@ -0,0 +1,180 @@
+"""
+Tests for Hedged Streaming
+
+Tests the time-to-first-token race between a slow primary provider and its
+first fallback, and the learned per-provider hedge delay.
+"""
+
+import asyncio
+import pytest
+from unittest.mock import Mock, patch
+from src.config.settings import settings
+from src.llm.hedging import open_hedged_stream
+from src.llm.provider import LLMProviderRegistry, ProviderHealth
+
+
+class FakeClient:
+    """Async client whose streams start after a per-provider delay."""
+
+    def __init__(self, first_token_delays, failures=()):
+        self.first_token_delays = first_token_delays
+        self.failures = set(failures)
+        self.closed = []
+
+    async def stream(self, provider, model, messages, **kwargs):
+        try:
+            await asyncio.sleep(self.first_token_delays[provider])
+            if provider in self.failures:
+                raise RuntimeError(f"{provider} unavailable")
+            yield f"{provider} "
+            yield "answer."
+        finally:
+            self.closed.append(provider)
+
+
+@pytest.fixture
+def registry():
+    """Registry mock with a fixed 50ms hedge delay."""
+    registry = Mock()
+    registry.get_hedge_delay.return_value = 0.05
+    return registry
+
+
+async def _drain(stream):
+    return [token async for token in stream]
+
+
+class TestOpenHedgedStream:
+    """Test the first-token race."""
+
+    async def test_fast_primary_does_not_hedge(self, registry):
+        """Test that no hedge fires when the primary answers within the delay."""
+        client = FakeClient({"openai": 0, "groq": 0})
+        candidates = iter([("groq", "llama")])
+
+        provider, _, first_token, stream, hedge_fired = await open_hedged_stream(
+            client, registry, ("openai", "gpt"), candidates, []
+        )
+        assert (provider, first_token, hedge_fired) == ("openai", "openai ", False)
+        assert await _drain(stream) == ["answer."]
+        # The fallback was not consumed
+        assert next(candidates) == ("groq", "llama")
+
+    async def test_slow_primary_loses_to_hedge(self, registry):
+        """Test that a hedge fires for a slow primary, wins, and the primary is cancelled."""
+        client = FakeClient({"openai": 1.0, "groq": 0})
+
+        provider, _, first_token, stream, hedge_fired = await open_hedged_stream(
+            client, registry, ("openai", "gpt"), iter([("groq", "llama")]), []
+        )
+        assert (provider, first_token, hedge_fired) == ("groq", "groq ", True)
+        assert "openai" in client.closed
+        registry.record_request_failure.assert_not_called()
+        await stream.aclose()
+
+    async def test_primary_can_win_after_hedge_fires(self, registry):
+        """Test that the primary still wins if its first token beats the hedge."""
+        client = FakeClient({"openai": 0.08, "groq": 1.0})
+
+        provider, _, _, stream, hedge_fired = await open_hedged_stream(
+            client, registry, ("openai", "gpt"), iter([("groq", "llama")]), []
+        )
+        assert (provider, hedge_fired) == ("openai", True)
+        assert "groq" in client.closed
+        await stream.aclose()
+
+    async def test_hedge_covers_failing_primary(self, registry):
+        """Test that a primary failing after the hedge fired is recorded and the hedge wins."""
+        client = FakeClient({"openai": 0.08, "groq": 0.2}, failures={"openai"})
+
+        provider, _, _, stream, _ = await open_hedged_stream(
+            client, registry, ("openai", "gpt"), iter([("groq", "llama")]), []
+        )
+        assert provider == "groq"
+        registry.record_request_failure.assert_called_once_with("openai", "openai unavailable")
+        await stream.aclose()
+
+    async def test_all_fail_raises_primary_error(self, registry):
+        """Test that the primary's error is raised when every stream fails."""
+        client = FakeClient({"openai": 0.08, "groq": 0.1}, failures={"openai", "groq"})
+
+        with pytest.raises(RuntimeError, match="openai unavailable"):
+            await open_hedged_stream(client, registry, ("openai", "gpt"), iter([("groq", "llama")]), [])
+        # The caller records the primary failure; the hedge failure is recorded here
+        registry.record_request_failure.assert_called_once_with("groq", "groq unavailable")
+
+
+class TestHedgeDelay:
+    """Test the learned time-to-first-token threshold."""
+
+    def test_ttft_percentile(self):
+        """Test percentile over recorded samples."""
+        health = ProviderHealth()
+        assert health.ttft_percentile(95) is None
+        for ms in range(1, 101):
+            health.record_first_token(ms / 1000)
+        assert health.ttft_percentile(50) == pytest.approx(0.051, abs=0.001)
+        assert health.ttft_percentile(95) == pytest.approx(0.095, abs=0.001)
+
+    @patch('src.llm.provider.aisuite.Client')
+    def test_default_until_enough_samples(self, mock_client_class):
+        """Test that the default delay applies until the minimum sample count is reached."""
+        registry = LLMProviderRegistry()
+        with patch.object(settings, "llm_hedge_min_samples", 10), \
+             patch.object(settings, "llm_hedge_default_delay_ms", 1500):
+            for _ in range(9):
+                registry.record_first_token("groq", 0.2)
+            assert registry.get_hedge_delay("groq") == 1.5
+            registry.record_first_token("groq", 0.2)
+            assert registry.get_hedge_delay("groq") == pytest.approx(0.2)
+        assert registry.get_provider_health("groq")["ttft_p50_ms"] == 200.0
+
+    @patch('src.llm.provider.aisuite.Client')
+    async def test_delay_does_not_ratchet_down_under_hedging(self, mock_client_class):
+        """Test that cancelled slow primaries keep the learned delay from shrinking."""
+        registry = LLMProviderRegistry()
+
+        class AlternatingClient(FakeClient):
+            """Primary alternates between a fast first token and one far past the delay."""
+
+            def __init__(self):
+                super().__init__({"groq": 0})
+                self.calls = 0
+
+            def stream(self, provider, model, messages, **kwargs):
+                if provider == "openai":
+                    self.calls += 1
+                    self.first_token_delays["openai"] = 0.01 if self.calls % 2 else 1.0
+                return super().stream(provider, model, messages, **kwargs)
+
+        client = AlternatingClient()
+        with patch.object(settings, "llm_hedge_min_samples", 2), \
+             patch.object(settings, "llm_hedge_percentile", 95), \
+             patch.object(settings, "llm_hedge_default_delay_ms", 100):
+            for _ in range(8):
+                _, _, _, stream, _ = await open_hedged_stream(
+                    client, registry, ("openai", "gpt"), iter([("groq", "llama")]), []
+                )
+                await stream.aclose()
+            # Each cancelled primary contributed a sample at least as long as the delay it lost at
+            assert registry.get_hedge_delay("openai") >= 0.09
+
+
+async def test_streaming_reports_hedge(mock_llm_components, mock_embedder, mock_document_store):
+    """Test that the streaming pipeline reports which hedge won."""
+    from src.pipelines.retrieval import aretrieve_documents_streaming
+
+    registry = mock_llm_components["registry"]
+    client = FakeClient({"openai": 1.0, "anthropic": 0, "groq": 0})
+    registry.async_client.stream.side_effect = client.stream
+    registry.get_hedge_delay.return_value = 0.05
+
+    with patch.object(settings, "llm_hedging_enabled", True):
+        events = [event async for event in aretrieve_documents_streaming("What is RAG?")]
+
+    tokens = "".join(e["data"] for e in events if e["type"] == "token")
+    metadata = events[-1]["metadata"]
+    assert tokens == "anthropic answer."
+    assert metadata["hedge_fired"] is True
+    assert metadata["hedge_winner"] == "anthropic"
+    assert metadata["provider_used"] == "anthropic"
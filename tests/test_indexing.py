@@ -0,0 +1,91 @@
+"""
+Tests for the Indexing Pipeline Pool
+
+Tests that uploads reuse warm pipelines sharing the global document store,
+that concurrent runs never share a pipeline, and that a settings change
+rebuilds the pool.
+"""
+
+import threading
+import time
+from unittest.mock import Mock, patch
+from haystack.dataclasses import Document
+from src.config.settings import settings
+from src.document_stores import store as document_stores
+from src.pipelines import indexing, retrieval
+
+
+def _doc(words=300):
+    return Document(content=" ".join(f"word{i}" for i in range(words)))
+
+
+def test_pipeline_is_reused(indexing_store):
+    """Test that repeated uploads run on one pipeline writing to the shared store."""
+    with patch.object(indexing, "create_indexing_pipeline", wraps=indexing.create_indexing_pipeline) as create:
+        first = indexing.index_documents([_doc()])
+        second = indexing.index_documents([_doc(600)])
+
+    create.assert_called_once_with(indexing_store)
+    assert first["writer"]["documents_written"] == 1
+    assert second["writer"]["documents_written"] == 2
+    assert indexing_store.count_documents() == 3
+
+
+def test_concurrent_runs_get_their_own_pipeline(indexing_store):
+    """Test that concurrent uploads never share a pipeline and at most `size` are built."""
+    in_use, overlaps = set(), []
+    lock = threading.Lock()
+
+    def run(self, data):
+        with lock:
+            overlaps.append(id(self) in in_use)
+            in_use.add(id(self))
+        time.sleep(0.02)
+        with lock:
+            in_use.discard(id(self))
+        return {}
+
+    with patch.object(settings, "indexing_pipeline_pool_size", 2), \
+         patch.object(indexing.Pipeline, "run", run), \
+         patch.object(indexing, "create_indexing_pipeline", wraps=indexing.create_indexing_pipeline) as create:
+        threads = [threading.Thread(target=indexing.index_documents, args=([_doc()],)) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert len(overlaps) == 6 and not any(overlaps)
+    assert create.call_count == 2
+
+
+def test_settings_change_rebuilds_pool(indexing_store):
+    """Test that the pool is kept until a pipeline setting changes."""
+    pool = indexing.get_indexing_pipeline_pool()
+    assert indexing.get_indexing_pipeline_pool() is pool
+
+    with patch.object(settings, "chunk_size", 256):
+        rebuilt = indexing.get_indexing_pipeline_pool()
+    assert rebuilt is not pool
+    assert rebuilt.document_store is indexing_store
+
+
+def test_staged_indexing_links_chunks_across_steps(indexing_store):
+    """Test that neighbour links survive chunks being written one step at a time."""
+    result = indexing.index_documents_in_stages([_doc(1200)], step_size=1)
+    assert result["writer"]["documents_written"] == 3
+
+    records, _ = indexing_store.client.scroll(indexing_store.collection_name, limit=10)
+    chunks = {record.payload["split_index"]: record.payload for record in records}
+    assert chunks[0]["next_chunk_id"] == chunks[1]["doc_id"]
+    assert chunks[1]["prev_chunk_id"] == chunks[0]["doc_id"]
+    assert chunks[1]["next_chunk_id"] == chunks[2]["doc_id"]
+    assert chunks[2]["prev_chunk_id"] == chunks[1]["doc_id"]
+
+
+def test_query_path_shares_document_store():
+    """Test that queries and uploads use the one process-wide document store."""
+    store = Mock()
+    with patch("src.document_stores.store._document_store", store):
+        assert retrieval.get_document_store() is store
+        retrieval._reset_cache()
+        assert document_stores._document_store is None
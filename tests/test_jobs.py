@@ -0,0 +1,370 @@
+"""
+Tests for Ingestion Jobs
+
+Tests the durable job queue (spooling, leased claims, retries and
+backpressure), staged processing with progress and timings, the
+asynchronous upload endpoints with status polling, and the standalone worker.
+"""
+
+import asyncio
+import os
+import signal
+import sqlite3
+import threading
+import time
+import pytest
+from concurrent.futures.process import BrokenProcessPool
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from src.api.main import app
+from src.config.settings import settings
+from src.document_stores import store as document_stores
+from src.pipelines import jobs
+from src.pipelines.jobs import JobQueue, JobStage, QueueFullError, process_job
+
+TEXT = " ".join(f"word{i}" for i in range(1200))
+
+
+@pytest.fixture
+def queue_path(tmp_path):
+    path = str(tmp_path / "ingestion.db")
+    with patch.object(settings, "ingestion_queue_path", path):
+        yield path
+    jobs.stop_ingestion_workers(timeout=5.0)
+
+
+def _wait_for(queue, job_id, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = queue.get(job_id)
+        if JobStage(job["stage"]) in jobs.TERMINAL_STAGES:
+            return job
+        time.sleep(0.02)
+    raise AssertionError(f"job {job_id} still {job['stage']}")
+
+
+def test_expired_lease_is_reclaimed(queue_path):
+    """Test that a job whose worker stopped renewing its lease is taken over by another worker."""
+    queue = JobQueue(queue_path)
+    first = queue.submit("doc-1", b"first")
+    second = queue.submit("doc-2", b"second")
+
+    claimed = queue.claim("worker-a")
+    assert claimed["id"] == first and claimed["payload"] == b"first"
+    assert queue.update(first, "worker-a", stage=JobStage.EMBEDDING, chunks_total=3, chunks_embedded=2)
+
+    reopened = JobQueue(queue_path)
+    assert reopened.claim("worker-b")["id"] == second
+    assert reopened.claim("worker-b") is None
+
+    reopened.update(first, lease_expires_at=time.time() - 1)
+    job = reopened.claim("worker-b")
+    assert (job["id"], job["attempts"], job["chunks_embedded"], job["lease_owner"]) == (first, 2, 0, "worker-b")
+    assert not queue.update(first, "worker-a", chunks_embedded=3)
+    assert queue.get(first)["lease_owner"] == "worker-b"
+
+
+def test_abandoned_job_fails_after_max_attempts(queue_path):
+    """Test that a job whose workers keep dying is eventually failed."""
+    queue = JobQueue(queue_path)
+    job_id = queue.submit("doc-1", b"first")
+    with patch.object(settings, "ingestion_max_attempts", 2):
+        for owner in ("worker-a", "worker-b"):
+            assert queue.claim(owner)["id"] == job_id
+            queue.update(job_id, lease_expires_at=0)
+        assert queue.claim("worker-c") is None
+    job = queue.get(job_id)
+    assert job["stage"] == "failed" and "worker-b" in job["error"]
+
+
+def test_concurrent_claims_are_exclusive(queue_path):
+    """Test that workers claiming at the same time never get the same job."""
+    queue = JobQueue(queue_path)
+    submitted = {queue.submit(f"doc-{i}", b"x") for i in range(40)}
+    claimed = [[] for _ in range(4)]
+
+    def drain(i):
+        while (job := queue.claim(f"worker-{i}")) is not None:
+            claimed[i].append(job["id"])
+
+    threads = [threading.Thread(target=drain, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    ids = [job_id for ids in claimed for job_id in ids]
+    assert len(ids) == len(set(ids)) and set(ids) == submitted
+
+
+def test_shared_filesystem_avoids_wal(tmp_path):
+    """Test that a queue shared across hosts does not use WAL, which needs local shared memory."""
+    local, shared = str(tmp_path / "local.db"), str(tmp_path / "shared.db")
+    JobQueue(local)
+    JobQueue(shared, shared_filesystem=True)
+    assert sqlite3.connect(local).execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert sqlite3.connect(shared).execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+
+
+def test_full_queue_rejects_submissions(queue_path):
+    """Test backpressure once `ingestion_max_pending` jobs are queued."""
+    queue = JobQueue(queue_path)
+    with patch.object(settings, "ingestion_max_pending", 1):
+        queue.submit("doc-1", b"first")
+        with pytest.raises(QueueFullError):
+            queue.submit("doc-2", b"second")
+        queue.claim("worker")
+        queue.submit("doc-2", b"second")
+
+
+def test_process_job_reports_progress(queue_path, indexing_store):
+    """Test that a job moves through every stage and records counts and timings."""
+    queue = JobQueue(queue_path)
+    job_id = queue.submit("doc-1", TEXT.encode(), metadata={"course": "torts"})
+    stages = []
+    update = queue.update
+
+    def record(job_id, owner=None, **fields):
+        if "stage" in fields:
+            stages.append(JobStage(fields["stage"]).value)
+        return update(job_id, owner, **fields)
+
+    with patch.object(queue, "update", record), patch.object(settings, "ingestion_step_size", 2):
+        process_job(queue, queue.claim("worker"))
+
+    job = queue.get(job_id)
+    assert job["stage"] == "completed" and job["error"] is None
+    assert (job["chunks_total"], job["chunks_embedded"], job["chunks_written"]) == (3, 3, 3)
+    assert set(job["timings"]) == {"extracting", "chunking", "embedding", "writing"}
+    assert stages[:4] == ["chunking", "embedding", "writing", "embedding"]
+    assert indexing_store.count_documents() == 3
+    [chunk] = indexing_store.search([1.0, 0.0], top_k=1, filters={"course": "torts"})
+    assert chunk.meta["source_id"] == "doc-1"
+
+
+def test_process_job_failure(queue_path, indexing_store):
+    """Test that an extraction error fails the job with its reason and drops the payload."""
+    queue = JobQueue(queue_path)
+    job_id = queue.submit("doc-1", b"{not json", extension=".json", filename="bad.json")
+
+    process_job(queue, queue.claim("worker"))
+
+    job = queue.get(job_id)
+    assert job["stage"] == "failed"
+    assert "extracting" in job["timings"]
+    assert job["error"].startswith("ExtractionError")
+    assert job["finished_at"] is not None and job["attempts"] == 1
+
+
+@pytest.mark.parametrize("error", [RuntimeError("embedding API down"), ValueError("malformed provider response")])
+def test_transient_failure_is_retried(queue_path, indexing_store, error):
+    """Test that an outage puts the job back with backoff, and the retry succeeds."""
+    queue = JobQueue(queue_path)
+    job_id = queue.submit("doc-1", TEXT.encode())
+
+    with patch.object(jobs, "index_documents_in_stages", side_effect=error), \
+         patch.object(settings, "ingestion_retry_backoff", 60.0):
+        process_job(queue, queue.claim("worker"))
+    job = queue.get(job_id)
+    assert (job["stage"], job["attempts"], job["error"]) == ("queued", 1, f"{type(error).__name__}: {error}")
+    assert queue.claim("worker") is None
+
+    queue.update(job_id, available_at=0)
+    process_job(queue, queue.claim("worker"))
+    job = queue.get(job_id)
+    assert (job["stage"], job["attempts"], job["error"]) == ("completed", 2, None)
+
+
+def test_lost_lease_abandons_job(queue_path, indexing_store):
+    """Test that a worker stops once another worker has taken over its job."""
+    queue = JobQueue(queue_path)
+    job_id = queue.submit("doc-1", TEXT.encode())
+    job = queue.claim("worker-a")
+    queue.update(job_id, lease_owner="worker-b")
+
+    process_job(queue, job)
+
+    job = queue.get(job_id)
+    assert (job["stage"], job["lease_owner"], job["chunks_written"]) == ("extracting", "worker-b", 0)
+    assert indexing_store.count_documents() == 0
+
+
+def test_heartbeat_renews_lease(queue_path):
+    """Test that renewing extends the lease, and notices when it is gone."""
+    queue = JobQueue(queue_path)
+    job_id = queue.submit("doc-1", b"x")
+    progress = jobs._JobProgress(queue, queue.claim("worker-a"))
+    queue.update(job_id, lease_expires_at=0)
+
+    progress.renew()
+    assert queue.claim("worker-b") is None and not progress.lost
+
+    queue.update(job_id, lease_owner="worker-b")
+    progress.renew()
+    assert progress.lost
+
+
+def test_finished_jobs_bump_shared_generation(queue_path, indexing_store):
+    """Test that jobs finished in another process change the generation the API's caches are keyed on."""
+    collection = settings.qdrant_collection_name
+    before = indexing_store.generation
+    with patch.object(jobs, "GENERATION_REFRESH_SECONDS", 0.01):
+        jobs.start_generation_refresh()
+
+        worker_queue = JobQueue(queue_path)
+        worker_queue.submit("doc-1", TEXT.encode())
+        process_job(worker_queue, worker_queue.claim("worker"))
+        assert worker_queue.generation(collection) == 1
+
+        deadline = time.monotonic() + 5
+        while indexing_store.generation == before and time.monotonic() < deadline:
+            time.sleep(0.01)
+        jobs.stop_ingestion_workers()
+    assert indexing_store.generation > before
+    document_stores.set_shared_generation(collection, 0)
+
+
+def test_worker_thread_survives_queue_errors(queue_path, indexing_store):
+    """Test that an error recording a job's outcome does not end the worker thread."""
+    queue = JobQueue(queue_path)
+    first = queue.submit("doc-1", TEXT.encode())
+    second = queue.submit("doc-2", TEXT.encode())
+    finish, retry = queue.finish, queue.retry
+
+    def locked_for_first(method):
+        def call(job_id, *args, **kwargs):
+            if job_id == first:
+                raise sqlite3.OperationalError("database is locked")
+            return method(job_id, *args, **kwargs)
+        return call
+
+    with patch.object(queue, "finish", locked_for_first(finish)), patch.object(queue, "retry", locked_for_first(retry)):
+        workers = jobs.IngestionWorkers(queue, 1, exit_when_idle=True)
+        workers.start()
+        workers.join()
+
+    assert queue.get(first)["stage"] == "writing"  # reclaimed once its lease expires
+    assert queue.get(second)["stage"] == "completed"
+
+
+def test_upload_is_acknowledged_and_indexed(queue_path, indexing_store):
+    """Test that uploads return a job immediately and the status endpoint tracks it."""
+    client = TestClient(app)
+
+    response = client.post("/documents/upload", files={"file": ("notes.md", TEXT.encode(), "text/markdown")})
+    assert response.status_code == 202
+    accepted = response.json()
+    assert accepted["stage"] == "queued"
+    assert accepted["status_url"] == f"/documents/jobs/{accepted['job_id']}"
+
+    _wait_for(jobs.get_job_queue(), accepted["job_id"])
+    status = client.get(accepted["status_url"]).json()
+    assert status["stage"] == "completed"
+    assert status["filename"] == "notes.md"
+    assert status["document_id"] == accepted["document_id"]
+    assert status["progress"] == {"chunks_total": 3, "chunks_embedded": 3, "chunks_written": 3}
+    assert status["finished_at"] >= status["started_at"] >= status["created_at"]
+
+    response = client.post("/documents", json={"content": "A short note on consideration."})
+    assert response.status_code == 202
+    assert _wait_for(jobs.get_job_queue(), response.json()["job_id"])["stage"] == "completed"
+
+
+def test_upload_validation_and_unknown_job(queue_path):
+    """Test that invalid uploads are still rejected synchronously."""
+    client = TestClient(app)
+    assert client.post("/documents/upload", files={"file": ("empty.txt", b"", "text/plain")}).status_code == 400
+    assert client.post("/documents/upload", files={"file": ("a.exe", b"MZ", "application/octet-stream")}).status_code == 400
+    assert client.get("/documents/jobs/missing").status_code == 404
+
+    with patch.object(settings, "ingestion_max_pending", 1), patch.object(jobs, "start_ingestion_workers"):
+        assert client.post("/documents", json={"content": "first"}).status_code == 202
+        response = client.post("/documents", json={"content": "second"})
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "30"
+
+
+def test_endpoints_keep_queue_calls_off_the_event_loop(queue_path):
+    """Test that the blocking SQLite queue is only used from worker threads."""
+    client = TestClient(app)
+    on_loop = []
+
+    def check_thread(original):
+        def call(*args, **kwargs):
+            try:
+                asyncio.get_running_loop()
+                on_loop.append(original.__name__)
+            except RuntimeError:
+                pass
+            return original(*args, **kwargs)
+        return call
+
+    with patch.object(settings, "ingestion_workers_in_api", False), \
+         patch("src.api.routes.documents.submit_job", check_thread(jobs.submit_job)), \
+         patch.object(JobQueue, "get", check_thread(JobQueue.get)):
+        job_id = client.post("/documents", json={"content": "A note."}).json()["job_id"]
+        assert client.post("/documents/upload", files={"file": ("a.txt", b"text", "text/plain")}).status_code == 202
+        assert client.get(f"/documents/jobs/{job_id}").json()["stage"] == "queued"
+    assert on_loop == []
+
+
+def test_standalone_worker_drains_queue(queue_path, indexing_store):
+    """Test `python -m src.pipelines.worker --drain` with process-pool extraction."""
+    from src.pipelines import worker
+
+    queue = JobQueue(queue_path)
+    ids = [
+        queue.submit("doc-md", TEXT.encode(), extension=".md", filename="notes.md"),
+        queue.submit("doc-json", b'{"holding": "duty of care"}', extension=".json", filename="case.json"),
+        queue.submit("doc-text", b"Consideration must move from the promisee."),
+    ]
+
+    with patch.object(worker, "configure_logging"), patch.object(worker.signal, "signal"), \
+         patch.object(worker, "get_document_store", return_value=indexing_store), \
+         patch.object(settings, "indexing_pipeline_pool_size", settings.indexing_pipeline_pool_size):
+        assert worker.main(["--queue", queue_path, "--drain", "--concurrency", "2", "--extract-processes", "1"]) == 0
+
+    statuses = [queue.get(job_id) for job_id in ids]
+    assert [job["stage"] for job in statuses] == ["completed"] * 3
+    assert all(job["lease_owner"].endswith(("/0", "/1")) for job in statuses)
+    assert indexing_store.count_documents() == 5
+
+
+def test_dimension_mismatch_stops_startup(queue_path):
+    """Test that the worker and the API refuse to start against a mismatched collection."""
+    from src.pipelines import worker
+
+    queue = JobQueue(queue_path)
+    job_id = queue.submit("doc-text", b"Consideration must move from the promisee.")
+    mismatch = document_stores.DimensionMismatchError("collection has dimension 384, configured 1536")
+
+    with patch.object(worker, "configure_logging"), \
+         patch.object(worker, "get_document_store", side_effect=mismatch), \
+         pytest.raises(document_stores.DimensionMismatchError):
+        worker.main(["--queue", queue_path, "--drain", "--extract-processes", "1"])
+    assert queue.get(job_id)["stage"] == "queued"
+
+    with patch("src.api.main.get_document_store", side_effect=mismatch), \
+         patch("src.api.main.start_generation_refresh") as start_refresh, \
+         pytest.raises(document_stores.DimensionMismatchError):
+        with TestClient(app):
+            pass
+    start_refresh.assert_not_called()
+
+
+def test_extraction_pool_replaces_crashed_process():
+    """Test that a killed extraction process fails one call and the pool recovers."""
+    from src.pipelines.worker import ExtractionPool
+
+    pool = ExtractionPool(1)
+    try:
+        assert pool(b"before", ".txt") == "before"
+        [process] = pool._pool._processes.values()
+        os.kill(process.pid, signal.SIGKILL)
+        process.join()
+
+        with pytest.raises(BrokenProcessPool):
+            pool(b"during", ".txt")
+        assert pool(b"after", ".txt") == "after"
+    finally:
+        pool.shutdown()
@@ -0,0 +1,84 @@
+"""
+Tests for MMR Diversification
+
+Tests maximal-marginal-relevance selection and the over-fetch + re-rank
+stage in the retrieval pipeline.
+"""
+
+from unittest.mock import AsyncMock, patch
+from haystack.dataclasses import Document
+from src.config.settings import settings
+from src.pipelines.mmr import mmr_select
+
+
+def _docs():
+    # Two near-duplicate overlapping chunks and one distinct, slightly less relevant chunk
+    return [
+        Document(id="chunk-1", content="a", embedding=[1.0, 0.0, 0.0], score=0.99),
+        Document(id="chunk-1b", content="a'", embedding=[0.99, 0.05, 0.0], score=0.98),
+        Document(id="other", content="b", embedding=[0.6, 0.8, 0.0], score=0.6),
+    ]
+
+
+def test_mmr_drops_near_duplicates():
+    """Test that a near-duplicate loses to a distinct chunk."""
+    selected = mmr_select([1.0, 0.0, 0.0], _docs(), top_k=2, lambda_mult=0.3)
+    assert [doc.id for doc in selected] == ["chunk-1", "other"]
+
+
+def test_mmr_lambda_one_is_relevance_order():
+    """Test that lambda 1.0 ranks by relevance alone."""
+    selected = mmr_select([1.0, 0.0, 0.0], _docs(), top_k=3, lambda_mult=1.0)
+    assert [doc.id for doc in selected] == ["chunk-1", "chunk-1b", "other"]
+
+
+def test_mmr_without_vectors_keeps_order():
+    """Test that candidates without vectors are truncated, not re-ranked."""
+    docs = [Document(content=str(i), score=1 - i / 10) for i in range(4)]
+    assert mmr_select([1.0, 0.0], docs, top_k=2, lambda_mult=0.5) == docs[:2]
+
+
+async def test_pipeline_overfetches_and_diversifies(mock_llm_components, mock_embedder, mock_document_store):
+    """Test that search over-fetches with vectors and MMR trims to top_k."""
+    from src.pipelines.retrieval import aretrieve_chunks, aretrieve_documents
+
+    search = mock_llm_components["asearch"]
+    search.return_value = _docs()
+    mock_llm_components["aembed"].return_value = {"embedding": [1.0, 0.0, 0.0]}
+
+    with patch.object(settings, "mmr_enabled", True), \
+         patch.object(settings, "mmr_lambda", 0.3), \
+         patch.object(settings, "mmr_fetch_factor", 3):
+        result = await aretrieve_documents("What is RAG?", top_k=2)
+
+        assert search.await_args.args[2] == 6
+        assert search.await_args.kwargs["with_vectors"] is True
+        assert [doc.id for doc in result["documents"]] == ["chunk-1", "other"]
+        assert all(doc.embedding is None for doc in result["documents"])
+
+        mock_document_store.search_async = AsyncMock(return_value=_docs())
+        with patch('src.pipelines.retrieval._agenerate_embedding_with_retry',
+                   new_callable=AsyncMock, return_value={"embedding": [1.0, 0.0, 0.0]}):
+            chunks = await aretrieve_chunks("What is MMR?", top_k=2, with_vectors=True)
+
+    assert mock_document_store.search_async.await_args.kwargs["top_k"] == 6
+    assert [doc.id for doc in chunks["documents"]] == ["chunk-1", "other"]
+    assert chunks["documents"][0].embedding == [1.0, 0.0, 0.0]
+
+
+def test_sync_pipeline_overfetches_and_diversifies(mock_llm_components, mock_embedder, mock_document_store):
+    """Test that the sync path over-fetches and applies MMR like the async one."""
+    from src.pipelines.retrieval import retrieve_documents
+
+    search = mock_llm_components["search"]
+    search.return_value = _docs()
+    mock_llm_components["embed"].return_value = {"embedding": [1.0, 0.0, 0.0]}
+
+    with patch.object(settings, "mmr_enabled", True), \
+         patch.object(settings, "mmr_lambda", 0.3), \
+         patch.object(settings, "mmr_fetch_factor", 3):
+        result = retrieve_documents("What is sync MMR?", top_k=2)
+
+    assert search.call_args.args[2] == 6
+    assert search.call_args.kwargs["with_vectors"] is True
+    assert [doc.id for doc in result["documents"]] == ["chunk-1", "other"]
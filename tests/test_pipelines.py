@@ -26,4 +26,41 @@ def test_retrieve_documents(mock_llm_components, mock_embedder, mock_document_st
     # Verify new Phase 3 metadata fields
     assert "provider_used" in results["metadata"]
     assert "provider_fallback" in results["metadata"]
-    assert results["metadata"]["provider_used"] == "openai"  # Default from mock
\ No newline at end of file
+    assert results["metadata"]["provider_used"] == "openai"  # Default from mock
+
+async def test_aretrieve_documents(mock_llm_components, mock_embedder, mock_document_store):
+    """Test the async retrieval path uses the async provider client."""
+    from src.pipelines.retrieval import aretrieve_documents
+    
+    results = await aretrieve_documents("Test document")
+    assert results["answer"] == "Mocked AI response."
+    assert len(results["documents"]) == 3
+    assert results["metadata"]["provider_used"] == "openai"
+    assert results["metadata"]["provider_fallback"] is False
+    mock_llm_components["registry"].async_client.complete.assert_awaited_once()
+
+
+async def test_aretrieve_documents_fallback(mock_llm_components, mock_embedder, mock_document_store):
+    """Test the async path falls back when the primary provider fails."""
+    from src.pipelines.retrieval import aretrieve_documents
+    
+    async_client = mock_llm_components["registry"].async_client
+    async_client.complete.side_effect = [RuntimeError("primary down"), "Fallback answer."]
+    
+    results = await aretrieve_documents("Test document")
+    assert results["answer"] == "Fallback answer."
+    assert results["metadata"]["provider_used"] == "anthropic"
+    assert results["metadata"]["provider_fallback"] is True
+
+
+async def test_aretrieve_documents_streaming(mock_llm_components, mock_embedder, mock_document_store):
+    """Test the async streaming path yields documents, tokens and done events."""
+    from src.pipelines.retrieval import aretrieve_documents_streaming
+    
+    events = [event async for event in aretrieve_documents_streaming("Test document")]
+    types = [event["type"] for event in events]
+    assert types[0] == "documents"
+    assert types[-1] == "done"
+    tokens = "".join(event["data"] for event in events if event["type"] == "token")
+    assert tokens == "Mocked AI response."
+    assert events[-1]["metadata"]["tokens_streamed"] == 3
@@ -0,0 +1,45 @@
+"""
+Tests for Retrieval-Only Queries
+
+Tests that chunk retrieval returns scored chunks without touching the LLM
+provider router or registry.
+"""
+
+import pytest
+from unittest.mock import AsyncMock, patch
+from haystack.dataclasses import Document
+from src.pipelines.retrieval import aretrieve_chunks, retrieve_chunks
+
+
+@pytest.fixture
+def no_llm():
+    """Fail the test if the router or provider registry is touched."""
+    with patch('src.pipelines.retrieval.get_router', side_effect=AssertionError("router used")), \
+         patch('src.pipelines.retrieval.get_provider_registry', side_effect=AssertionError("registry used")):
+        yield
+
+
+def test_retrieve_chunks(no_llm, mock_embedder, mock_document_store, sample_documents):
+    """Test that sync retrieval returns scored chunks and timing only."""
+    result = retrieve_chunks("What is RAG?", top_k=3)
+
+    assert result["documents"] == sample_documents
+    assert "answer" not in result
+    assert set(result["metadata"]) >= {"num_documents_retrieved", "embedding_ms", "search_ms", "total_ms"}
+    assert mock_document_store.search.call_args.kwargs["with_vectors"] is False
+
+
+async def test_aretrieve_chunks_with_vectors(no_llm, mock_document_store):
+    """Test that async retrieval passes with_vectors through and returns IDs and vectors."""
+    chunk = Document(id="chunk-1", content="RAG combines retrieval and generation.", score=0.91,
+                     meta={"filename": "rag.pdf"}, embedding=[0.1, 0.2])
+    mock_document_store.search_async = AsyncMock(return_value=[chunk])
+
+    with patch('src.pipelines.retrieval._agenerate_embedding_with_retry',
+               new_callable=AsyncMock, return_value={"embedding": [0.1] * 1536}):
+        result = await aretrieve_chunks("What is RAG?", top_k=1, with_vectors=True)
+
+    assert result["documents"][0].id == "chunk-1"
+    assert result["documents"][0].embedding == [0.1, 0.2]
+    assert mock_document_store.search_async.await_args.kwargs["with_vectors"] is True
+    assert result["metadata"]["num_documents_retrieved"] == 1
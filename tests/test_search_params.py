@@ -0,0 +1,133 @@
+"""
+Tests for HNSW Search Tuning
+
+Tests collection HNSW config, per-request `hnsw_ef` / `exact` search params,
+the automatic exact-search policy and plumbing through the query pipeline.
+"""
+
+import pytest
+from unittest.mock import Mock, patch
+from haystack.dataclasses import Document
+from qdrant_client import AsyncQdrantClient, QdrantClient
+from src.config.settings import settings
+from src.document_stores.store import QdrantDocumentStore
+
+
+@pytest.fixture
+def store():
+    """In-memory store with three chunks from two courses."""
+    with patch('src.document_stores.store.QdrantClient', lambda **kwargs: QdrantClient(":memory:")), \
+         patch.object(settings, "qdrant_payload_indexes", []):
+        store = QdrantDocumentStore(collection_name="test_hnsw", embedding_dimension=2)
+    store._async_client = AsyncQdrantClient(":memory:")
+    store._async_client._client.collections = store.client._client.collections
+    store.write_documents([
+        Document(id="a", content="Offer and acceptance.", embedding=[1.0, 0.0], meta={"course": "LAW101"}),
+        Document(id="b", content="Duty of care.", embedding=[0.0, 1.0], meta={"course": "LAW205"}),
+        Document(id="c", content="Consideration.", embedding=[0.9, 0.1], meta={"course": "LAW205"}),
+    ])
+    return store
+
+
+def _search_params(client_method):
+    return client_method.call_args.kwargs["search_params"]
+
+
+def test_collection_hnsw_config():
+    """Test that new collections get HNSW parameters from settings."""
+    client = Mock()
+    client.get_collections.return_value.collections = []
+    with patch('src.document_stores.store.QdrantClient', return_value=client), \
+         patch.object(settings, "qdrant_payload_indexes", []), \
+         patch.object(settings, "qdrant_hnsw_m", 32), \
+         patch.object(settings, "qdrant_hnsw_ef_construct", 200), \
+         patch.object(settings, "qdrant_full_scan_threshold_kb", 5000):
+        QdrantDocumentStore(collection_name="c", embedding_dimension=2)
+
+    hnsw = client.create_collection.call_args.kwargs["hnsw_config"]
+    assert (hnsw.m, hnsw.ef_construct, hnsw.full_scan_threshold) == (32, 200, 5000)
+
+
+def test_explicit_params(store):
+    """Test that per-request hnsw_ef and exact reach Qdrant, with exact taking precedence."""
+    with patch.object(store.client, "query_points", wraps=store.client.query_points) as query_points:
+        store.search([1.0, 0.0], top_k=2, hnsw_ef=256, exact=False)
+        params = _search_params(query_points)
+        assert params.hnsw_ef == 256 and not params.exact
+
+        with patch.object(settings, "qdrant_hnsw_ef", 64):
+            store.search([1.0, 0.0], top_k=2, exact=False)
+        assert _search_params(query_points).hnsw_ef == 64
+
+        store.search([1.0, 0.0], top_k=2, hnsw_ef=256, exact=True)
+        assert _search_params(query_points).exact is True
+
+
+def test_auto_exact_policy(store):
+    """Test exact search for small collections and for filters matching few points."""
+    with patch.object(store.client, "query_points", wraps=store.client.query_points) as query_points, \
+         patch.object(store.client, "get_collection", wraps=store.client.get_collection) as get_collection, \
+         patch.object(store.client, "count", wraps=store.client.count) as count:
+        assert [doc.id for doc in store.search([1.0, 0.0], top_k=1)] == ["a"]
+        assert _search_params(query_points).exact is True
+
+        with patch.object(settings, "exact_search_max_points", 2):
+            store.search([1.0, 0.0], top_k=1)
+            assert _search_params(query_points) is None
+
+            for _ in range(2):
+                store.search([1.0, 0.0], top_k=1, filters={"course": "LAW101"})
+                assert _search_params(query_points).exact is True
+            # The filtered count is cached per filter
+            assert count.call_count == 1
+
+        # Point counts are cached until the collection changes
+        assert get_collection.call_count == 1
+        store.write_documents([Document(id="d", content="Estoppel.", embedding=[0.5, 0.5])])
+        store.search([1.0, 0.0], top_k=1)
+        assert get_collection.call_count == 2
+        with patch.object(settings, "exact_search_max_points", 2):
+            store.search([1.0, 0.0], top_k=1, filters={"course": "LAW101"})
+        assert count.call_count == 2
+
+
+def test_auto_exact_disabled(store):
+    """Test that a zero threshold always uses HNSW unless exact is requested."""
+    with patch.object(settings, "exact_search_max_points", 0), \
+         patch.object(store.client, "query_points", wraps=store.client.query_points) as query_points:
+        store.search([1.0, 0.0], top_k=1)
+        assert _search_params(query_points) is None
+
+
+async def test_auto_exact_async(store):
+    """Test the exact-search policy on the async and batch paths."""
+    with patch.object(settings, "exact_search_max_points", 2), \
+         patch.object(store.async_client, "query_points", wraps=store.async_client.query_points) as query_points, \
+         patch.object(store.async_client, "query_batch_points", wraps=store.async_client.query_batch_points) as batch:
+        await store.search_async([1.0, 0.0], top_k=1, filters={"course": "LAW101"})
+        assert _search_params(query_points).exact is True
+
+        await store.search_batch_async([[1.0, 0.0], [0.0, 1.0]], top_k=1, hnsw_ef=128)
+        assert [request.params.hnsw_ef for request in batch.call_args.kwargs["requests"]] == [128, 128]
+
+
+async def test_params_reach_search_and_keys(mock_llm_components, mock_embedder, mock_document_store):
+    """Test that hnsw_ef and exact are passed to search and are part of the coalescing key."""
+    from src.pipelines.coalescing import coalesce_key
+    from src.pipelines.retrieval import aretrieve_documents
+
+    await aretrieve_documents("What is consideration?", hnsw_ef=128, exact=False)
+    kwargs = mock_llm_components["asearch"].await_args.kwargs
+    assert (kwargs["hnsw_ef"], kwargs["exact"]) == (128, False)
+
+    assert coalesce_key("q", 5, exact=True) != coalesce_key("q", 5)
+
+
+def test_request_validation():
+    """Test that out-of-range hnsw_ef is rejected."""
+    from pydantic import ValidationError
+    from src.api.schemas.query import RetrieveRequest
+
+    with pytest.raises(ValidationError):
+        RetrieveRequest(query="q", hnsw_ef=0)
+    assert RetrieveRequest(query="q", hnsw_ef=128, exact=True).exact is True
@@ -0,0 +1,100 @@
+"""
+Tests for Hybrid Search
+
+Tests local BM25 sparse encoding and dense + BM25 search fused with
+reciprocal-rank fusion, against an in-memory Qdrant.
+"""
+
+import pytest
+from unittest.mock import patch
+from haystack.dataclasses import Document
+from qdrant_client import AsyncQdrantClient, QdrantClient
+from src.document_stores.sparse import encode_document, encode_query, term_index, tokenize
+from src.document_stores.store import QdrantDocumentStore
+
+
+def test_tokenize_keeps_identifiers():
+    """Test that statute numbers stay whole and their parts are indexed too."""
+    assert tokenize("See Section 12-305 of 42 U.S.C.") == [
+        "see", "section", "12-305", "12", "305", "of", "42", "u.s.c", "u", "s", "c",
+    ]
+
+
+def test_encode_document_bm25_weights():
+    """Test term-frequency saturation and length normalization."""
+    indices, values = encode_document("tort tort tort contract", avg_doc_length=4)
+    weights = dict(zip(indices, values))
+    assert indices == sorted(indices)
+    assert weights[term_index("tort")] > weights[term_index("contract")]
+    assert weights[term_index("tort")] < 3 * weights[term_index("contract")]
+
+    # The same term counts for less in a longer chunk
+    long_indices, long_values = encode_document("contract " + "filler " * 20, avg_doc_length=4)
+    assert dict(zip(long_indices, long_values))[term_index("contract")] < weights[term_index("contract")]
+
+    assert encode_document("", avg_doc_length=4) == ([], [])
+
+
+def test_encode_query_is_binary():
+    """Test that query terms are deduplicated with unit weights (IDF comes from Qdrant)."""
+    indices, values = encode_query("tort tort law")
+    assert sorted(indices) == sorted({term_index("tort"), term_index("law")})
+    assert values == [1.0, 1.0]
+
+
+@pytest.fixture
+def memory_store():
+    """Document store backed by an in-memory Qdrant."""
+    with patch('src.document_stores.store.QdrantClient', lambda **kwargs: QdrantClient(":memory:")):
+        store = QdrantDocumentStore(collection_name="test_hybrid", embedding_dimension=2)
+    store._async_client = AsyncQdrantClient(":memory:")
+    store._async_client._client.collections = store.client._client.collections  # share the in-memory data
+    store.write_documents([
+        Document(id="dense-match", content="Limitation periods for negligence claims.", embedding=[1.0, 0.0]),
+        Document(id="statute", content="Section 12-305 sets the limitation period.", embedding=[0.0, 1.0]),
+        Document(id="other", content="Consideration in contract formation.", embedding=[0.7, 0.7]),
+    ])
+    return store
+
+
+def test_hybrid_finds_exact_identifier(memory_store):
+    """Test that the BM25 leg surfaces an exact statute number dense search misses."""
+    dense = memory_store.search([1.0, 0.0], top_k=1)
+    assert [doc.id for doc in dense] == ["dense-match"]
+
+    hybrid = memory_store.search([1.0, 0.0], top_k=2, query_text="section 12-305", with_vectors=True)
+    assert {doc.id for doc in hybrid} == {"dense-match", "statute"}
+    assert all(len(doc.embedding) == 2 for doc in hybrid)
+
+
+async def test_hybrid_search_async_and_batch(memory_store):
+    """Test that async and batch searches run the hybrid query too."""
+    hybrid = await memory_store.search_async([1.0, 0.0], top_k=2, query_text="12-305")
+    assert "statute" in {doc.id for doc in hybrid}
+
+    batched = await memory_store.search_batch_async(
+        [[1.0, 0.0], [1.0, 0.0]], top_k=2, query_texts=["12-305", "consideration"]
+    )
+    assert "statute" in {doc.id for doc in batched[0]}
+    assert "other" in {doc.id for doc in batched[1]}
+
+
+def test_hybrid_falls_back_without_sparse_vectors(memory_store):
+    """Test that collections created before hybrid support still answer with dense search."""
+    memory_store.sparse_enabled = False
+    results = memory_store.search([1.0, 0.0], top_k=1, query_text="12-305")
+    assert [doc.id for doc in results] == ["dense-match"]
+
+
+async def test_hybrid_selectable_per_request(mock_llm_components, mock_embedder, mock_document_store):
+    """Test that the request's choice reaches the search and the metadata."""
+    from src.pipelines.retrieval import aretrieve_documents
+
+    search = mock_llm_components["asearch"]
+    result = await aretrieve_documents("What does section 12-305 say?", hybrid=True)
+    assert search.await_args.args[-1] == "What does section 12-305 say?"
+    assert result["metadata"]["search_mode"] == "hybrid"
+
+    result = await aretrieve_documents("What does section 12-305 say?", hybrid=False)
+    assert search.await_args.args[-1] is None
+    assert result["metadata"]["search_mode"] == "dense"
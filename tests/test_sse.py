@@ -0,0 +1,97 @@
+"""
+Tests for Server-Sent Events Helpers
+
+Tests frame encoding and time/size-windowed token coalescing for the
+streaming query endpoint.
+"""
+
+import asyncio
+import json
+from unittest.mock import patch
+from src.api.sse import coalesce_tokens, encode_event
+from src.config.settings import settings
+
+
+async def _events(*items):
+    """Yield events; a float item sleeps for that many seconds instead."""
+    for item in items:
+        if isinstance(item, float):
+            await asyncio.sleep(item)
+        else:
+            yield item
+
+
+def _token(text):
+    return {"type": "token", "data": text}
+
+
+async def _collect(events):
+    return [event async for event in events]
+
+
+def test_encode_event():
+    """Test that frames are pre-encoded SSE bytes."""
+    frame = encode_event({"type": "token", "content": "héllo"})
+    assert isinstance(frame, bytes)
+    assert frame.startswith(b"data: ") and frame.endswith(b"\n\n")
+    assert json.loads(frame[6:]) == {"type": "token", "content": "héllo"}
+
+
+class TestCoalesceTokens:
+    """Test token batching."""
+
+    async def test_first_token_immediate_then_batched(self):
+        """Test that the first token is sent alone and the rest are merged."""
+        source = _events(_token("A"), _token("b"), _token("c"), _token("d"), {"type": "done"})
+        events = await _collect(coalesce_tokens(source, flush_interval_ms=1000, max_chars=1000))
+        assert events == [_token("A"), _token("bcd"), {"type": "done"}]
+
+    async def test_flush_on_max_chars(self):
+        """Test that a full buffer is flushed without waiting for the interval."""
+        source = _events(_token("A"), *[_token("xy") for _ in range(5)])
+        events = await _collect(coalesce_tokens(source, flush_interval_ms=1000, max_chars=4))
+        assert [e["data"] for e in events] == ["A", "xyxy", "xyxy", "xy"]
+
+    async def test_flush_on_interval_while_idle(self):
+        """Test that buffered tokens go out when the upstream stalls."""
+        received = []
+        source = _events(_token("A"), _token("b"), _token("c"), 0.2, _token("d"))
+        async for event in coalesce_tokens(source, flush_interval_ms=20, max_chars=1000):
+            received.append((event["data"], asyncio.get_running_loop().time()))
+        assert [data for data, _ in received] == ["A", "bc", "d"]
+        # "bc" was flushed well before the stalled "d" arrived
+        assert received[2][1] - received[1][1] > 0.1
+
+    async def test_error_flushes_buffer_first(self):
+        """Test that event order is preserved around non-token events."""
+        source = _events(_token("A"), _token("b"), {"type": "error", "error": "boom"})
+        events = await _collect(coalesce_tokens(source, flush_interval_ms=1000, max_chars=1000))
+        assert events == [_token("A"), _token("b"), {"type": "error", "error": "boom"}]
+
+    async def test_closing_closes_upstream(self):
+        """Test that closing the batcher closes the upstream stream."""
+        closed = []
+
+        async def source():
+            try:
+                yield _token("A")
+                await asyncio.sleep(10)
+            finally:
+                closed.append(True)
+
+        batched = coalesce_tokens(source(), flush_interval_ms=10, max_chars=100)
+        assert await anext(batched) == _token("A")
+        await batched.aclose()
+        assert closed == [True]
+
+
+async def test_generate_sse_stream_frames(mock_llm_components, mock_embedder, mock_document_store):
+    """Test that the SSE generator emits documents, batched tokens and done frames."""
+    from src.api.routes.query import generate_sse_stream
+
+    with patch.object(settings, "sse_flush_interval_ms", 1000):
+        frames = [frame async for frame in generate_sse_stream("What is RAG?", top_k=3)]
+
+    events = [json.loads(frame[len(b"data: "):]) for frame in frames]
+    assert [e["type"] for e in events] == ["documents", "token", "token", "done"]
+    assert [e["content"] for e in events if e["type"] == "token"] == ["Mocked ", "AI response."]
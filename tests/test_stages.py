@@ -0,0 +1,104 @@
+"""
+Tests for Stage Graph
+
+Tests the async dependency-graph runner used by the query pipeline.
+"""
+
+import asyncio
+import pytest
+from src.pipelines.stages import StageGraph
+
+
+class TestStageGraph:
+    """Test stage ordering, concurrency and timing."""
+    
+    async def test_dependencies_receive_results(self):
+        """Test that stages receive their dependencies' results in order."""
+        graph = StageGraph()
+        
+        async def one():
+            return 1
+        
+        async def two():
+            return 2
+        
+        async def add(a, b):
+            return a + b
+        
+        graph.add("one", one).add("two", two).add("sum", add, after=["one", "two"])
+        results = await graph.run()
+        
+        assert results == {"one": 1, "two": 2, "sum": 3}
+    
+    async def test_independent_stages_overlap(self):
+        """Test that independent stages run concurrently."""
+        graph = StageGraph()
+        routed = asyncio.Event()
+        
+        async def embed():
+            # Would deadlock if "route" only started after this stage finished
+            await asyncio.wait_for(routed.wait(), timeout=1)
+            return "embedding"
+        
+        async def route():
+            routed.set()
+            return "provider"
+        
+        graph.add("embedding", embed).add("routing", route)
+        results = await graph.run()
+        assert results["embedding"] == "embedding"
+    
+    async def test_failure_cancels_remaining_stages(self):
+        """Test that a failing stage raises and cancels stages still running."""
+        graph = StageGraph()
+        cancelled = False
+        
+        async def slow():
+            nonlocal cancelled
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled = True
+                raise
+        
+        async def fail():
+            raise RuntimeError("boom")
+        
+        graph.add("slow", slow).add("fail", fail)
+        with pytest.raises(RuntimeError, match="boom"):
+            await graph.run()
+        assert cancelled
+    
+    def test_unknown_dependency_rejected(self):
+        """Test that stages must be added after their dependencies."""
+        async def noop():
+            return None
+        
+        with pytest.raises(ValueError):
+            StageGraph().add("search", noop, after=["embedding"])
+    
+    def test_critical_path(self):
+        """Test that the critical path is the longest dependent chain."""
+        async def noop(*args):
+            return None
+        
+        graph = StageGraph()
+        graph.add("embedding", noop).add("routing", noop)
+        graph.add("search", noop, after=["embedding"])
+        graph.add("generation", noop, after=["search", "routing"])
+        graph.durations_ms = {"embedding": 100.0, "routing": 150.0, "search": 80.0, "generation": 500.0}
+        
+        assert graph.critical_path_ms() == 680.0
+        assert graph.timings()["routing_ms"] == 150.0
+
+
+async def test_aretrieve_documents_reports_stage_timings(mock_llm_components, mock_embedder, mock_document_store):
+    """Test that the async pipeline reports per-stage timings and the critical path."""
+    from src.pipelines.retrieval import aretrieve_documents
+    
+    results = await aretrieve_documents("What is RAG?")
+    metadata = results["metadata"]
+    
+    for key in ("embedding_ms", "routing_ms", "search_ms", "prompt_ms", "generation_ms", "critical_path_ms", "total_ms"):
+        assert key in metadata, f"Missing {key}"
+    assert metadata["critical_path_ms"] <= metadata["total_ms"] + 1